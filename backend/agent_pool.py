@@ -0,0 +1,159 @@
+"""
+Process-wide pool of pre-built Engram agents.
+─────────────────────────────────────────────
+Building a CrewAI Agent (plus its Serper / WebsiteSearch / integration tools)
+is expensive, so instead of a fresh EngramAgents() per request we keep a few
+ready-made agents per type and lend them out:
+
+    with AGENT_POOL.checkout('sales', llm=streaming_llm, step_callback=cb) as agent:
+        crew = Crew(agents=[agent], tasks=[...])
+        crew.kickoff()
+
+While checked out the agent is owned exclusively by one request, so the
+per-request LLM (with its token callbacks) and step_callback can be swapped
+in safely. On return they are reset to the agent's defaults.
+
+agents.py (and with it crewai / crewai_tools) is imported on first use, so
+importing this module is cheap; startup.py warms it in the background.
+
+Env vars:
+  AGENT_POOL_SIZE      — agents pre-built per type at startup   (default 2)
+  AGENT_POOL_MAX_IDLE  — max idle agents kept per type          (default 4)
+"""
+
+import os
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def _to_crewai_llm(llm):
+    """
+    Convert an injected LLM the same way Agent(llm=...) does on construction,
+    so a swapped-in LLM behaves exactly like one passed to the constructor.
+    """
+    try:
+        from crewai.utilities.llm_utils import create_llm
+    except ImportError:
+        return llm
+    return create_llm(llm)
+
+
+class AgentPool:
+    """Per-type free lists of pre-built agents, shared by every request."""
+
+    def __init__(self, size: int = 2, max_idle: int = 4, builder=None, types: list | None = None):
+        """`builder(agent_type)` and `types` default to EngramAgents (tests pass stubs)."""
+        self.size = size
+        self.max_idle = max(max_idle, size)
+        self._builder = builder
+        self._idle: dict[str, list] = defaultdict(list)
+        self._default_llm: dict[int, object] = {}
+        self._lock = threading.Lock()
+        self._type_list: list | None = types
+
+    @property
+    def _types(self) -> list:
+        if self._type_list is None:
+            from agents import EngramAgents
+            self._type_list = EngramAgents().all_types()
+        return self._type_list
+
+    # ── Construction ─────────────────────────────────────────
+
+    def _build(self, agent_type: str):
+        if self._builder is not None:
+            agent = self._builder(agent_type)
+        else:
+            from agents import EngramAgents
+            agent = EngramAgents().get_agent(agent_type)
+        with self._lock:
+            self._default_llm[id(agent)] = agent.llm
+        return agent
+
+    def warm(self, agent_types: list | None = None) -> dict:
+        """
+        Pre-build `size` agents for each type (call once at startup).
+        A type whose agent or tools fail to construct is logged and skipped —
+        acquire() will build it lazily, so only requests for that type fail.
+        Returns {agent_type: error message} for the types that failed.
+        """
+        failed: dict = {}
+        for agent_type in agent_types or self._types:
+            with self._lock:
+                missing = self.size - len(self._idle[agent_type])
+            for _ in range(max(missing, 0)):
+                try:
+                    agent = self._build(agent_type)
+                except Exception as exc:
+                    logger.exception("Agent pool warm-up failed for '%s'", agent_type)
+                    failed[agent_type] = str(exc)
+                    break
+                with self._lock:
+                    self._idle[agent_type].append(agent)
+        return failed
+
+    # ── Checkout / return ────────────────────────────────────
+
+    def acquire(self, agent_type: str, llm=None, step_callback=None):
+        if agent_type not in self._types:
+            raise ValueError(
+                f"Unknown agent type: '{agent_type}'. "
+                f"Valid types: {self._types}"
+            )
+        with self._lock:
+            idle = self._idle[agent_type]
+            agent = idle.pop() if idle else None
+        if agent is None:
+            # Pool exhausted under load — build an overflow agent rather than block.
+            agent = self._build(agent_type)
+        if llm is not None:
+            agent.llm = _to_crewai_llm(llm)
+        agent.step_callback = step_callback
+        return agent
+
+    def release(self, agent_type: str, agent) -> None:
+        with self._lock:
+            default_llm = self._default_llm.get(id(agent))
+        try:
+            agent.llm = default_llm
+            agent.step_callback = None
+            if hasattr(agent, 'crew'):
+                agent.crew = None
+            if hasattr(agent, 'tools_results'):
+                agent.tools_results = []
+        except Exception:
+            # An agent we can't reset cleanly is not worth keeping.
+            self._discard(agent)
+            return
+        with self._lock:
+            idle = self._idle[agent_type]
+            if len(idle) < self.max_idle:
+                idle.append(agent)
+                return
+        self._discard(agent)
+
+    def _discard(self, agent) -> None:
+        with self._lock:
+            self._default_llm.pop(id(agent), None)
+
+    @contextmanager
+    def checkout(self, agent_type: str, llm=None, step_callback=None):
+        agent = self.acquire(agent_type, llm=llm, step_callback=step_callback)
+        try:
+            yield agent
+        finally:
+            self.release(agent_type, agent)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {t: len(self._idle[t]) for t in self._types}
+
+
+AGENT_POOL = AgentPool(
+    size=int(os.getenv('AGENT_POOL_SIZE', '2')),
+    max_idle=int(os.getenv('AGENT_POOL_MAX_IDLE', '4')),
+)
@@ -4,8 +4,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from crewai import Agent    
-from crewai_tools import SerperDevTool, WebsiteSearchTool
+from crewai_tools import SerperDevTool
+from tools.website_search import WebsiteSearchTool
 from tools.integrations import get_integration_tools, get_enterprise_apps
+from tools.web_cache import cache_tool
 
 
 class EngramAgents:
@@ -42,12 +44,14 @@ class EngramAgents:
     @property
     def search_tool(self):
         if self._search_tool is None:
-            self._search_tool = SerperDevTool()
+            # Results are cached process-wide (tools/web_cache.py).
+            self._search_tool = cache_tool('serper', SerperDevTool())
         return self._search_tool
 
     @property
     def web_tool(self):
         if self._web_tool is None:
+            # Not WEB_CACHE-wrapped: the embedding index revalidates pages itself.
             self._web_tool = WebsiteSearchTool()
         return self._web_tool
 
@@ -286,22 +290,14 @@ class EngramAgents:
     # ── Lookup helper ─────────────────────────────────────────
 
     def get_agent(self, agent_type: str) -> Agent:
-        mapping = {
-            'orchestrator':        self.orchestrator,
-            'sales':               self.sales,
-            'customer_service':    self.customer_service,
-            'technical':           self.technical,
-            'market_intelligence': self.market_intelligence,
-            'meeting':             self.meeting,
-            'hr_ops':              self.hr_ops,
-            'deep_research':       self.deep_research,
-        }
-        if agent_type not in mapping:
+        # Resolve only the requested property — touching every property here
+        # would build all eight agents (and their tools) just to return one.
+        if agent_type not in self.all_types():
             raise ValueError(
                 f"Unknown agent type: '{agent_type}'. "
-                f"Valid types: {list(mapping.keys())}"
+                f"Valid types: {self.all_types()}"
             )
-        return mapping[agent_type]
+        return getattr(self, agent_type)
 
     def all_types(self) -> list:
         return [
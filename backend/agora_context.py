@@ -0,0 +1,186 @@
+"""
+Token-budgeted context between Agora agents.
+────────────────────────────────────────────
+Each Agora agent used to get every previous output cut at 2000 characters,
+so prompts grew with position and were truncated mid-sentence. An
+AgoraContext (one per session) holds the finished outputs and hands each
+agent as much of them as fits its budget:
+
+  • everything fits          → full outputs
+  • otherwise                → every output as a digest, then outputs are
+                               upgraded back to full text, newest first,
+                               while they still fit
+  • digests alone too large  → each digest trimmed to an equal share
+
+Digests are structured (key points / decisions / numbers / open questions)
+and written by a small model (AGORA_DIGEST_MODEL) on a background pool, as
+soon as the session's outputs outgrow AGORA_CONTEXT_TOKENS — usually while
+the next agent is still running. If the model fails or is slower than
+AGORA_DIGEST_TIMEOUT, an extractive digest of the headings, bullets and
+figures is used instead. The synthesizer gets the larger
+AGORA_FINAL_CONTEXT_TOKENS budget, so it sees full outputs whenever they fit.
+
+    context = AgoraContext()
+    parts = context.select([0, 1], final=False)     # by session position
+    context.add(2, "orchestrator", result_text)
+
+Env vars:
+  AGORA_CONTEXT_TOKENS        — previous-output budget per agent       (default 3000)
+  AGORA_FINAL_CONTEXT_TOKENS  — previous-output budget, synthesizer    (default 8000)
+  AGORA_DIGEST_TOKENS         — target digest size                     (default 300)
+  AGORA_DIGEST_MODEL          — digest model         (default SUMMARY_MODEL / MODEL_NAME)
+  AGORA_DIGEST_TIMEOUT        — seconds to wait for a digest           (default 20)
+  AGORA_DIGEST_WORKERS        — concurrent digest calls                (default 4)
+"""
+
+import os
+import re
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, NamedTuple
+
+from conversation_store import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_DIGESTS = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AGORA_DIGEST_WORKERS", "4")), thread_name_prefix="agora-digest"
+)
+
+
+class ContextPart(NamedTuple):
+    agent_type: str
+    text: str
+    digest: bool
+
+
+# ── Digesters ────────────────────────────────────────────────
+
+def _trim(text: str, max_tokens: int) -> str:
+    budget = max_tokens * 4
+    if len(text) <= budget:
+        return text
+    cut = text.rfind("\n", 0, budget)
+    return text[:cut if cut > budget // 2 else budget].rstrip() + "\n…"
+
+
+def extractive_digest(text: str, max_tokens: int) -> str:
+    """Fallback: headings, bullets and lines with figures, first sentence each, trimmed to budget."""
+    lines = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            lines.append(line)
+        elif re.match(r"^([-*•]|\d+[.)])\s", line) or re.search(r"\d", line):
+            first = re.split(r"(?<=[.!?])\s+", line, maxsplit=1)[0]
+            lines.append(first[:200])
+    if not lines:
+        lines = re.split(r"(?<=[.!?])\s+", " ".join(text.split()))
+    return _trim("\n".join(lines), max_tokens)
+
+
+def llm_digest(agent_type: str, text: str, max_tokens: int) -> str:
+    """Structured digest with AGORA_DIGEST_MODEL over the shared HTTP client."""
+    import llm
+
+    prompt = (
+        f"Condense this contribution from the {agent_type} agent in a multi-agent planning "
+        f"session for the agents that speak next. Use exactly these sections, as short bullets: "
+        f"Key points / Decisions & recommendations / Numbers & facts / Open questions & handoff. "
+        f"Keep names, figures and deadlines verbatim; drop filler. At most {max_tokens} tokens.\n\n"
+        f"{text}"
+    )
+    model = llm.streaming_llm(
+        streaming=False,
+        model=os.getenv("AGORA_DIGEST_MODEL")
+        or os.getenv("SUMMARY_MODEL")
+        or os.getenv("MODEL_NAME", "gpt-4o-mini"),
+        temperature=0,
+        max_tokens=max_tokens,
+    )
+    return str(model.invoke(prompt).content).strip()
+
+
+# ── Session context ──────────────────────────────────────────
+
+class AgoraContext:
+    def __init__(
+        self,
+        budget_tokens: int | None = None,
+        final_budget_tokens: int | None = None,
+        digest_tokens: int | None = None,
+        digester: Callable[[str, str, int], str] = llm_digest,
+        digest_timeout: float | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ):
+        self.budget_tokens = budget_tokens or int(os.getenv("AGORA_CONTEXT_TOKENS", "3000"))
+        self.final_budget_tokens = final_budget_tokens or int(os.getenv("AGORA_FINAL_CONTEXT_TOKENS", "8000"))
+        self.digest_tokens = digest_tokens or int(os.getenv("AGORA_DIGEST_TOKENS", "300"))
+        self.digest_timeout = digest_timeout if digest_timeout is not None else \
+            float(os.getenv("AGORA_DIGEST_TIMEOUT", "20"))
+        self._digester = digester
+        self._executor = executor or _DIGESTS
+        self._lock = threading.Lock()
+        self._outputs: dict = {}      # position → (agent_type, full text)
+        self._digests: dict = {}      # position → Future[str]
+        self.stats = {"digests": 0, "digest_fallbacks": 0}
+
+    def add(self, position: int, agent_type: str, text: str) -> None:
+        """Record a finished output; start digests once the session outgrows the budget."""
+        with self._lock:
+            self._outputs[position] = (agent_type, text)
+            total = sum(estimate_tokens(t) for _, t in self._outputs.values())
+            if total <= self.budget_tokens:
+                return
+            for pos, (at, t) in self._outputs.items():
+                if pos not in self._digests:
+                    self._digests[pos] = self._start_digest(at, t)
+
+    def _start_digest(self, agent_type: str, text: str) -> Future:
+        if estimate_tokens(text) <= self.digest_tokens:
+            done: Future = Future()
+            done.set_result(text)
+            return done
+        return self._executor.submit(self._digester, agent_type, text, self.digest_tokens)
+
+    def digest(self, position: int) -> str:
+        with self._lock:
+            agent_type, text = self._outputs[position]
+            future = self._digests.get(position)
+            if future is None:
+                future = self._digests[position] = self._start_digest(agent_type, text)
+        try:
+            result = future.result(timeout=self.digest_timeout)
+            if result:
+                self.stats["digests"] += 1
+                return _trim(result, self.digest_tokens * 2)
+        except FutureTimeout:
+            logger.warning("Agora digest for %s timed out; using extractive digest", agent_type)
+        except Exception:
+            logger.warning("Agora digest for %s failed; using extractive digest", agent_type,
+                           exc_info=True)
+        self.stats["digest_fallbacks"] += 1
+        return extractive_digest(text, self.digest_tokens)
+
+    def select(self, positions: list, final: bool = False) -> list:
+        """[ContextPart] for the outputs at `positions`, in order, within the budget."""
+        budget = self.final_budget_tokens if final else self.budget_tokens
+        with self._lock:
+            full = {p: self._outputs[p] for p in positions}
+        if sum(estimate_tokens(t) for _, t in full.values()) <= budget:
+            return [ContextPart(*full[p], False) for p in positions]
+
+        parts = {p: ContextPart(full[p][0], self.digest(p), True) for p in positions}
+        used = sum(estimate_tokens(part.text) for part in parts.values())
+        for p in reversed(positions):
+            extra = estimate_tokens(full[p][1]) - estimate_tokens(parts[p].text)
+            if used + extra <= budget:
+                parts[p] = ContextPart(*full[p], False)
+                used += extra
+        if used > budget:
+            share = max(budget // len(positions), 1)
+            parts = {p: part._replace(text=_trim(part.text, share)) for p, part in parts.items()}
+        return [parts[p] for p in positions]
@@ -0,0 +1,72 @@
+"""
+Dependency graph for parallel Agora sessions.
+─────────────────────────────────────────────
+In parallel mode each agent runs as soon as the agents it depends on have
+finished. The graph is {agent_type: [deps in session order]}:
+
+  • no `depends_on`  → specialists fan out on the goal, the last agent
+                       depends on all of them and synthesizes
+  • `depends_on`     → exactly the edges given; must be acyclic
+
+The synthesizer role (the "FINAL agent" prompt) is derived from the graph,
+not from list position: it goes to a sink that builds — directly or through
+other agents — on every other agent in the session.
+
+Errors are raised as ValueError; the API layer maps them to HTTP 400.
+"""
+
+
+def resolve_graph(agent_types: list, depends_on: dict | None) -> dict:
+    """Validate `depends_on` against `agent_types` and return the graph."""
+    if len(set(agent_types)) != len(agent_types):
+        raise ValueError('parallel mode requires each agent type at most once')
+    if depends_on is None:
+        *specialists, final = agent_types
+        return {**{a: [] for a in specialists}, final: list(specialists)}
+
+    graph = {a: [] for a in agent_types}
+    for node, deps in depends_on.items():
+        node = node.strip().lower()
+        deps = [d.strip().lower() for d in deps]
+        unknown = [x for x in [node, *deps] if x not in graph]
+        if unknown:
+            raise ValueError(f'depends_on references agents not in agent_types: {unknown}')
+        graph[node] = [a for a in agent_types if a in deps]
+
+    # Kahn's algorithm — anything left over sits on a cycle.
+    indegree = {a: len(d) for a, d in graph.items()}
+    ready = [a for a, n in indegree.items() if n == 0]
+    seen = 0
+    while ready:
+        done = ready.pop()
+        seen += 1
+        for a, deps in graph.items():
+            if done in deps:
+                indegree[a] -= 1
+                if indegree[a] == 0:
+                    ready.append(a)
+    if seen != len(graph):
+        raise ValueError('depends_on contains a cycle')
+    return graph
+
+
+def ancestors(graph: dict, node: str) -> set:
+    """Every agent whose output reaches `node`, directly or transitively."""
+    found: set = set()
+    stack = list(graph[node])
+    while stack:
+        dep = stack.pop()
+        if dep not in found:
+            found.add(dep)
+            stack.extend(graph[dep])
+    return found
+
+
+def synthesizers(graph: dict) -> set:
+    """Agents that build on all the others — these get the FINAL-agent role."""
+    if len(graph) < 2:
+        return set()
+    return {
+        node for node in graph
+        if ancestors(graph, node) == set(graph) - {node}
+    }
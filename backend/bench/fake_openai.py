@@ -0,0 +1,128 @@
+"""
+OpenAI-compatible stub server for offline benchmarks.
+─────────────────────────────────────────────────────
+Serves just enough of the OpenAI API for ChatOpenAI / CrewAI to run against
+it without spending tokens:
+
+  POST /v1/chat/completions   streamed (SSE chunks + [DONE]) or plain JSON
+  GET  /v1/models             used by llm.prewarm()
+  GET  /stats                 requests served, streams in flight
+
+Each completion waits `latency` seconds (time to first token), then emits
+`tokens` tokens at `tokens_per_second`. The reply ends with
+"Final Answer:" so CrewAI's ReAct parser accepts it as a finished answer.
+
+    python -m bench.fake_openai --port 9100 --latency 0.3 --tokens-per-second 60
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:9100/v1 and
+any OPENAI_API_KEY.
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeConfig:
+    latency: float = 0.3            # seconds before the first token
+    tokens_per_second: float = 50.0
+    tokens: int = 120
+
+
+def _words(n: int) -> list:
+    body = ["Thought:", "I", "now", "know", "the", "final", "answer", "\nFinal", "Answer:"]
+    filler = ("benchmark token stream from the fake OpenAI server for NexOS load testing " * 8).split()
+    words = body + [filler[i % len(filler)] for i in range(max(0, n - len(body)))]
+    return [w if i == 0 else " " + w for i, w in enumerate(words[:max(n, len(body))])]
+
+
+def create_app(config: FakeConfig | None = None) -> FastAPI:
+    cfg = config or FakeConfig()
+    app = FastAPI(title="fake-openai")
+    stats = {"requests": 0, "streams_in_flight": 0, "tokens_sent": 0}
+    app.state.config = cfg
+    app.state.stats = stats
+
+    def chunk(cid: str, model: str, delta: dict, finish=None) -> str:
+        payload = {
+            "id": cid, "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-4o-mini")
+        cid = f"chatcmpl-bench{stats['requests']}"
+        stats["requests"] += 1
+        words = _words(cfg.tokens)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                 "total_tokens": prompt_tokens + len(words)}
+
+        if not body.get("stream"):
+            generation = len(words) / cfg.tokens_per_second if cfg.tokens_per_second > 0 else 0
+            await asyncio.sleep(cfg.latency + generation)
+            stats["tokens_sent"] += len(words)
+            return JSONResponse({
+                "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(words)}}],
+                "usage": usage,
+            })
+
+        async def stream():
+            stats["streams_in_flight"] += 1
+            try:
+                await asyncio.sleep(cfg.latency)
+                yield chunk(cid, model, {"role": "assistant", "content": ""})
+                interval = 1 / cfg.tokens_per_second if cfg.tokens_per_second > 0 else 0
+                for word in words:
+                    yield chunk(cid, model, {"content": word})
+                    stats["tokens_sent"] += 1
+                    if interval:
+                        await asyncio.sleep(interval)
+                yield chunk(cid, model, {}, finish="stop")
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    yield f"data: {json.dumps({'id': cid, 'object': 'chat.completion.chunk', 'model': model, 'choices': [], 'usage': usage})}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                stats["streams_in_flight"] -= 1
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=FakeConfig.latency)
+    parser.add_argument("--tokens-per-second", type=float, default=FakeConfig.tokens_per_second)
+    parser.add_argument("--tokens", type=int, default=FakeConfig.tokens)
+    args = parser.parse_args(argv)
+    config = FakeConfig(args.latency, args.tokens_per_second, args.tokens)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Load driver and report for the backend.
+───────────────────────────────────────
+Opens N concurrent /chat/stream, /chat and /agora/collaborate sessions and
+reports, per scenario:
+
+  ttft_ms        p50/p95/p99 request → first text_chunk frame (SSE scenarios)
+  e2e_ms         p50/p95/p99 request → done frame / JSON response
+  tokens_per_s   aggregate streamed frames per wall-clock second, and the
+                 mean per-stream rate after the first token
+  server         peak thread count and RSS of the backend process (Linux /proc)
+
+Requests send cache="bypass" so every run reaches the LLM. Results are
+written as JSON (bench/results/<timestamp>-<commit>.json by default) and
+--compare prints the change against an earlier file.
+
+Against a running backend (already pointed at a stub or real API):
+
+    python -m bench.load --base-url http://127.0.0.1:8000 --server-pid <pid>
+
+Fully offline — start the stub OpenAI server and a backend wired to it:
+
+    python -m bench.load --spawn --concurrency 16 --requests 64 \\
+        --latency 0.3 --tokens-per-second 60 --compare bench/results/<old>.json
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from dataclasses import dataclass, field
+
+import httpx
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(_BACKEND_DIR, "bench", "results")
+
+
+@dataclass
+class Sample:
+    ok: bool
+    e2e: float
+    ttft: float | None = None
+    tokens: int = 0
+    error: str | None = None
+
+
+@dataclass
+class ProcPeak:
+    threads: int = 0
+    rss_mb: float = 0.0
+    samples: list = field(default_factory=list)
+
+
+# ── Stats ────────────────────────────────────────────────────
+
+def percentile(values: list, p: float) -> float | None:
+    """Linear-interpolated percentile (p in 0..100); None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _dist_ms(values: list) -> dict:
+    return {f"p{p}": None if (v := percentile(values, p)) is None else round(v * 1000, 1)
+            for p in (50, 95, 99)}
+
+
+def summarize(samples: list, wall: float) -> dict:
+    ok = [s for s in samples if s.ok]
+    tokens = sum(s.tokens for s in ok)
+    rates = [s.tokens / (s.e2e - s.ttft) for s in ok if s.ttft is not None and s.e2e > s.ttft and s.tokens]
+    errors: dict = {}
+    for s in samples:
+        if not s.ok:
+            errors[s.error] = errors.get(s.error, 0) + 1
+    return {
+        "requests": len(samples),
+        "ok": len(ok),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 3) if wall else None,
+        "ttft_ms": _dist_ms([s.ttft for s in ok if s.ttft is not None]),
+        "e2e_ms": _dist_ms([s.e2e for s in ok]),
+        "tokens_per_s": {
+            "aggregate": round(tokens / wall, 1) if wall else None,
+            "per_stream_mean": round(sum(rates) / len(rates), 1) if rates else None,
+        },
+    }
+
+
+def proc_stats(pid: int) -> tuple[int, float] | None:
+    """(threads, RSS in MB) from /proc/<pid>/status, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["Threads"]), int(fields["VmRSS"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+async def _watch_proc(pid: int, peak: ProcPeak, stop: asyncio.Event, every: float = 0.2) -> None:
+    while not stop.is_set():
+        stat = proc_stats(pid)
+        if stat:
+            peak.threads = max(peak.threads, stat[0])
+            peak.rss_mb = max(peak.rss_mb, stat[1])
+            peak.samples.append(stat)
+        try:
+            await asyncio.wait_for(stop.wait(), every)
+        except asyncio.TimeoutError:
+            pass
+
+
+# ── Sessions ─────────────────────────────────────────────────
+
+async def sse_session(client: httpx.AsyncClient, path: str, payload: dict) -> Sample:
+    t0 = time.perf_counter()
+    ttft, tokens = None, 0
+    try:
+        async with client.stream("POST", path, json=payload) as resp:
+            if resp.status_code != 200:
+                await resp.aread()
+                return Sample(False, time.perf_counter() - t0, error=f"HTTP {resp.status_code}")
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:].strip())
+                kind = event.get("type")
+                if kind == "text_chunk":
+                    tokens += 1
+                    if ttft is None:
+                        ttft = time.perf_counter() - t0
+                elif kind == "error":
+                    return Sample(False, time.perf_counter() - t0, ttft, tokens, "stream error")
+                elif kind == "done":
+                    break
+    except httpx.HTTPError as e:
+        return Sample(False, time.perf_counter() - t0, error=type(e).__name__)
+    return Sample(True, time.perf_counter() - t0, ttft, tokens)
+
+
+async def chat_session(client: httpx.AsyncClient, path: str, payload: dict) -> Sample:
+    t0 = time.perf_counter()
+    try:
+        resp = await client.post(path, json=payload)
+    except httpx.HTTPError as e:
+        return Sample(False, time.perf_counter() - t0, error=type(e).__name__)
+    if resp.status_code != 200:
+        return Sample(False, time.perf_counter() - t0, error=f"HTTP {resp.status_code}")
+    return Sample(True, time.perf_counter() - t0)
+
+
+def scenarios(args) -> dict:
+    message = {"message": args.message, "cache": "bypass"}
+    return {
+        "stream": (sse_session, "/chat/stream", {"agent_type": args.agent_type, **message}),
+        "chat": (chat_session, "/chat", {"agent_type": args.agent_type, **message}),
+        "agora": (sse_session, "/agora/collaborate", {
+            "goal": args.message,
+            "agent_types": args.agora_agents.split(","),
+            "mode": args.agora_mode,
+        }),
+    }
+
+
+async def run_scenario(client, session, path, payload, concurrency: int, requests: int,
+                       server_pid: int | None) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    peak, stop = ProcPeak(), asyncio.Event()
+    watcher = asyncio.create_task(_watch_proc(server_pid, peak, stop)) if server_pid else None
+
+    async def one():
+        async with gate:
+            return await session(client, path, payload)
+
+    t0 = time.perf_counter()
+    samples = await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    if watcher:
+        await watcher
+    report = summarize(list(samples), wall)
+    report["concurrency"] = concurrency
+    if server_pid:
+        report["server"] = {"peak_threads": peak.threads, "peak_rss_mb": round(peak.rss_mb, 1)}
+    return report
+
+
+# ── Comparison ───────────────────────────────────────────────
+
+def compare(current: dict, baseline: dict) -> list:
+    """Lines describing how each scenario's key numbers moved vs the baseline."""
+    lines = []
+    for name, now in current["scenarios"].items():
+        then = baseline.get("scenarios", {}).get(name)
+        if not then:
+            continue
+        for metric, key in (("ttft_ms", "p50"), ("ttft_ms", "p95"), ("e2e_ms", "p50"),
+                            ("e2e_ms", "p95"), ("e2e_ms", "p99"), ("tokens_per_s", "aggregate")):
+            a, b = then.get(metric, {}).get(key), now.get(metric, {}).get(key)
+            if a is None or b is None:
+                continue
+            change = (b - a) / a * 100 if a else 0.0
+            lines.append(f"{name:7s} {metric}.{key:9s} {a:>10.1f} → {b:>10.1f}  ({change:+.1f}%)")
+    return lines
+
+
+# ── Spawned stack ────────────────────────────────────────────
+
+def _wait_http(url: str, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def spawn_stack(args) -> tuple[list, int]:
+    """Start the stub OpenAI server and a backend pointed at it. Returns (procs, backend pid)."""
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_openai", "--port", str(args.fake_port),
+         "--latency", str(args.latency), "--tokens-per-second", str(args.tokens_per_second),
+         "--tokens", str(args.tokens)],
+        cwd=_BACKEND_DIR,
+    )
+    _wait_http(f"{fake_url}/v1/models")
+    port = httpx.URL(args.base_url).port or 8000
+    env = {**os.environ, "OPENAI_BASE_URL": f"{fake_url}/v1",
+           "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-bench")}
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=_BACKEND_DIR, env=env,
+    )
+    _wait_http(f"{args.base_url}/health")
+    # Measure steady state, not warm-up.
+    deadline = time.time() + 120
+    while time.time() < deadline and httpx.get(f"{args.base_url}/health/ready").status_code != 200:
+        time.sleep(0.5)
+    return [backend, fake], backend.pid
+
+
+def _git_sha() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_BACKEND_DIR, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    server_pid = args.server_pid
+    procs: list = []
+    if args.spawn:
+        procs, server_pid = spawn_stack(args)
+    try:
+        table = scenarios(args)
+        results = {}
+        timeout = httpx.Timeout(args.timeout, connect=10.0)
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout, limits=limits) as client:
+            for name in args.scenarios.split(","):
+                session, path, payload = table[name]
+                results[name] = await run_scenario(
+                    client, session, path, payload, args.concurrency, args.requests, server_pid,
+                )
+                print(f"{name}: {json.dumps(results[name])}", file=sys.stderr)
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return {
+        "meta": {
+            "commit": _git_sha(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "args": vars(args),
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default="stream,chat,agora")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=32, help="sessions per scenario")
+    parser.add_argument("--agent-type", default="sales")
+    parser.add_argument("--agora-agents", default="market_intelligence,sales,orchestrator")
+    parser.add_argument("--agora-mode", default="parallel", choices=("sequential", "parallel"))
+    parser.add_argument("--message", default="Give me a three-step plan to grow revenue this quarter.")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--server-pid", type=int, help="backend PID to sample threads / RSS from")
+    parser.add_argument("--spawn", action="store_true", help="start the stub OpenAI server and a backend")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--tokens", type=int, default=120, help="tokens per stub completion")
+    parser.add_argument("--out", help="result file (default bench/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to diff against")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit'] or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {out}")
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(report, json.load(f))) or "nothing comparable")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,19 @@ context about who the startup is, what they do, and for whom.
 
 The profile is stored in company_profile.json next to this file.
 Update it via the /api/company-profile PATCH endpoint (or edit the JSON directly).
+
+Reads are served from an in-process cache (profile dict, formatted context
+block and content hash) that is invalidated when the file's mtime/size change
+or when save_profile() runs, so the hot path costs one stat() call.
+Writes go through a temp file + rename so readers in any process never see
+a half-written file.
 """
 
+import os
 import json
+import hashlib
+import tempfile
+import threading
 from pathlib import Path
 
 PROFILE_PATH = Path(__file__).parent / "company_profile.json"
@@ -27,8 +37,22 @@ FIELDS = [
 DEFAULT_PROFILE: dict = {f: "" for f in FIELDS}
 
 
-def load_profile() -> dict:
-    """Load the company profile from disk. Returns defaults if not set."""
+# ── Cached snapshot ───────────────────────────────────────────
+# (file signature, profile, formatted context, profile hash)
+
+_lock = threading.Lock()
+_snapshot: tuple | None = None
+
+
+def _file_signature():
+    try:
+        st = PROFILE_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_profile() -> dict:
     if PROFILE_PATH.exists():
         try:
             data = json.loads(PROFILE_PATH.read_text(encoding="utf-8"))
@@ -38,15 +62,67 @@ def load_profile() -> dict:
     return dict(DEFAULT_PROFILE)
 
 
+def _store(signature, profile: dict) -> tuple:
+    global _snapshot
+    digest = hashlib.sha256(
+        json.dumps(profile, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:16]
+    snap = (signature, profile, _format(profile), digest)
+    with _lock:
+        _snapshot = snap
+    return snap
+
+
+def _current() -> tuple:
+    signature = _file_signature()
+    snap = _snapshot
+    if snap is not None and snap[0] == signature:
+        return snap
+    return _store(signature, _read_profile())
+
+
+def load_profile() -> dict:
+    """Load the company profile. Returns defaults if not set."""
+    return dict(_current()[1])
+
+
+def profile_hash() -> str:
+    """Short content hash of the current profile (changes whenever it does)."""
+    return _current()[3]
+
+
+def _target_mode() -> int:
+    """Permissions for the rewritten file: keep the existing ones, else 0644."""
+    try:
+        return PROFILE_PATH.stat().st_mode & 0o777
+    except FileNotFoundError:
+        return 0o644
+
+
 def save_profile(data: dict) -> dict:
-    """Persist the company profile to disk. Returns the saved dict."""
+    """Persist the company profile to disk atomically. Returns the saved dict."""
     merged = {
         **DEFAULT_PROFILE,
         **{k: v or "" for k, v in data.items() if k in FIELDS},
     }
-    PROFILE_PATH.write_text(
-        json.dumps(merged, indent=2, ensure_ascii=False), encoding="utf-8"
+    fd, tmp_path = tempfile.mkstemp(
+        dir=PROFILE_PATH.parent, prefix=".company_profile.", suffix=".tmp"
     )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(merged, indent=2, ensure_ascii=False))
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; don't let a save narrow the permissions.
+        os.chmod(tmp_path, _target_mode())
+        os.replace(tmp_path, PROFILE_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _store(_file_signature(), dict(merged))
     return merged
 
 
@@ -70,7 +146,10 @@ def format_context() -> str:
     Return a formatted context block ready to be prepended to any agent prompt.
     Returns an empty string if no meaningful profile has been set.
     """
-    p = load_profile()
+    return _current()[2]
+
+
+def _format(p: dict) -> str:
     lines = [
         f"{label}: {p[key]}"
         for key, label in _LABELS.items()
@@ -0,0 +1,277 @@
+"""
+Server-side conversation history for ChatRequest.conversation_id.
+─────────────────────────────────────────────────────────────────
+/chat and /chat/stream used to ignore conversation_id, so the frontend
+stuffed the whole history into `message` and prompts grew without bound.
+CONVERSATIONS keeps every turn in SQLite (WAL, indexed by
+(conversation_id, created_at)) and hands the task builder a bounded view:
+
+  • window   — the newest messages that fit CONVERSATION_WINDOW_TOKENS (a
+               newest message that alone exceeds it keeps its head and tail)
+  • summary  — a rolling summary of everything older than the window
+
+When messages fall out of the window, a background worker folds them into
+the summary (with SUMMARY_MODEL; an extractive summary if the LLM call
+fails), so the request path only ever reads. Until the worker catches up,
+the prompt carries the previous summary plus the window.
+
+    CONVERSATIONS.prompt_block(cid)               # → text for NexOSTasks.build(history=...)
+    CONVERSATIONS.append(cid, "user", message)
+    CONVERSATIONS.append(cid, "assistant", answer)
+
+Env vars:
+  CONVERSATION_DB              — SQLite file (default: backend/conversations.db)
+  CONVERSATION_WINDOW_TOKENS   — recent-history budget per prompt   (default 2000)
+  CONVERSATION_SUMMARY_TOKENS  — rolling summary budget              (default 400)
+  SUMMARY_MODEL                — model used to summarize             (default MODEL_NAME)
+"""
+
+import os
+import re
+import time
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_conversation ON messages (conversation_id, created_at);
+CREATE TABLE IF NOT EXISTS summaries (
+    conversation_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    covered_until INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def elide(text: str, max_tokens: int) -> str:
+    """Head and tail of `text` around an elision marker, within max_tokens."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    chars = (max_tokens - 1) * 4
+    marker = f"\n…[{estimate_tokens(text) - max_tokens} tokens elided]…\n"
+    keep = chars - len(marker)
+    if keep < 2:
+        return text[:chars]
+    tail = keep // 2
+    return text[:keep - tail] + marker + text[-tail:]
+
+
+class History(NamedTuple):
+    summary: str
+    window: list            # [(role, content)], oldest first
+
+
+# ── Summarizers ──────────────────────────────────────────────
+
+def extractive_summary(previous: str, messages: list, max_tokens: int) -> str:
+    """Fallback: the previous summary plus the first sentence of each message, trimmed to budget."""
+    lines = [previous] if previous else []
+    for role, content in messages:
+        first = re.split(r"(?<=[.!?])\s+", " ".join(content.split()), maxsplit=1)[0]
+        lines.append(f"{role}: {first[:240]}")
+    text = "\n".join(lines)
+    budget = max_tokens * 4
+    # Keep the most recent part when over budget.
+    return text if len(text) <= budget else "…" + text[-budget:]
+
+
+def llm_summary(previous: str, messages: list, max_tokens: int) -> str:
+    """Rolling summary with SUMMARY_MODEL over the shared HTTP client."""
+    import llm
+
+    transcript = "\n".join(f"{role}: {content}" for role, content in messages)
+    prompt = (
+        f"Update the running summary of a conversation between a founder and an AI agent. "
+        f"Keep facts, decisions, numbers, names and open questions; drop pleasantries. "
+        f"Answer with the new summary only, at most {max_tokens} tokens.\n\n"
+        f"Current summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+    )
+    model = llm.streaming_llm(
+        streaming=False,
+        model=os.getenv("SUMMARY_MODEL") or os.getenv("MODEL_NAME", "gpt-4o-mini"),
+        temperature=0,
+        max_tokens=max_tokens,
+    )
+    return str(model.invoke(prompt).content).strip()
+
+
+# ── Store ────────────────────────────────────────────────────
+
+class ConversationStore:
+    def __init__(
+        self,
+        db_path: str,
+        window_tokens: int = 2000,
+        summary_tokens: int = 400,
+        summarizer: Callable[[str, list, int], str] = llm_summary,
+        clock=time.time,
+    ):
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self._summarizer = summarizer
+        self._clock = clock
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._queued: set = set()     # conversations with a summary pass waiting to start
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversation-summary")
+        self.stats = {"appends": 0, "summaries": 0, "summary_fallbacks": 0}
+
+    # ── Writes ───────────────────────────────────────────────
+
+    def append(self, conversation_id: str, role: str, content: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO messages (conversation_id, role, content, tokens, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, role, content, estimate_tokens(content), self._clock()),
+            )
+            self._db.commit()
+            self.stats["appends"] += 1
+        if self._overflow(conversation_id):
+            self._schedule(conversation_id)
+
+    # ── Reads ────────────────────────────────────────────────
+
+    def _window(self, conversation_id: str) -> tuple[list, int | None]:
+        """Newest-first scan until the token budget is spent → (rows oldest first, first id)."""
+        rows, used = [], 0
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT id, role, content, tokens FROM messages WHERE conversation_id = ?"
+                " ORDER BY created_at DESC, id DESC",
+                (conversation_id,),
+            )
+            for msg_id, role, content, tokens in cursor:
+                if used + tokens > self.window_tokens:
+                    if not rows:
+                        # The newest message alone is over budget: keep its head and tail.
+                        rows.append((msg_id, role, elide(content, self.window_tokens)))
+                    break
+                rows.append((msg_id, role, content))
+                used += tokens
+        rows.reverse()
+        return rows, rows[0][0] if rows else None
+
+    def _summary(self, conversation_id: str) -> tuple[str, int]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT summary, covered_until FROM summaries WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()
+        return (row[0], row[1]) if row else ("", 0)
+
+    def history(self, conversation_id: str) -> History:
+        rows, _ = self._window(conversation_id)
+        summary, _ = self._summary(conversation_id)
+        return History(summary, [(role, content) for _, role, content in rows])
+
+    def has_history(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM messages WHERE conversation_id = ? LIMIT 1", (conversation_id,)
+            ).fetchone() is not None
+
+    def prompt_block(self, conversation_id: str) -> str:
+        """History formatted for the task description ('' for a new conversation)."""
+        summary, window = self.history(conversation_id)
+        if not summary and not window:
+            return ""
+        lines = ["--- CONVERSATION SO FAR (continue from here; the new message follows) ---"]
+        if summary:
+            lines.append(f"Summary of earlier messages:\n{summary}\n")
+        for role, content in window:
+            lines.append(f"{role.upper()}: {content}")
+        lines.append("--- END OF CONVERSATION SO FAR ---")
+        return "\n".join(lines) + "\n"
+
+    # ── Rolling summary ──────────────────────────────────────
+
+    def _overflow(self, conversation_id: str) -> bool:
+        """True when messages older than the window aren't in the summary yet."""
+        _, first_in_window = self._window(conversation_id)
+        _, covered = self._summary(conversation_id)
+        if first_in_window is None:
+            return False
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM messages WHERE conversation_id = ? AND id > ? AND id < ? LIMIT 1",
+                (conversation_id, covered, first_in_window),
+            ).fetchone() is not None
+
+    def _schedule(self, conversation_id: str) -> None:
+        # A pass that is already queued will see this message too; one that
+        # is already running might not, so only a queued pass is coalesced.
+        with self._lock:
+            if conversation_id in self._queued:
+                return
+            self._queued.add(conversation_id)
+        self._worker.submit(self._summarize, conversation_id)
+
+    def _summarize(self, conversation_id: str) -> None:
+        with self._lock:
+            self._queued.discard(conversation_id)
+        _, first_in_window = self._window(conversation_id)
+        previous, covered = self._summary(conversation_id)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, role, content FROM messages"
+                " WHERE conversation_id = ? AND id > ? AND id < ? ORDER BY id",
+                (conversation_id, covered, first_in_window),
+            ).fetchall()
+        if not rows:
+            return
+        messages = [(role, content) for _, role, content in rows]
+        try:
+            summary = self._summarizer(previous, messages, self.summary_tokens)
+        except Exception:
+            logger.warning("Conversation summary via LLM failed; using extractive summary",
+                           exc_info=True)
+            self.stats["summary_fallbacks"] += 1
+            summary = extractive_summary(previous, messages, self.summary_tokens)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries (conversation_id, summary, covered_until, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                (conversation_id, summary, rows[-1][0], self._clock()),
+            )
+            self._db.commit()
+            self.stats["summaries"] += 1
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait for queued summaries (tests / shutdown)."""
+        self._worker.submit(lambda: None).result(timeout)
+
+    def close(self) -> None:
+        self._worker.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+
+CONVERSATIONS = ConversationStore(
+    db_path=os.getenv("CONVERSATION_DB", os.path.join(_BACKEND_DIR, "conversations.db")),
+    window_tokens=int(os.getenv("CONVERSATION_WINDOW_TOKENS", "2000")),
+    summary_tokens=int(os.getenv("CONVERSATION_SUMMARY_TOKENS", "400")),
+)
@@ -0,0 +1,291 @@
+"""
+Bounded execution pool for crew runs, with admission control.
+─────────────────────────────────────────────────────────────
+crew.kickoff() is synchronous and can run for minutes, so it must never run
+on the event loop, and it must not get an unbounded thread per request
+either. Every agent endpoint submits its crew work here:
+
+  • at most `max_concurrency` crews run at once (one worker thread each)
+  • at most `queue_size` more may wait for a worker
+  • beyond that, submit() raises PoolFull  → HTTP 429 + Retry-After
+  • a pool that is shutting down fails with PoolUnavailable, and a job
+    still waiting after `queue_timeout` with QueueTimeout (a subclass)
+                                            → HTTP 503 + Retry-After
+
+A request that fans out into several jobs (parallel Agora sessions) takes a
+Reservation up front: its slots are counted against the queue at admission
+time and its jobs draw from them, so the bound holds however many sessions
+are admitted at once.
+
+stats() exposes queue-depth / in-flight / wait-time gauges.
+"""
+
+import time
+import math
+import heapq
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, InvalidStateError
+
+
+class PoolRejected(Exception):
+    """Base class for admission failures; carries the HTTP mapping and run outcome."""
+    status_code = 503
+    outcome = 'rejected'
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PoolFull(PoolRejected):
+    status_code = 429
+
+
+class PoolUnavailable(PoolRejected):
+    status_code = 503
+
+
+class QueueTimeout(PoolUnavailable):
+    outcome = 'queue_timeout'
+
+
+def _settle(future: Future, result=None, exc: BaseException | None = None) -> None:
+    """Resolve `future` unless the caller already cancelled it."""
+    try:
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class Reservation:
+    """Slots admitted together; jobs submitted through it can't be rejected."""
+
+    def __init__(self, pool: 'CrewPool', units: int):
+        self._pool = pool
+        self.remaining = units
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._pool._lock:
+            if self.remaining <= 0:
+                raise RuntimeError('Reservation has no slots left')
+            self.remaining -= 1
+            self._pool._reserved -= 1
+        return self._pool._enqueue(fn, args, kwargs)
+
+    def release(self) -> None:
+        """Return unused slots (call when the request finishes)."""
+        with self._pool._lock:
+            self._pool._reserved -= self.remaining
+            self.remaining = 0
+
+
+class CrewPool:
+    def __init__(self, max_concurrency: int = 8, queue_size: int = 32, queue_timeout: float = 120.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix='crew',
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._running = 0
+        self._queued = 0
+        self._reserved = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._completed = 0
+        self._wait_last = 0.0
+        self._wait_max = 0.0
+        self._wait_total = 0.0
+        self._started = 0
+        self._run_avg = 30.0   # seconds; EMA seed used for Retry-After estimates
+
+        # Deadline reaper: one daemon thread expires every queued job.
+        self._deadlines: list = []   # heap of (deadline, seq, expire); entries leave when the job finishes
+        self._seq = 0
+        self._reaper_cv = threading.Condition(self._lock)
+        self._reaper = None
+
+    # ── Admission ────────────────────────────────────────────
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, for the Retry-After header."""
+        with self._lock:
+            return self._retry_after()
+
+    def _retry_after(self) -> int:
+        waves = math.ceil((self._queued + self._reserved + 1) / self.max_concurrency)
+        return max(1, min(300, int(self._run_avg * waves)))
+
+    def _admit(self, units: int) -> None:
+        """Caller holds the lock. Raise if `units` more slots don't fit."""
+        if self._closed:
+            raise PoolUnavailable('Server is shutting down', retry_after=5)
+        used = self._running + self._queued + self._reserved
+        if used + units > self.max_concurrency + self.queue_size:
+            self._rejected += 1
+            raise PoolFull(
+                f'All {self.max_concurrency} agent workers are busy and '
+                f'{self.queue_size} requests are already waiting',
+                retry_after=self._retry_after(),
+            )
+
+    def reserve(self, units: int) -> Reservation:
+        """Admit a multi-job request as a whole, or raise PoolFull / PoolUnavailable."""
+        units = max(1, units)
+        with self._lock:
+            self._admit(units)
+            self._reserved += units
+        return Reservation(self, units)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._lock:
+            self._admit(1)
+        return self._enqueue(fn, args, kwargs)
+
+    async def run(self, fn, *args, **kwargs):
+        """Submit and await from the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    # ── Execution ────────────────────────────────────────────
+
+    def _enqueue(self, fn, args, kwargs) -> Future:
+        """
+        Queue an already-admitted job. Returns a Future owned by the caller:
+        cancelling it drops the job if it hasn't started, and a job still
+        queued at its deadline fails with QueueTimeout.
+        """
+        outer: Future = Future()
+        enqueued = time.monotonic()
+
+        def job():
+            started = time.monotonic()
+            waited = started - enqueued
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                self._wait_last = waited
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.monotonic() - started
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_avg = 0.8 * self._run_avg + 0.2 * elapsed
+
+        with self._lock:
+            self._queued += 1
+        try:
+            inner = self._executor.submit(job)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise PoolUnavailable('Server is shutting down', retry_after=5)
+
+        timeout_exc: list = [None]   # set by expire() just before it cancels `inner`
+
+        def expire() -> None:
+            """Called by the reaper at the deadline; fails the job only if it hasn't started."""
+            timeout_exc[0] = QueueTimeout(
+                f'Request waited {self.queue_timeout:.0f}s for an agent worker',
+                retry_after=self.retry_after(),
+            )
+            # cancel() only succeeds for a job that is still waiting.
+            if inner.cancel():
+                with self._lock:
+                    self._timed_out += 1
+            else:
+                timeout_exc[0] = None
+
+        entry = self._watch(enqueued + self.queue_timeout, expire) if self.queue_timeout else None
+
+        def _inner_done(f: Future):
+            if entry is not None:
+                self._unwatch(entry)
+            if f.cancelled():
+                # Never started: job() didn't run, so release its queue slot here.
+                with self._lock:
+                    self._queued -= 1
+                _settle(outer, exc=timeout_exc[0] or PoolUnavailable(
+                    'Request was dropped before an agent worker picked it up',
+                    retry_after=self.retry_after(),
+                ))
+            elif f.exception() is not None:
+                _settle(outer, exc=f.exception())
+            else:
+                _settle(outer, result=f.result())
+
+        def _outer_done(f: Future):
+            if f.cancelled():
+                inner.cancel()
+
+        inner.add_done_callback(_inner_done)
+        outer.add_done_callback(_outer_done)
+        return outer
+
+    def _watch(self, deadline: float, expire) -> tuple:
+        with self._reaper_cv:
+            self._seq += 1
+            entry = (deadline, self._seq, expire)
+            heapq.heappush(self._deadlines, entry)
+            if self._reaper is None:
+                self._reaper = threading.Thread(
+                    target=self._reap, name='crew-reaper', daemon=True,
+                )
+                self._reaper.start()
+            self._reaper_cv.notify()
+        return entry
+
+    def _unwatch(self, entry: tuple) -> None:
+        """Drop a finished job's deadline (the heap holds at most running + queued jobs)."""
+        with self._reaper_cv:
+            try:
+                self._deadlines.remove(entry)
+            except ValueError:
+                return          # already popped by the reaper
+            heapq.heapify(self._deadlines)
+
+    def _reap(self) -> None:
+        while True:
+            with self._reaper_cv:
+                while not self._deadlines:
+                    self._reaper_cv.wait()
+                deadline, _, expire = self._deadlines[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._reaper_cv.wait(delay)
+                    continue
+                heapq.heappop(self._deadlines)
+            expire()
+
+    # ── Gauges ───────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'queue_limit':     self.queue_size,
+                'running':         self._running,
+                'queue_depth':     self._queued,
+                'reserved':        self._reserved,
+                'wait_ms_last':    round(self._wait_last * 1000, 1),
+                'wait_ms_avg':     round(self._wait_total / self._started * 1000, 1) if self._started else 0.0,
+                'wait_ms_max':     round(self._wait_max * 1000, 1),
+                'completed':       self._completed,
+                'rejected':        self._rejected,
+                'timed_out':       self._timed_out,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
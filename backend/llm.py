@@ -0,0 +1,104 @@
+"""
+Streaming LLM factory on a shared, pooled HTTP transport.
+─────────────────────────────────────────────────────────
+Every /chat/stream request and every Agora agent builds its own
+ChatOpenAI(streaming=True) so that its token callbacks stay private to that
+request. Each of those used to create its own HTTP client as well, so every
+request paid for a fresh TCP + TLS handshake before the first token.
+
+streaming_llm() still returns a new ChatOpenAI per call (callbacks are per
+instance), but all of them send through one process-wide httpx.Client:
+keep-alive connections are reused across requests, and HTTP/2 multiplexes
+concurrent streams over them when the `h2` package is installed. The client
+carries no per-request state.
+
+    llm = streaming_llm(callbacks=[TokenQueueCallback(event_q)])
+
+prewarm() opens a connection at startup so even the first request skips the
+handshake.
+
+Env vars:
+  MODEL_NAME                  — default model                      (default gpt-4o-mini)
+  MODEL_TEMPERATURE           — default temperature                (default 0.7)
+  OPENAI_API_KEY              — API key
+  OPENAI_BASE_URL             — API base                           (default https://api.openai.com/v1)
+  LLM_HTTP_MAX_CONNECTIONS    — pooled connections                 (default 100)
+  LLM_HTTP_KEEPALIVE          — idle keep-alive connections kept   (default 20)
+  LLM_HTTP_KEEPALIVE_EXPIRY   — seconds an idle connection is kept (default 60)
+  LLM_HTTP_TIMEOUT            — read timeout per request, seconds  (default 120)
+  LLM_HTTP2                   — 0 disables HTTP/2                  (default on when h2 is installed)
+"""
+
+import os
+import threading
+import importlib.util
+
+import httpx
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("LLM_HTTP2", "1") == "0":
+        return False
+    return importlib.util.find_spec("h2") is not None
+
+
+def base_url() -> str:
+    return os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
+
+def http_client() -> httpx.Client:
+    """The process-wide pooled client every streaming LLM sends through."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(
+                http2=_http2_enabled(),
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("LLM_HTTP_KEEPALIVE", "20")),
+                    keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60")),
+                ),
+                timeout=httpx.Timeout(float(os.getenv("LLM_HTTP_TIMEOUT", "120")), connect=10.0),
+            )
+        return _client
+
+
+def llm_kwargs(callbacks: list | None = None, **overrides) -> dict:
+    """ChatOpenAI arguments for a streaming LLM on the shared transport."""
+    kwargs = {
+        "model": os.getenv("MODEL_NAME", "gpt-4o-mini"),
+        "streaming": True,
+        "callbacks": list(callbacks or []),
+        "temperature": float(os.getenv("MODEL_TEMPERATURE", "0.7")),
+        "api_key": os.getenv("OPENAI_API_KEY"),
+        "base_url": base_url(),
+        "http_client": http_client(),
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def streaming_llm(callbacks: list | None = None, **overrides):
+    """A new ChatOpenAI with its own callbacks, sharing the pooled HTTP client."""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(**llm_kwargs(callbacks, **overrides))
+
+
+def prewarm() -> int:
+    """Open a pooled connection to the API (startup). Returns the HTTP status."""
+    resp = http_client().get(
+        f"{base_url()}/models",
+        headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"},
+    )
+    return resp.status_code
+
+
+def close() -> None:
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
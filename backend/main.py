@@ -1,27 +1,89 @@
 import os
 import json
 import time
-import queue
 import asyncio
-import threading
+import importlib
+from functools import partial
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException
+from startup import STARTUP
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from textwrap import dedent
 from langchain_core.callbacks.base import BaseCallbackHandler
-from langchain_openai import ChatOpenAI
-from crewai import Crew, Process, Task
-from agents import EngramAgents
-from tasks import NexOSTasks
-from company_context import load_profile, save_profile as _save_profile, format_context
+import llm
+from agent_pool import AGENT_POOL
+from streaming import EventBridge, RUNS, sse_response
+from metrics import RunMetrics, render as render_metrics
+from crew_pool import CrewPool, PoolRejected, Reservation
+from agora_graph import resolve_graph, synthesizers
+from agora_context import AgoraContext
+from conversation_store import CONVERSATIONS, estimate_tokens
+from response_cache import RESPONSE_CACHE, is_side_effect_tool
+from tools.trello_client import TRELLO, TrelloError
+from tools.trello_mirror import TRELLO_MIRROR, verify_webhook
+from tools.gmail_mirror import GMAIL_MIRROR
+from tools.notion_index import NOTION_INDEX, SEARCH_MODE as NOTION_SEARCH_MODE
+from tools.integrations import cache_stats as tool_cache_stats, warm_tools
+from tools.web_cache import WEB_CACHE
+from company_context import load_profile, profile_hash, save_profile as _save_profile, format_context
+
+
+# crewai, langchain_openai and crewai_tools are imported by the startup
+# warm-up (and lazily by the endpoints), not at module import, so the app
+# starts serving /health immediately.
+
+def _warm_llm():
+    # Import + build one LLM, and open the pooled connection to the API.
+    llm.streaming_llm()
+    llm.prewarm()
+
+
+# Dependency order. These packages import each other, so they are imported
+# one after another in a single step: concurrent first imports of
+# interdependent modules can see partially initialised modules.
+_WARM_IMPORTS = ("langchain_openai", "crewai", "crewai_tools", "tasks", "agents")
+
+
+def _import_modules() -> dict:
+    timings = {}
+    for name in _WARM_IMPORTS:
+        t0 = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+    return timings
+
+
+def _warmup_plan() -> list:
+    return [
+        ("imports", {"modules": _import_modules}),
+        ("tools", {"integration_tools": warm_tools, "llm_client": _warm_llm}, False),
+        ("agents", {t: partial(AGENT_POOL.warm, [t]) for t in AGENT_META}, False),
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background: liveness is up at once, readiness
+    # (/health/ready) flips when the heavy imports and agents are built.
+    STARTUP.start(_warmup_plan())
+    GMAIL_MIRROR.start()
+    if NOTION_SEARCH_MODE != "live":
+        NOTION_INDEX.start()
+    yield
+    CREW_POOL.shutdown()
+    TRELLO.close()
+    llm.close()
+    CONVERSATIONS.close()
+
 
-app = FastAPI(title="NexOS Agent API", version="2.0")
+app = FastAPI(title="NexOS Agent API", version="2.0", lifespan=lifespan)
 
 # ── CORS: allow both Next.js (3000) and Vite (5173) ──────────
 app.add_middleware(
@@ -42,7 +104,8 @@ class ChatRequest(BaseModel):
     agent_type: str          # orchestrator | sales | customer_service |
                              # technical | market_intelligence | meeting | hr_ops
     message: str
-    conversation_id: Optional[str] = None  # for future Supabase threading
+    conversation_id: Optional[str] = None  # server-side history (conversation_store.py)
+    cache: Optional[str] = None            # "bypass" skips the response cache
 
 class ChatResponse(BaseModel):
     success: bool
@@ -50,6 +113,7 @@ class ChatResponse(BaseModel):
     agent_name: str
     response: str
     conversation_id: Optional[str] = None
+    cached: bool = False
 
 class AgentInfo(BaseModel):
     id: str
@@ -116,19 +180,120 @@ AGENT_META = {
     },
 }
 
+# ── Crew execution pool ──────────────────────────────────────
+# Every crew run (/chat, /chat/stream, /agora/collaborate) goes through this
+# bounded pool so the event loop stays free for health checks and profile
+# reads, and overload turns into a fast 429/503 instead of a thread pile-up.
+
+CREW_POOL = CrewPool(
+    max_concurrency=int(os.getenv('CREW_MAX_CONCURRENCY', '8')),
+    queue_size=int(os.getenv('CREW_QUEUE_SIZE', '32')),
+    queue_timeout=float(os.getenv('CREW_QUEUE_TIMEOUT', '120')),
+)
+
+
+def _rejected(exc: PoolRejected) -> HTTPException:
+    return HTTPException(
+        status_code=exc.status_code,
+        detail=str(exc),
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
+def _start_stream_job(fn, bridge: EventBridge, run: RunMetrics | None = None):
+    """
+    Admit a streaming crew job or raise 429/503 before the response starts.
+    If the job is later dropped for waiting too long, report it on the stream
+    and finish `run` with the rejection's outcome (the job never entered it).
+    Returns the bridge's frames; with `run`, the run is recorded once they close.
+    """
+    frames = run.until_closed(bridge.stream()) if run is not None else bridge.stream()
+    try:
+        future = CREW_POOL.submit(fn)
+    except PoolRejected as exc:
+        bridge.discard()
+        if run is not None:
+            run.discard_stream()
+            run.finish(exc.outcome)
+        raise _rejected(exc)
+
+    def _on_done(f):
+        exc = None if f.cancelled() else f.exception()
+        if f.cancelled() or isinstance(exc, PoolRejected):
+            if run is not None:
+                run.finish(exc.outcome if exc else 'rejected')
+            bridge.put({'type': 'error', 'content': str(exc or 'Server is shutting down')})
+            bridge.close()
+
+    future.add_done_callback(_on_done)
+    return frames
+
+
+# ── Response cache helpers ───────────────────────────────────
+
+async def _cache_key(agent_type: str, request: ChatRequest) -> str | None:
+    """
+    Response-cache key for this request, or None if the cache is off/bypassed.
+    A message inside an ongoing conversation depends on its history, so it is
+    never answered from (or stored in) the cache.
+    """
+    if not RESPONSE_CACHE.enabled or (request.cache or '').lower() == 'bypass':
+        return None
+    if request.conversation_id and await asyncio.to_thread(
+        CONVERSATIONS.has_history, request.conversation_id
+    ):
+        return None
+    return RESPONSE_CACHE.make_key(
+        agent_type, request.message, profile_hash(),
+        os.getenv('MODEL_NAME', 'gpt-4o-mini'),
+    )
+
+
+def _conversation_history(request: ChatRequest) -> str:
+    """Windowed history + summary for the task prompt (crew worker thread)."""
+    if not request.conversation_id:
+        return ''
+    return CONVERSATIONS.prompt_block(request.conversation_id)
+
+
+def _record_turn(request: ChatRequest, answer: str) -> None:
+    """Append a completed exchange; summarizing overflow happens in the background."""
+    if request.conversation_id:
+        CONVERSATIONS.append(request.conversation_id, 'user', request.message)
+        CONVERSATIONS.append(request.conversation_id, 'assistant', answer)
+
+
+async def _cache_lookup(cache_key: str) -> str | None:
+    """RESPONSE_CACHE.get, kept off the event loop when the SQLite tier is on."""
+    if RESPONSE_CACHE.persistent:
+        return await asyncio.to_thread(RESPONSE_CACHE.get, cache_key)
+    return RESPONSE_CACHE.get(cache_key)
+
+
+def _replay_cached(bridge: EventBridge, text: str, chunk_chars: int = 48) -> None:
+    """Emit a cached answer as a fast synthetic token stream."""
+    for i in range(0, len(text), chunk_chars):
+        bridge.put({'type': 'text_chunk', 'content': text[i:i + chunk_chars]})
+    bridge.put({'type': 'final_answer', 'content': text, 'cached': True})
+    bridge.close()
+
+
 # ── Real-time token streaming callback ───────────────────────
 
 class TokenQueueCallback(BaseCallbackHandler):
     """
-    LangChain callback that pipes every LLM token into an SSE queue
+    LangChain callback that pipes every LLM token into an SSE bridge
     the moment it is generated — before the full response is complete.
     """
-    def __init__(self, q: queue.Queue):
+    def __init__(self, q: EventBridge, metrics: RunMetrics | None = None):
         super().__init__()
         self.q = q
+        self.metrics = metrics
 
     def on_llm_new_token(self, token: str, **kwargs):
         if token:
+            if self.metrics is not None:
+                self.metrics.token()
             self.q.put({'type': 'text_chunk', 'content': token})
 
     def on_llm_error(self, error, **kwargs):
@@ -148,7 +313,19 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    """Liveness: the process is up and serving."""
+    return {"status": "healthy", "ready": STARTUP.ready}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness plus the startup timing report; 503 until warm-up has finished."""
+    report = STARTUP.report()
+    return Response(
+        content=json.dumps(report),
+        media_type="application/json",
+        status_code=200 if report["ready"] else 503,
+    )
 
 
 @app.get("/api/company-profile")
@@ -160,7 +337,34 @@ async def get_company_profile():
 @app.patch("/api/company-profile")
 async def update_company_profile(data: CompanyProfileModel):
     """Save the startup company profile — agents pick it up on the next request."""
-    return _save_profile(data.dict())
+    saved = _save_profile(data.dict())
+    await asyncio.to_thread(RESPONSE_CACHE.clear)
+    return saved
+
+
+@app.get("/api/crew-pool")
+async def crew_pool_stats():
+    """Queue-depth, in-flight and wait-time gauges for the crew execution pool."""
+    return CREW_POOL.stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint (per-agent stage, TTFT, tool and run metrics)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/api/tool-cache")
+async def tool_cache():
+    """Hit/miss/invalidation counters of the integration tool read cache."""
+    return tool_cache_stats()
+
+
+@app.get("/api/web-cache")
+async def web_cache():
+    """Entries, bytes and per-tool hit rates of the shared web search / page cache."""
+    return await asyncio.to_thread(WEB_CACHE.stats)
 
 
 @app.get("/agents")
@@ -196,20 +400,60 @@ async def chat(request: ChatRequest):
                    f"Valid: {list(AGENT_META.keys())}",
         )
 
-    try:
-        nexos = EngramAgents()
-        agent = nexos.get_agent(agent_type)
-        task  = NexOSTasks.build(agent_type, request.message, agent)
-
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False,   # set True for debug logging
-        )
+    run = RunMetrics(agent_type, 'chat')
+    cache_key = await _cache_key(agent_type, request)
+    if cache_key:
+        cached = await _cache_lookup(cache_key)
+        if cached is not None:
+            run.finish('cached')
+            await asyncio.to_thread(_record_turn, request, cached)
+            return ChatResponse(
+                success=True,
+                agent_type=agent_type,
+                agent_name=AGENT_META[agent_type]['name'],
+                response=cached,
+                conversation_id=request.conversation_id,
+                cached=True,
+            )
 
-        result = crew.kickoff()
-        response_text = str(result).strip()
+    side_effects: list = []
+
+    def step_callback(step_output):
+        run.step(step_output)
+        if is_side_effect_tool(str(getattr(step_output, 'tool', ''))):
+            side_effects.append(step_output.tool)
+
+    def run_crew() -> str:
+        from crewai import Crew, Process
+        from tasks import NexOSTasks
+
+        with run:
+            history = _conversation_history(request)
+            t0 = run.now()
+            with AGENT_POOL.checkout(agent_type, step_callback=step_callback) as agent:
+                run.observe('agent_build', t0)
+                with run.stage('task_build'):
+                    task = NexOSTasks.build(agent_type, request.message, agent, history=history)
+
+                crew = Crew(
+                    agents=[agent],
+                    tasks=[task],
+                    process=Process.sequential,
+                    verbose=False,   # set True for debug logging
+                )
+
+                with run.stage('kickoff'):
+                    result = crew.kickoff()
+                result_text = str(result).strip()
+
+        # Store from the crew worker so the SQLite tier never blocks the loop.
+        if cache_key and not side_effects:
+            RESPONSE_CACHE.put(cache_key, result_text)
+        _record_turn(request, result_text)
+        return result_text
+
+    try:
+        response_text = await CREW_POOL.run(run_crew)
 
         return ChatResponse(
             success=True,
@@ -219,6 +463,9 @@ async def chat(request: ChatRequest):
             conversation_id=request.conversation_id,
         )
 
+    except PoolRejected as exc:
+        run.finish(exc.outcome)
+        raise _rejected(exc)
     except Exception as exc:
         import traceback
         traceback.print_exc()
@@ -238,6 +485,9 @@ async def chat_stream(request: ChatRequest):
       final_answer   — completed response   { content }
       error          — failure              { content }
       done           — end of stream
+
+    Frames carry sequential `id:` fields and agent_started includes run_id;
+    after a dropped connection, resume with GET /stream/{run_id}.
     """
     agent_type = request.agent_type.strip().lower()
 
@@ -247,12 +497,32 @@ async def chat_stream(request: ChatRequest):
             detail=f"Unknown agent_type '{agent_type}'. Valid: {list(AGENT_META.keys())}",
         )
 
-    event_q: queue.Queue = queue.Queue()
+    event_q = EventBridge(first={
+        'type': 'agent_started',
+        'agent_name': AGENT_META[agent_type]['name'],
+        'agent_type': agent_type,
+    })
+
+    run = RunMetrics(agent_type, 'chat_stream')
+    cache_key = await _cache_key(agent_type, request)
+    if cache_key:
+        cached = await _cache_lookup(cache_key)
+        if cached is not None:
+            frames = run.until_closed(event_q.stream())
+            run.finish('cached')
+            await asyncio.to_thread(_record_turn, request, cached)
+            _replay_cached(event_q, cached)
+            return sse_response(frames, run_id=event_q.run_id)
+
+    side_effects: list = []
 
     # ── CrewAI step callback (runs in the crew thread) ────────
     def step_callback(step_output):
+        run.step(step_output)
         try:
             if hasattr(step_output, 'tool') and hasattr(step_output, 'tool_input'):
+                if is_side_effect_tool(str(step_output.tool)):
+                    side_effects.append(step_output.tool)
                 event_q.put({
                     'type': 'tool_used',
                     'tool': str(step_output.tool),
@@ -273,28 +543,36 @@ async def chat_stream(request: ChatRequest):
     # ── Run the crew in a background thread ──────────────────
     def run_crew():
         try:
-            # Build a real streaming LLM — tokens flow into event_q the
-            # moment the model generates them, not after completion.
-            streaming_llm = ChatOpenAI(
-                model=os.getenv('MODEL_NAME', 'gpt-4o-mini'),
-                streaming=True,
-                callbacks=[TokenQueueCallback(event_q)],
-                temperature=float(os.getenv('MODEL_TEMPERATURE', '0.7')),
-                api_key=os.getenv('OPENAI_API_KEY'),
-            )
-
-            nexos   = EngramAgents(llm=streaming_llm)
-            agent   = nexos.get_agent(agent_type)
-            agent.step_callback = step_callback
-            task    = NexOSTasks.build(agent_type, request.message, agent)
-            crew    = Crew(
-                agents=[agent],
-                tasks=[task],
-                process=Process.sequential,
-                verbose=False,
-            )
-            result = crew.kickoff()
-            result_text = str(result).strip()
+            from crewai import Crew, Process
+            from tasks import NexOSTasks
+
+            with run:
+                # Build a real streaming LLM — tokens flow into event_q the
+                # moment the model generates them, not after completion.
+                # Its callbacks are private; the HTTP connection pool is shared.
+                streaming_llm = llm.streaming_llm(callbacks=[TokenQueueCallback(event_q, run)])
+
+                history = _conversation_history(request)
+                t0 = run.now()
+                with AGENT_POOL.checkout(
+                    agent_type, llm=streaming_llm, step_callback=step_callback,
+                ) as agent:
+                    run.observe('agent_build', t0)
+                    with run.stage('task_build'):
+                        task = NexOSTasks.build(agent_type, request.message, agent, history=history)
+                    crew = Crew(
+                        agents=[agent],
+                        tasks=[task],
+                        process=Process.sequential,
+                        verbose=False,
+                    )
+                    with run.stage('kickoff'):
+                        result = crew.kickoff()
+                    result_text = str(result).strip()
+
+            if cache_key and not side_effects:
+                RESPONSE_CACHE.put(cache_key, result_text)
+            _record_turn(request, result_text)
 
             # Send the complete assembled text so the frontend can save it
             event_q.put({'type': 'final_answer', 'content': result_text})
@@ -302,34 +580,29 @@ async def chat_stream(request: ChatRequest):
             import traceback; traceback.print_exc()
             event_q.put({'type': 'error', 'content': str(e)})
         finally:
-            event_q.put(None)   # sentinel
+            event_q.close()
 
-    # ── SSE generator ─────────────────────────────────────────
-    async def event_generator():
-        yield f"data: {json.dumps({'type': 'agent_started', 'agent_name': AGENT_META[agent_type]['name'], 'agent_type': agent_type})}\n\n"
+    frames = _start_stream_job(run_crew, event_q, run)
+    return sse_response(frames, run_id=event_q.run_id)
 
-        loop = asyncio.get_event_loop()
-        thread = threading.Thread(target=run_crew, daemon=True)
-        thread.start()
 
-        while True:
-            try:
-                event = await loop.run_in_executor(None, event_q.get, True, 1.0)
-            except Exception:
-                yield ": heartbeat\n\n"
-                continue
-
-            if event is None:
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
-                break
-
-            yield f"data: {json.dumps(event)}\n\n"
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+@app.get("/stream/{run_id}")
+async def resume_stream(run_id: str, request: Request, last_event_id: Optional[int] = None):
+    """
+    Reconnect to a /chat/stream or /agora/collaborate run after a dropped
+    connection. Frames after Last-Event-ID (header, or ?last_event_id=) are
+    replayed from the run's buffer, then the live stream continues. Runs
+    stay available for SSE_RUN_TTL seconds after they finish.
+    """
+    bridge = RUNS.get(run_id)
+    if bridge is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired run '{run_id}'")
+    if last_event_id is None:
+        try:
+            last_event_id = int(request.headers.get('last-event-id', '0'))
+        except ValueError:
+            last_event_id = 0
+    return sse_response(bridge.stream(max(last_event_id, 0)), run_id=run_id)
 
 
 # ── Agora: Multi-agent collaboration ─────────────────────────
@@ -337,6 +610,10 @@ async def chat_stream(request: ChatRequest):
 class AgoraRequest(BaseModel):
     goal: str
     agent_types: List[str]   # ordered list of agents to involve
+    mode: str = "sequential"  # sequential | parallel
+    # parallel mode only: agent_type → agent_types whose output it builds on.
+    # Omitted = every agent runs concurrently and the last one synthesizes.
+    depends_on: Optional[Dict[str, List[str]]] = None
 
 
 _AGORA_ROLE_FOCUS = {
@@ -356,30 +633,47 @@ def _build_agora_task_desc(
     position: int,
     total: int,
     prev_outputs: list,
+    parallel: bool = False,
+    final: bool | None = None,
 ) -> str:
+    """
+    `final` marks the synthesizer. Sequential sessions default it to the last
+    speaker; parallel sessions pass what the dependency graph says.
+    `prev_outputs` are AgoraContext.select() parts (full text or digest).
+    """
+    if final is None:
+        final = position == total - 1 and total > 1
     focus = _AGORA_ROLE_FOCUS.get(agent_type, 'provide your specialized analysis')
     ctx = format_context()
 
     prev_block = ''
     if prev_outputs:
         prev_block = '\n\n--- PREVIOUS AGENTS OUTPUT (build on this, do not repeat) ---\n'
-        for prev_type, prev_text in prev_outputs:
+        for prev_type, prev_text, digest in prev_outputs:
             name = AGENT_META.get(prev_type, {}).get('name', prev_type)
-            prev_block += f'\n[{name}]:\n{prev_text[:2000]}\n'
+            label = f'{name} — digest' if digest else name
+            prev_block += f'\n[{label}]:\n{prev_text}\n'
         prev_block += '\n--- END PREVIOUS OUTPUT ---'
 
-    if position == 0:
-        role_note = (
-            'You are the FIRST agent to speak. '
-            'Set the foundation — be structured and specific. '
-            'End with a clear handoff note for the next agent.'
-        )
-    elif position == total - 1:
+    if final:
         role_note = (
             'You are the FINAL agent. '
             'Synthesize ALL previous contributions into a unified recommendation. '
             'Produce: Summary → Key Decisions → Action Plan (owner + deadline per item).'
         )
+    elif parallel:
+        role_note = (
+            f'You are one of {total} specialists working on this goal at the same time. '
+            'Stay strictly within your own expertise — other agents cover the other angles. '
+            + ('Build DIRECTLY on the outputs you were given below. ' if prev_outputs else '')
+            + 'A final agent will merge everyone\'s contributions, so be structured and specific.'
+        )
+    elif position == 0:
+        role_note = (
+            'You are the FIRST agent to speak. '
+            'Set the foundation — be structured and specific. '
+            'End with a clear handoff note for the next agent.'
+        )
     else:
         role_note = (
             f'You are agent {position + 1} of {total}. '
@@ -401,17 +695,166 @@ def _build_agora_task_desc(
     """).strip()
 
 
+def _agora_graph(agent_types: list, depends_on: Optional[Dict[str, List[str]]]) -> dict:
+    """Resolve the parallel-mode dependency graph, mapping errors to HTTP 400."""
+    try:
+        return resolve_graph(agent_types, depends_on)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _run_agora_agent(
+    bridge: EventBridge,
+    agent_type: str,
+    goal: str,
+    position: int,
+    total: int,
+    context: AgoraContext,
+    prev_positions: list,
+    parallel: bool = False,
+    final: bool | None = None,
+) -> str:
+    """
+    Run one Agora contributor in a crew worker, streaming its tokens tagged by
+    agent. `prev_positions` are the session positions of the agents whose
+    output it builds on; their text comes from `context` within this agent's
+    token budget, and its own output is added to `context` when it finishes.
+    """
+    from crewai import Crew, Process, Task
+
+    if final is None:
+        final = position == total - 1 and total > 1
+
+    # ── Tell frontend this agent is starting ──────
+    bridge.put({
+        'type': 'agent_start',
+        'agent': agent_type,
+        'agent_name': AGENT_META[agent_type]['name'],
+        'avatar_color': AGENT_META[agent_type]['avatar_color'],
+        'position': position,
+        'total': total,
+    })
+
+    run = RunMetrics(agent_type, 'agora')
+
+    # ── Streaming LLM for this agent ──────────────
+    class _TaggedCallback(BaseCallbackHandler):
+        def on_llm_new_token(self, token: str, **kwargs):
+            if token:
+                run.token()
+                bridge.put({
+                    'type': 'text_chunk',
+                    'agent': agent_type,
+                    'content': token,
+                })
+        def on_llm_error(self, error, **kwargs):
+            bridge.put({'type': 'error', 'agent': agent_type, 'content': str(error)})
+
+    streaming_llm = llm.streaming_llm(callbacks=[_TaggedCallback()])
+
+    with run:
+        t0 = run.now()
+        with AGENT_POOL.checkout(agent_type, llm=streaming_llm, step_callback=run.step) as agent:
+            run.observe('agent_build', t0)
+            with run.stage('context'):
+                prev_outputs = context.select(prev_positions, final=final)
+            with run.stage('task_build'):
+                task_desc = _build_agora_task_desc(
+                    agent_type, goal, position, total, prev_outputs,
+                    parallel=parallel, final=final,
+                )
+                prompt_tokens = estimate_tokens(task_desc)
+                run.prompt(prompt_tokens)
+                task = Task(
+                    description=task_desc,
+                    expected_output=(
+                        'A structured, markdown-formatted contribution to the collaboration. '
+                        'Specific, actionable, with headers and bullets.'
+                    ),
+                    agent=agent,
+                )
+
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=False,
+            )
+            with run.stage('kickoff'):
+                result = crew.kickoff()
+            result_text = str(result).strip()
+
+    context.add(position, agent_type, result_text)
+    bridge.put({
+        'type': 'agent_complete',
+        'agent': agent_type,
+        'agent_name': AGENT_META[agent_type]['name'],
+        'position': position,
+        'prompt_tokens': prompt_tokens,
+        'latency_ms': run.elapsed_ms(),
+        'context': {
+            'full': [p.agent_type for p in prev_outputs if not p.digest],
+            'digest': [p.agent_type for p in prev_outputs if p.digest],
+        },
+    })
+    return result_text
+
+
+# Strong references to running parallel sessions so they aren't GC'd mid-run.
+_AGORA_SESSIONS: set = set()
+
+
+async def _run_agora_parallel(
+    bridge: EventBridge, goal: str, agent_types: list, graph: dict, reservation: Reservation,
+) -> None:
+    """
+    Coordinate a parallel session on the event loop: each agent is its own
+    crew-pool job, started as soon as the agents it depends on have finished.
+    Jobs draw on the slots the session reserved when it was admitted.
+    """
+    total = len(agent_types)
+    final = synthesizers(graph)
+    context = AgoraContext()
+    nodes: dict = {}
+
+    async def run_node(position: int, agent_type: str):
+        deps = graph[agent_type]
+        if deps:
+            await asyncio.gather(*(nodes[d] for d in deps))
+        await asyncio.wrap_future(reservation.submit(
+            _run_agora_agent, bridge, agent_type, goal, position, total,
+            context, [agent_types.index(d) for d in deps], parallel=True, final=agent_type in final,
+        ))
+
+    try:
+        for i, at in enumerate(agent_types):
+            nodes[at] = asyncio.ensure_future(run_node(i, at))
+        await asyncio.gather(*nodes.values())
+        bridge.put({'type': 'session_complete', 'total_agents': total})
+    except Exception as e:
+        import traceback; traceback.print_exc()
+        for node in nodes.values():
+            node.cancel()
+        bridge.put({'type': 'error', 'content': str(e)})
+    finally:
+        reservation.release()
+        bridge.close()
+
+
 @app.post("/agora/collaborate")
 async def agora_collaborate(request: AgoraRequest):
     """
     Run a multi-agent collaboration session.
-    Streams SSE events as each agent contributes in sequence.
+    Streams SSE events as each agent contributes — in sequence by default, or
+    concurrently with mode="parallel" (specialists fan out on the goal, then
+    the last agent synthesizes; `depends_on` overrides the graph).
 
     Event types:
       session_start   — lists all agents involved
       agent_start     — agent N is now thinking
-      text_chunk      — token from the current agent  { agent, content }
-      agent_complete  — agent N finished
+      text_chunk      — token from an agent  { agent, content }
+      agent_complete  — agent N finished { prompt_tokens, latency_ms,
+                        context: { full: [...], digest: [...] } }
       session_complete — all agents done
       error           — failure
       done            — end of stream
@@ -422,152 +865,91 @@ async def agora_collaborate(request: AgoraRequest):
         raise HTTPException(status_code=400, detail=f"Unknown agent types: {invalid}")
     if not agent_types:
         raise HTTPException(status_code=400, detail="agent_types must not be empty")
+    mode = request.mode.strip().lower()
+    if mode not in ('sequential', 'parallel'):
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Valid: ['sequential', 'parallel']")
+
+    # Announce session immediately
+    session_start = {
+        'type': 'session_start',
+        'mode': mode,
+        'agents': [
+            {'type': a, 'name': AGENT_META[a]['name'], 'color': AGENT_META[a]['avatar_color']}
+            for a in agent_types
+        ],
+    }
 
-    event_q: queue.Queue = queue.Queue()
-
-    def run_session():
+    if mode == 'parallel':
+        graph = _agora_graph(agent_types, request.depends_on)
         try:
-            prev_outputs: list = []   # [(agent_type, text), ...]
-
-            for i, at in enumerate(agent_types):
-                # ── Tell frontend this agent is starting ──────
-                event_q.put({
-                    'type': 'agent_start',
-                    'agent': at,
-                    'agent_name': AGENT_META[at]['name'],
-                    'avatar_color': AGENT_META[at]['avatar_color'],
-                    'position': i,
-                    'total': len(agent_types),
-                })
-
-                # ── Streaming LLM for this agent ──────────────
-                current_agent = [at]   # mutable reference for callback closure
-
-                class _TaggedCallback(BaseCallbackHandler):
-                    def on_llm_new_token(self, token: str, **kwargs):
-                        if token:
-                            event_q.put({
-                                'type': 'text_chunk',
-                                'agent': current_agent[0],
-                                'content': token,
-                            })
-                    def on_llm_error(self, error, **kwargs):
-                        event_q.put({'type': 'error', 'content': str(error)})
-
-                streaming_llm = ChatOpenAI(
-                    model=os.getenv('MODEL_NAME', 'gpt-4o-mini'),
-                    streaming=True,
-                    callbacks=[_TaggedCallback()],
-                    temperature=float(os.getenv('MODEL_TEMPERATURE', '0.7')),
-                    api_key=os.getenv('OPENAI_API_KEY'),
-                )
-
-                nexos = EngramAgents(llm=streaming_llm)
-                agent = nexos.get_agent(at)
-
-                task_desc = _build_agora_task_desc(at, request.goal, i, len(agent_types), prev_outputs)
-                task = Task(
-                    description=task_desc,
-                    expected_output=(
-                        'A structured, markdown-formatted contribution to the collaboration. '
-                        'Specific, actionable, with headers and bullets.'
-                    ),
-                    agent=agent,
-                )
-
-                crew = Crew(
-                    agents=[agent],
-                    tasks=[task],
-                    process=Process.sequential,
-                    verbose=False,
-                )
-                result = crew.kickoff()
-                result_text = str(result).strip()
-
-                prev_outputs.append((at, result_text))
-
-                event_q.put({
-                    'type': 'agent_complete',
-                    'agent': at,
-                    'agent_name': AGENT_META[at]['name'],
-                    'position': i,
-                })
+            # One slot per agent, reserved up front so later agents can't be bounced.
+            reservation = CREW_POOL.reserve(len(agent_types))
+        except PoolRejected as exc:
+            raise _rejected(exc)
+        event_q = EventBridge(first=session_start)
+        session = asyncio.ensure_future(
+            _run_agora_parallel(event_q, request.goal, agent_types, graph, reservation)
+        )
+        _AGORA_SESSIONS.add(session)
+        session.add_done_callback(_AGORA_SESSIONS.discard)
+    else:
+        event_q = EventBridge(first=session_start)
 
-            event_q.put({'type': 'session_complete', 'total_agents': len(agent_types)})
+        def run_session():
+            try:
+                context = AgoraContext()
+                for i, at in enumerate(agent_types):
+                    _run_agora_agent(
+                        event_q, at, request.goal, i, len(agent_types), context, list(range(i)),
+                    )
 
-        except Exception as e:
-            import traceback; traceback.print_exc()
-            event_q.put({'type': 'error', 'content': str(e)})
-        finally:
-            event_q.put(None)
+                event_q.put({'type': 'session_complete', 'total_agents': len(agent_types)})
 
-    async def event_generator():
-        # Announce session immediately
-        yield f"data: {json.dumps({'type': 'session_start', 'agents': [{'type': a, 'name': AGENT_META[a]['name'], 'color': AGENT_META[a]['avatar_color']} for a in agent_types]})}\n\n"
+            except Exception as e:
+                import traceback; traceback.print_exc()
+                event_q.put({'type': 'error', 'content': str(e)})
+            finally:
+                event_q.close()
 
-        loop = asyncio.get_event_loop()
-        thread = threading.Thread(target=run_session, daemon=True)
-        thread.start()
+        _start_stream_job(run_session, event_q)
 
-        while True:
-            try:
-                event = await loop.run_in_executor(None, event_q.get, True, 1.0)
-            except Exception:
-                yield ': heartbeat\n\n'
-                continue
-            if event is None:
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
-                break
-            yield f"data: {json.dumps(event)}\n\n"
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+    return sse_response(event_q.stream(), run_id=event_q.run_id)
 
 
 # ══════════════════════════════════════════════════════════════
 # TRELLO + CALL ENDPOINTS
 # ══════════════════════════════════════════════════════════════
 
-import os as _os
+async def _trello_api_get(path: str, params: dict = {}) -> list | dict:
+    return (await _trello_api_get_many((path, params)))[0]
 
-def _trello_api_get(path: str, params: dict = {}) -> list | dict:
-    import requests as _req
-    key   = _os.getenv("TRELLO_API_KEY", "")
-    token = _os.getenv("TRELLO_TOKEN", "")
-    if not key or not token:
+
+async def _trello_api_get_many(*calls: tuple) -> list:
+    """Fetch (path, params) pairs concurrently through the shared Trello client."""
+    try:
+        return await TRELLO.aget_many(*calls)
+    except EnvironmentError:
         raise HTTPException(status_code=503, detail="TRELLO_API_KEY / TRELLO_TOKEN not set in .env")
-    resp = _req.get(
-        f"https://api.trello.com/1/{path}",
-        params={"key": key, "token": token, **params},
-        timeout=10,
-    )
-    if not resp.ok:
-        raise HTTPException(status_code=resp.status_code, detail=resp.text)
-    return resp.json()
+    except TrelloError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.text)
 
 
 @app.get("/trello/boards")
 async def trello_list_boards():
     """List all active Trello boards for the linked account."""
-    boards = _trello_api_get("members/me/boards", {"fields": "name,id,url,closed"})
+    boards = await _trello_api_get("members/me/boards", {"fields": "name,id,url,closed"})
     return [b for b in boards if not b.get("closed")]
 
 
 @app.get("/trello/boards/{board_id}/cards")
 async def trello_get_cards(board_id: str):
-    """Return all cards + list names for a board."""
-    cards = _trello_api_get(
-        f"boards/{board_id}/cards",
-        {
-            "fields": "name,desc,due,idList,idMembers,shortUrl,labels",
-            "members": "true",
-            "member_fields": "fullName,username,avatarUrl",
-        },
-    )
-    lists_raw = _trello_api_get(f"boards/{board_id}/lists", {"fields": "name,id"})
+    """Return all cards + list names for a board (served from the local mirror)."""
+    try:
+        cards, lists_raw = await asyncio.to_thread(TRELLO_MIRROR.board, board_id)
+    except EnvironmentError:
+        raise HTTPException(status_code=503, detail="TRELLO_API_KEY / TRELLO_TOKEN not set in .env")
+    except TrelloError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.text)
     lists_map  = {lst["id"]: lst["name"] for lst in lists_raw}
     # Attach list name to each card
     for c in cards:
@@ -575,6 +957,33 @@ async def trello_get_cards(board_id: str):
     return {"cards": cards, "lists": lists_raw}
 
 
+@app.head("/trello/webhook")
+async def trello_webhook_check():
+    """Trello sends a HEAD to the callback URL when a webhook is registered."""
+    return Response(status_code=200)
+
+
+@app.post("/trello/webhook")
+async def trello_webhook(request: Request):
+    """Apply a Trello webhook delivery to the board mirror."""
+    body = await request.body()
+    secret = os.getenv("TRELLO_WEBHOOK_SECRET", "")
+    if secret:
+        callback_url = os.getenv("TRELLO_WEBHOOK_CALLBACK_URL", str(request.url))
+        if not verify_webhook(body, request.headers.get("x-trello-webhook", ""), secret, callback_url):
+            raise HTTPException(status_code=401, detail="Invalid Trello webhook signature")
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body must be JSON")
+    try:
+        applied = await asyncio.to_thread(TRELLO_MIRROR.apply_webhook, payload)
+    except (EnvironmentError, TrelloError) as e:
+        # Acknowledge anyway — the next poll of the action feed catches up.
+        return {"applied": False, "error": str(e)}
+    return {"applied": applied}
+
+
 class ScheduleCallRequest(BaseModel):
     card_id:          str
     card_title:       str
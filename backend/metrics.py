@@ -0,0 +1,189 @@
+"""
+Prometheus metrics for agent runs.
+──────────────────────────────────
+GET /metrics exposes these (all labelled by agent_type):
+
+  nexos_runs_total{endpoint,outcome}       runs finished: ok | error | cached |
+                                           rejected (pool full / shutting down) |
+                                           queue_timeout (waited too long for a worker)
+  nexos_runs_in_flight{endpoint}           runs admitted and not yet finished
+  nexos_stage_seconds{stage}               agent_build (pool checkout),
+                                           context (Agora previous-output selection),
+                                           task_build (NexOSTasks.build / Task),
+                                           kickoff (crew.kickoff)
+  nexos_stage_errors_total{stage}          exceptions raised inside a stage
+  nexos_ttft_seconds                       request accepted → first LLM token
+  nexos_tokens_total                       streamed LLM tokens
+  nexos_prompt_tokens                      estimated task prompt size (Agora agents)
+  nexos_tool_calls_total{tool}             tool calls seen by step_callback
+  nexos_tool_step_seconds{tool}            duration of the agent step that ended
+                                           in the tool call (LLM decision + tool)
+  nexos_run_seconds{endpoint}              request accepted → run finished; for
+                                           SSE endpoints, until the crew has finished
+                                           and the client's stream has closed
+
+One RunMetrics object follows one run through the endpoint, the crew
+worker thread and the LLM callbacks:
+
+    run = RunMetrics(agent_type, "chat_stream")   # in the endpoint
+    ...
+    with run:                                     # in the crew worker
+        with run.stage("task_build"):
+            task = NexOSTasks.build(...)
+    ...
+    return sse_response(run.until_closed(bridge.stream()))
+
+A run is recorded once: when the crew finishes (or finish() is called), or,
+for a stream wrapped in until_closed(), when that stream has closed too.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+_STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+_TTFT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10, 20, 60)
+_PROMPT_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+RUNS = Counter("nexos_runs", "Agent runs finished", ["agent_type", "endpoint", "outcome"])
+IN_FLIGHT = Gauge("nexos_runs_in_flight", "Agent runs in progress", ["agent_type", "endpoint"])
+STAGE_SECONDS = Histogram(
+    "nexos_stage_seconds", "Time spent per run stage", ["agent_type", "stage"], buckets=_STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter("nexos_stage_errors", "Exceptions raised per run stage", ["agent_type", "stage"])
+TTFT_SECONDS = Histogram(
+    "nexos_ttft_seconds", "Time from request to first LLM token", ["agent_type"], buckets=_TTFT_BUCKETS
+)
+TOKENS = Counter("nexos_tokens", "Streamed LLM tokens", ["agent_type"])
+PROMPT_TOKENS = Histogram(
+    "nexos_prompt_tokens", "Estimated task prompt tokens", ["agent_type"], buckets=_PROMPT_BUCKETS
+)
+TOOL_CALLS = Counter("nexos_tool_calls", "Tool calls made by agents", ["agent_type", "tool"])
+TOOL_STEP_SECONDS = Histogram(
+    "nexos_tool_step_seconds", "Duration of agent steps ending in a tool call",
+    ["agent_type", "tool"], buckets=_STAGE_BUCKETS,
+)
+RUN_SECONDS = Histogram(
+    "nexos_run_seconds", "Request accepted to run finished (SSE: stream closed)",
+    ["agent_type", "endpoint"], buckets=_STAGE_BUCKETS,
+)
+
+
+class RunMetrics:
+    def __init__(self, agent_type: str, endpoint: str, clock=time.perf_counter):
+        self.agent_type = agent_type
+        self.endpoint = endpoint
+        self._clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self._last_step = self.started
+        self._first_token = True
+        self._entered = False
+        self._outcome: str | None = None
+        self._pending = 1             # the run itself, plus one per until_closed()
+
+    # ── Run lifetime ─────────────────────────────────────────
+
+    def __enter__(self):
+        IN_FLIGHT.labels(self.agent_type, self.endpoint).inc()
+        self._entered = True
+        with self._lock:
+            self._last_step = self._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        IN_FLIGHT.labels(self.agent_type, self.endpoint).dec()
+        self.finish("error" if exc_type else "ok")
+        return False
+
+    def finish(self, outcome: str) -> None:
+        """The run itself is over; it is recorded once any open stream has closed."""
+        with self._lock:
+            self._outcome = self._outcome or outcome
+        self._release()
+
+    def until_closed(self, frames):
+        """Wrap an SSE frame iterator so the run is recorded only after it closes."""
+        with self._lock:
+            self._pending += 1
+
+        async def wrapped():
+            try:
+                async for frame in frames:
+                    yield frame
+            finally:
+                self._release()
+
+        return wrapped()
+
+    def discard_stream(self) -> None:
+        """Release a stream from until_closed() that will never be served."""
+        self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            if self._pending:
+                return
+            outcome = self._outcome or "error"
+        RUNS.labels(self.agent_type, self.endpoint, outcome).inc()
+        RUN_SECONDS.labels(self.agent_type, self.endpoint).observe(self._clock() - self.started)
+
+    # ── Stages ───────────────────────────────────────────────
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = self._clock()
+        try:
+            yield
+        except BaseException:
+            STAGE_ERRORS.labels(self.agent_type, name).inc()
+            raise
+        finally:
+            self.observe(name, t0)
+
+    def observe(self, name: str, since: float) -> None:
+        """Record a stage that started at `since` (for stages that can't be a with-block)."""
+        STAGE_SECONDS.labels(self.agent_type, name).observe(self._clock() - since)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def elapsed_ms(self) -> int:
+        return round((self._clock() - self.started) * 1000)
+
+    def prompt(self, tokens: int) -> None:
+        PROMPT_TOKENS.labels(self.agent_type).observe(tokens)
+
+    # ── Callbacks ────────────────────────────────────────────
+
+    def token(self) -> None:
+        """Call from the LLM's on_llm_new_token."""
+        with self._lock:
+            first, self._first_token = self._first_token, False
+        if first:
+            TTFT_SECONDS.labels(self.agent_type).observe(self._clock() - self.started)
+        TOKENS.labels(self.agent_type).inc()
+
+    def step(self, step_output) -> None:
+        """Call from the crew step_callback; records tool calls."""
+        now = self._clock()
+        with self._lock:
+            elapsed, self._last_step = now - self._last_step, now
+        tool = getattr(step_output, "tool", None)
+        if tool:
+            TOOL_CALLS.labels(self.agent_type, str(tool)).inc()
+            TOOL_STEP_SECONDS.labels(self.agent_type, str(tool)).observe(elapsed)
+
+
+def render() -> tuple[bytes, str]:
+    """(body, content type) for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,147 @@
+"""
+Response cache for single-agent chat.
+─────────────────────────────────────
+Founders ask the same briefing-style questions over and over; a repeat of
+"top 3 priorities this week" to the orchestrator shouldn't pay for a full
+crew run. Answers are cached in an in-memory LRU with a TTL, optionally
+backed by SQLite so they survive restarts.
+
+Key = agent_type + normalised message + company-profile hash + model name,
+so editing the profile or switching models never serves a stale answer.
+Runs that used a side-effecting tool (sending email, posting to Slack, …)
+are never cached — replaying them would silently skip the action.
+
+Env vars:
+  RESPONSE_CACHE_TTL   — seconds an answer stays fresh; 0 disables (default 600)
+  RESPONSE_CACHE_SIZE  — max in-memory entries                     (default 256)
+  RESPONSE_CACHE_DB    — SQLite file for the persistent tier       (default: none)
+
+With a SQLite tier configured, get/put/clear do disk I/O: call them from a
+worker thread (the crew job, or asyncio.to_thread), not on the event loop.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Tool names containing any of these verbs change the outside world.
+_SIDE_EFFECT_VERBS = (
+    'send', 'post', 'create', 'draft', 'comment', 'move',
+    'call', 'schedule', 'reminder', 'bulk',
+)
+
+
+def is_side_effect_tool(tool_name: str) -> bool:
+    name = (tool_name or '').lower()
+    return any(verb in name for verb in _SIDE_EFFECT_VERBS)
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation."""
+    text = re.sub(r'\s+', ' ', message.casefold()).strip()
+    return text.rstrip(' ?!.')
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0, db_path: str = ''):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._mem: OrderedDict = OrderedDict()   # key → (stored_at, response)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._db = None
+        if db_path and ttl > 0:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY, response TEXT NOT NULL, stored_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def persistent(self) -> bool:
+        """True when lookups may touch SQLite (i.e. can block)."""
+        return self._db is not None
+
+    @staticmethod
+    def make_key(agent_type: str, message: str, profile_digest: str, model: str) -> str:
+        parts = [agent_type, normalize_message(message), profile_digest, model]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    'SELECT stored_at, response FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+            if entry is None or now - entry[0] > self.ttl:
+                if entry is not None:
+                    self._evict(key)
+                self._misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        if not self.enabled or not response:
+            return
+        entry = (time.time(), response)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, stored_at) VALUES (?, ?, ?)',
+                    (key, response, entry[0]),
+                )
+                self._db.execute(
+                    'DELETE FROM responses WHERE stored_at < ?', (entry[0] - self.ttl,)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        """Insert into the LRU tier, dropping the oldest entries past max_entries."""
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _evict(self, key: str) -> None:
+        self._mem.pop(key, None)
+        if self._db is not None:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._mem), 'hits': self._hits, 'misses': self._misses}
+
+
+RESPONSE_CACHE = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('RESPONSE_CACHE_TTL', '600')),
+    db_path=os.getenv('RESPONSE_CACHE_DB', ''),
+)
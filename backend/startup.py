@@ -0,0 +1,135 @@
+"""
+Startup warm-up and readiness.
+──────────────────────────────
+Importing CrewAI / LangChain / crewai_tools, building the integration tool
+singletons and pre-building the agent pool take several seconds. Doing that
+at import time (or on the first request) made cold pods slow to accept
+traffic, so the API now starts with only the light modules imported and
+the lifespan hands a warm-up plan to STARTUP, which runs it on a background
+thread:
+
+    STARTUP.start([
+        ("imports", {"modules": import_in_order}),   # one step: imports are sequential
+        ("tools",   {...}),                          # independent builds, in parallel
+        ("agents",  {...}, False),        # optional stage: failures only degrade
+    ])
+
+Stages run in order; the steps inside a stage run in parallel, so only
+independent work belongs in the same stage — interdependent package
+imports must stay in one step. Every step is timed, and report() (served
+by GET /health/ready) shows where the time went. GET /health stays a pure
+liveness probe.
+
+States: starting → warming → ready | degraded (an optional step failed)
+                                   | failed   (a required step failed)
+
+Env vars:
+  STARTUP_WORKERS — threads per warm-up stage (default 8)
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Startup:
+    def __init__(self, workers: int = 8, clock=time.perf_counter):
+        self.workers = workers
+        self._clock = clock
+        self._created = clock()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._done = threading.Event()
+        self.state = "starting"
+        self.app_import_ms: float | None = None
+        self.total_ms: float | None = None
+        self.stages: list = []
+
+    def _ms(self, since: float) -> float:
+        return round((self._clock() - since) * 1000, 1)
+
+    # ── Running ──────────────────────────────────────────────
+
+    def _step(self, name: str, fn) -> dict:
+        t0 = self._clock()
+        entry: dict = {"name": name, "ok": True}
+        try:
+            result = fn()
+            if result:
+                # Steps may return details (per-module timings, {agent_type: error}).
+                entry["detail"] = result
+        except Exception as exc:
+            logger.exception("Startup step '%s' failed", name)
+            entry.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        entry["ms"] = self._ms(t0)
+        return entry
+
+    def run(self, plan: list) -> None:
+        """Run the stages in order (blocking); see the module docstring for `plan`."""
+        t0 = self._clock()
+        with self._lock:
+            if self.app_import_ms is None:
+                self.app_import_ms = self._ms(self._created)
+            self.state = "warming"
+        failed_required = failed_optional = False
+        for stage in plan:
+            name, steps = stage[0], stage[1]
+            required = stage[2] if len(stage) > 2 else True
+            s0 = self._clock()
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(steps) or 1)),
+                                    thread_name_prefix=f"warm-{name}") as pool:
+                futures = [pool.submit(self._step, n, fn) for n, fn in steps.items()]
+                entries = [f.result() for f in futures]
+            ok = all(e["ok"] for e in entries)
+            if not ok:
+                failed_required |= required
+                failed_optional |= not required
+            with self._lock:
+                self.stages.append({
+                    "name": name, "required": required, "ok": ok,
+                    "ms": self._ms(s0), "steps": entries,
+                })
+        with self._lock:
+            self.total_ms = self._ms(t0)
+            self.state = "failed" if failed_required else "degraded" if failed_optional else "ready"
+        self._done.set()
+        logger.info("Startup %s in %.0f ms: %s", self.state, self.total_ms, ", ".join(
+            f"{s['name']}={s['ms']:.0f}ms" for s in self.stages
+        ))
+
+    def start(self, plan: list) -> threading.Thread:
+        """Run the plan on a background thread; returns immediately."""
+        with self._lock:
+            if self.app_import_ms is None:
+                self.app_import_ms = self._ms(self._created)
+        self._thread = threading.Thread(target=self.run, args=(plan,), name="startup-warm", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    # ── Reporting ────────────────────────────────────────────
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("ready", "degraded")
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "ready": self.ready,
+                "app_import_ms": self.app_import_ms,
+                "warmup_ms": self.total_ms,
+                "stages": [dict(s, steps=list(s["steps"])) for s in self.stages],
+            }
+
+
+# Created when main.py imports this module first, so app_import_ms covers
+# importing the rest of the application.
+STARTUP = Startup(workers=int(os.getenv("STARTUP_WORKERS", "8")))
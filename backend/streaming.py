@@ -0,0 +1,244 @@
+"""
+Asyncio-native bridge between crew threads and SSE responses.
+─────────────────────────────────────────────────────────────
+CrewAI runs synchronously in a worker thread, while SSE responses are async
+generators on the event loop. Producers in the crew thread call
+`bridge.put(event)`, which hands the event to an asyncio.Queue via
+`loop.call_soon_threadsafe` — no executor thread is parked on a blocking
+queue.get() per client. Keep-alive heartbeats come from the event loop's
+own timeout.
+
+Token coalescing: `text_chunk` events are buffered and merged (per agent)
+into one frame every SSE_COALESCE_MS or SSE_COALESCE_BYTES, whichever comes
+first (size measured in UTF-8 bytes). The first token of each agent is
+still sent immediately so time-to-first-token doesn't regress. `bridge.stats`
+counts tokens received, text_chunk frames sent, and all frames (incl. done).
+
+Resumable runs: every bridge is a *run* with its own id. A pump task on the
+event loop turns producer events into numbered frames (`id: N`) kept in a
+bounded ring buffer, independent of any client connection. Clients read
+through `bridge.stream(last_event_id)`, so a reconnect with Last-Event-ID
+picks up the live stream — or replays it if the run already finished.
+Finished runs are evicted from RUNS after SSE_RUN_TTL seconds.
+
+    bridge = EventBridge(first={...})      # create on the event loop
+    start_worker(lambda: run_crew(bridge)) # worker calls bridge.put / close
+    return sse_response(bridge.stream(), run_id=bridge.run_id)
+
+Env vars:
+  SSE_HEARTBEAT_SECONDS — idle time before a ': heartbeat' comment (default 15)
+  SSE_COALESCE_MS       — max time a token waits in the buffer; 0 = off (default 40)
+  SSE_COALESCE_BYTES    — flush once the buffer reaches this size    (default 512)
+  SSE_REPLAY_FRAMES     — frames kept per run for replay             (default 2000)
+  SSE_RUN_TTL           — seconds a finished run stays replayable    (default 300)
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from collections import deque
+from itertools import islice
+
+from fastapi.responses import StreamingResponse
+
+HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+COALESCE_MS = float(os.getenv('SSE_COALESCE_MS', '40'))
+COALESCE_BYTES = int(os.getenv('SSE_COALESCE_BYTES', '512'))
+REPLAY_FRAMES = int(os.getenv('SSE_REPLAY_FRAMES', '2000'))
+RUN_TTL = float(os.getenv('SSE_RUN_TTL', '300'))
+
+_CLOSED = object()   # end-of-stream sentinel
+
+logger = logging.getLogger(__name__)
+
+
+# Live and recently finished runs, by run id.
+RUNS: dict = {}
+
+
+def sse_frame(event: dict, event_id: int | None = None) -> str:
+    """Serialise one event dict as an SSE `data:` frame (with optional `id:`)."""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}data: {json.dumps(event)}\n\n"
+
+
+class EventBridge:
+    """
+    Thread-safe producer / async consumer channel for one streaming run.
+    Must be constructed on the event loop that will consume it.
+    `first` is recorded as frame 1, before any producer output.
+    """
+
+    def __init__(
+        self,
+        first: dict | None = None,
+        heartbeat: float = HEARTBEAT_SECONDS,
+        coalesce_ms: float = COALESCE_MS,
+        coalesce_bytes: int = COALESCE_BYTES,
+        replay_frames: int = REPLAY_FRAMES,
+    ):
+        self._loop = asyncio.get_running_loop()
+        self._q: asyncio.Queue = asyncio.Queue()
+        self._heartbeat = heartbeat
+        self._coalesce_s = coalesce_ms / 1000
+        self._coalesce_bytes = coalesce_bytes
+        self.tokens = 0        # text_chunk events received from producers
+        self.text_frames = 0   # text_chunk frames sent after coalescing
+        self.frames = 0        # every SSE data frame produced for the run
+
+        self.run_id = uuid.uuid4().hex
+        self.finished = False
+        self._buffer: deque = deque(maxlen=replay_frames)   # (id, frame)
+        self._changed = asyncio.Event()
+        RUNS[self.run_id] = self
+
+        if first is not None:
+            self._append({**first, 'run_id': self.run_id})
+        self._pump_task = self._loop.create_task(self._pump())
+
+    @property
+    def stats(self) -> dict:
+        return {'tokens': self.tokens, 'text_frames': self.text_frames, 'frames': self.frames}
+
+    # ── Producer side (any thread) ───────────────────────────
+
+    def put(self, event: dict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._q.put_nowait, event)
+        except RuntimeError:
+            # Loop already closed (server shutting down) — nobody is listening.
+            pass
+
+    def close(self) -> None:
+        self.put(_CLOSED)
+
+    def discard(self) -> None:
+        """Drop a run that never started (e.g. rejected by admission control)."""
+        self._pump_task.cancel()
+        RUNS.pop(self.run_id, None)
+
+    # ── Consumer side (event loop) ───────────────────────────
+
+    def _append(self, event: dict) -> None:
+        # Serialise before counting so a bad event can't leave a gap in the ids.
+        frame = sse_frame(event, self.frames + 1)
+        self.frames += 1
+        if event.get('type') == 'text_chunk':
+            self.text_frames += 1
+        self._buffer.append((self.frames, frame))
+        # Wake every subscriber waiting on the current event, then re-arm.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _finish(self) -> None:
+        self.finished = True
+        self._changed.set()
+        self._loop.call_later(RUN_TTL, RUNS.pop, self.run_id, None)
+
+    async def _next(self, timeout: float | None):
+        try:
+            return self._q.get_nowait()
+        except asyncio.QueueEmpty:
+            return await asyncio.wait_for(self._q.get(), timeout)
+
+    async def _pump(self):
+        """
+        Run _drain() and always end the run with a `done` frame — even if an
+        event can't be serialised — so readers and RUNS eviction never hang.
+        """
+        try:
+            await self._drain()
+        except Exception as e:
+            logger.exception('SSE run %s failed', self.run_id)
+            self._append({'type': 'error', 'content': f'Stream failed: {e}'})
+        finally:
+            if not self.finished:
+                # Stats as they will stand once this done frame is counted.
+                self._append({'type': 'done', 'stream_stats': {**self.stats, 'frames': self.frames + 1}})
+                self._finish()
+
+    async def _drain(self):
+        """Drain producer events into numbered frames, coalescing tokens."""
+        pending: dict = {}    # agent → [merged text_chunk, size in bytes] to flush
+        flush_at = 0.0
+        started = set()       # agents whose first token has gone out
+
+        def flush():
+            for e, _ in pending.values():
+                self._append(e)
+            pending.clear()
+
+        while True:
+            timeout = max(flush_at - self._loop.time(), 0) if pending else None
+            try:
+                event = await self._next(timeout)
+            except asyncio.TimeoutError:
+                flush()
+                continue
+
+            if event is not _CLOSED and event.get('type') == 'text_chunk':
+                self.tokens += 1
+                agent = event.get('agent')
+                if agent not in started or not self._coalesce_s:
+                    started.add(agent)
+                    self._append(event)
+                    continue
+                size = len(event['content'].encode('utf-8'))
+                buffered = pending.get(agent)
+                if buffered is None:
+                    if not pending:
+                        flush_at = self._loop.time() + self._coalesce_s
+                    pending[agent] = buffered = [dict(event), size]
+                else:
+                    buffered[0]['content'] += event['content']
+                    buffered[1] += size
+                if buffered[1] >= self._coalesce_bytes:
+                    self._append(pending.pop(agent)[0])
+                continue
+
+            # Any other event: flush buffered tokens first to preserve order.
+            flush()
+
+            if event is _CLOSED:
+                break
+
+            self._append(event)
+
+    async def stream(self, last_event_id: int = 0):
+        """
+        Yield SSE frames after `last_event_id` — replaying what is buffered,
+        then following the live run until its `done` frame. Disconnecting
+        only stops this reader; the run itself keeps going.
+        """
+        cursor = max(last_event_id, 0)
+        while True:
+            if self._buffer:
+                oldest = self._buffer[0][0]
+                if cursor < oldest - 1:
+                    # Reader fell further behind than the ring buffer reaches.
+                    yield sse_frame({'type': 'replay_gap', 'missed': oldest - 1 - cursor})
+                    cursor = oldest - 1
+                # Snapshot first: the pump may append while we're suspended in yield.
+                for event_id, frame in list(islice(self._buffer, cursor - oldest + 1, None)):
+                    yield frame
+                    cursor = event_id
+
+            if cursor < self.frames:
+                continue
+            if self.finished:
+                break
+
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), self._heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+
+
+def sse_response(frames, run_id: str | None = None) -> StreamingResponse:
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if run_id:
+        headers["X-Run-ID"] = run_id
+    return StreamingResponse(frames, media_type="text/event-stream", headers=headers)
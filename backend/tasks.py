@@ -265,8 +265,11 @@ class NexOSTasks:
         )
 
     @classmethod
-    def build(cls, agent_type: str, message: str, agent: Agent) -> Task:
-        """Factory: returns the right task for the given agent_type."""
+    def build(cls, agent_type: str, message: str, agent: Agent, history: str = "") -> Task:
+        """
+        Factory: returns the right task for the given agent_type.
+        `history` is the conversation window + summary from CONVERSATIONS.prompt_block().
+        """
         dispatch = {
             'orchestrator':        cls.orchestrator_task,
             'sales':               cls.sales_task,
@@ -282,6 +285,10 @@ class NexOSTasks:
         task = dispatch[agent_type](message, agent)
         # Prepend startup context (if profile has been set) so every agent
         # response is grounded in who the startup is, what they do, and for whom.
+        # Earlier turns go between the context and the new message, so
+        # follow-ups ("make it shorter") resolve against what was said.
+        if history:
+            task.description = history + "\n" + task.description
         ctx = format_context()
         if ctx:
             task.description = ctx + "\n" + task.description
@@ -0,0 +1,82 @@
+import pytest
+
+from agent_pool import AgentPool
+
+
+class StubAgent:
+    def __init__(self, agent_type):
+        self.agent_type = agent_type
+        self.llm = f"default-llm-{agent_type}"
+        self.step_callback = None
+        self.crew = None
+        self.tools_results = []
+
+
+class StubBuilder:
+    def __init__(self, fail=()):
+        self.built = []
+        self.fail = set(fail)
+
+    def __call__(self, agent_type):
+        if agent_type in self.fail:
+            raise RuntimeError(f"{agent_type} tools unavailable")
+        agent = StubAgent(agent_type)
+        self.built.append(agent)
+        return agent
+
+
+def make_pool(builder=None, size=1, max_idle=2):
+    return AgentPool(size=size, max_idle=max_idle, builder=builder or StubBuilder(),
+                     types=["sales", "technical"])
+
+
+def test_checkout_swaps_and_restores_llm_and_step_callback():
+    pool = make_pool()
+    pool.warm()
+    callback = lambda step: None
+    with pool.checkout("sales", llm="request-llm", step_callback=callback) as agent:
+        assert agent.llm == "request-llm"
+        assert agent.step_callback is callback
+    assert agent.llm == "default-llm-sales"
+    assert agent.step_callback is None
+    with pool.checkout("sales") as again:
+        assert again is agent
+        assert again.llm == "default-llm-sales"
+
+
+def test_exhausted_pool_builds_overflow_agents_and_caps_idle():
+    builder = StubBuilder()
+    pool = make_pool(builder, size=1, max_idle=2)
+    pool.warm()
+    agents = [pool.acquire("sales") for _ in range(3)]
+    assert len({id(a) for a in agents}) == 3
+    assert len(builder.built) == 3 + 1          # 1 warmed for technical
+    for agent in agents:
+        pool.release("sales", agent)
+    assert pool.stats() == {"sales": 2, "technical": 1}
+
+
+def test_reused_agent_carries_no_stale_crew_or_tool_results():
+    pool = make_pool()
+    with pool.checkout("technical") as agent:
+        agent.crew = object()
+        agent.tools_results = [{"tool": "serper", "result": "stale"}]
+    with pool.checkout("technical") as reused:
+        assert reused is agent
+        assert reused.crew is None
+        assert reused.tools_results == []
+
+
+def test_unknown_type_is_rejected():
+    with pytest.raises(ValueError):
+        make_pool().acquire("astrologer")
+
+
+def test_warm_reports_failures_per_type():
+    builder = StubBuilder(fail={"technical"})
+    pool = make_pool(builder, size=2)
+    failed = pool.warm()
+    assert failed == {"technical": "technical tools unavailable"}
+    assert pool.stats() == {"sales": 2, "technical": 0}
+    assert pool.warm() == {"technical": "technical tools unavailable"}
+    assert len(builder.built) == 2              # sales already full, not rebuilt
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agora_context import AgoraContext, extractive_digest
+from conversation_store import estimate_tokens
+
+
+def output(tag: str, tokens: int) -> str:
+    return f"## {tag}\n" + "\n".join(f"- {tag} point {i} costs ${i}00." for i in range(tokens // 7))
+
+
+class RecordingDigester:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, agent_type, text, max_tokens):
+        self.calls.append(agent_type)
+        if self.fail:
+            raise RuntimeError("model down")
+        return f"Key points: {agent_type} digest"
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def make(executor, digester, **kwargs):
+    kwargs = {"budget_tokens": 300, "final_budget_tokens": 1000, "digest_tokens": 40,
+              "digest_timeout": 5, **kwargs}
+    return AgoraContext(digester=digester, executor=executor, **kwargs)
+
+
+def test_small_sessions_get_full_outputs_without_digests(executor):
+    digester = RecordingDigester()
+    ctx = make(executor, digester)
+    ctx.add(0, "sales", output("sales", 100))
+    ctx.add(1, "technical", output("technical", 100))
+    parts = ctx.select([0, 1])
+    assert [(p.agent_type, p.digest) for p in parts] == [("sales", False), ("technical", False)]
+    assert parts[0].text == output("sales", 100)
+    assert digester.calls == []
+
+
+def test_over_budget_uses_digests_and_upgrades_newest_first(executor):
+    digester = RecordingDigester()
+    ctx = make(executor, digester)
+    for i, at in enumerate(["sales", "technical", "hr_ops"]):
+        ctx.add(i, at, output(at, 140))
+    parts = ctx.select([0, 1, 2])
+    assert [p.digest for p in parts] == [True, True, False]
+    assert parts[0].text == "Key points: sales digest"
+    assert sum(estimate_tokens(p.text) for p in parts) <= 300
+    assert sorted(digester.calls) == ["hr_ops", "sales", "technical"]
+
+
+def test_synthesizer_gets_full_outputs_when_they_fit(executor):
+    ctx = make(executor, RecordingDigester())
+    for i, at in enumerate(["sales", "technical", "hr_ops"]):
+        ctx.add(i, at, output(at, 140))
+    assert [p.digest for p in ctx.select([0, 1, 2], final=True)] == [False, False, False]
+    assert [p.digest for p in ctx.select([0, 1, 2])][0] is True
+
+
+def test_digests_are_trimmed_when_they_alone_exceed_the_budget(executor):
+    ctx = make(executor, lambda at, text, n: "x" * 4000, budget_tokens=90)
+    for i in range(3):
+        ctx.add(i, "sales", output(f"s{i}", 140))
+    parts = ctx.select([0, 1, 2])
+    assert all(p.digest for p in parts)
+    assert all(estimate_tokens(p.text) <= 32 for p in parts)
+
+
+def test_failed_or_slow_digest_falls_back_to_extractive(executor):
+    ctx = make(executor, RecordingDigester(fail=True))
+    ctx.add(0, "sales", output("sales", 200))
+    ctx.add(1, "technical", output("technical", 200))
+    parts = ctx.select([0, 1])
+    assert parts[0].digest and parts[0].text.startswith("## sales")
+    assert ctx.stats["digest_fallbacks"] >= 1
+
+    release = threading.Event()
+    slow = make(executor, lambda at, text, n: release.wait() and "late", digest_timeout=0.05)
+    slow.add(0, "sales", output("sales", 200))
+    slow.add(1, "technical", output("technical", 200))
+    assert slow.select([0, 1])[0].text.startswith("## sales")
+    release.set()
+
+
+def test_repeated_agent_types_are_kept_apart_by_position(executor):
+    ctx = make(executor, RecordingDigester())
+    ctx.add(0, "sales", "first pass")
+    ctx.add(1, "sales", "second pass")
+    assert [p.text for p in ctx.select([0, 1])] == ["first pass", "second pass"]
+
+
+def test_extractive_digest_keeps_structure_and_figures():
+    text = "# Plan\nSome filler prose here.\n- Raise price to $49. Because reasons.\nRevenue hits 2M by Q3."
+    digest = extractive_digest(text, 100)
+    assert digest == "# Plan\n- Raise price to $49.\nRevenue hits 2M by Q3."
+    assert estimate_tokens(extractive_digest(text * 50, 20)) <= 22
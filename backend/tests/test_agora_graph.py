@@ -0,0 +1,54 @@
+import pytest
+
+from agora_graph import resolve_graph, synthesizers
+
+
+def test_default_graph_fans_out_into_last_agent():
+    graph = resolve_graph(['sales', 'technical', 'orchestrator'], None)
+    assert graph == {'sales': [], 'technical': [], 'orchestrator': ['sales', 'technical']}
+    assert synthesizers(graph) == {'orchestrator'}
+
+
+def test_explicit_edges_keep_session_order():
+    graph = resolve_graph(
+        ['sales', 'technical', 'orchestrator'],
+        {' Orchestrator ': ['technical', 'sales']},
+    )
+    assert graph['orchestrator'] == ['sales', 'technical']
+
+
+def test_synthesizer_comes_from_graph_not_position():
+    # The last agent listed depends on nothing, so it must not be told to synthesize.
+    graph = resolve_graph(
+        ['sales', 'orchestrator', 'technical'],
+        {'orchestrator': ['sales', 'technical']},
+    )
+    assert synthesizers(graph) == {'orchestrator'}
+
+
+def test_transitive_dependencies_count_towards_synthesis():
+    graph = resolve_graph(
+        ['market_intelligence', 'sales', 'orchestrator'],
+        {'sales': ['market_intelligence'], 'orchestrator': ['sales']},
+    )
+    assert synthesizers(graph) == {'orchestrator'}
+
+
+def test_no_synthesizer_when_nobody_builds_on_everyone():
+    graph = resolve_graph(['sales', 'technical', 'orchestrator'], {})
+    assert synthesizers(graph) == set()
+    assert synthesizers(resolve_graph(['sales'], None)) == set()
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match='cycle'):
+        resolve_graph(['sales', 'technical'], {'sales': ['technical'], 'technical': ['sales']})
+    with pytest.raises(ValueError, match='cycle'):
+        resolve_graph(['sales'], {'sales': ['sales']})
+
+
+def test_unknown_and_duplicate_agents_are_rejected():
+    with pytest.raises(ValueError, match='not in agent_types'):
+        resolve_graph(['sales'], {'sales': ['hr_ops']})
+    with pytest.raises(ValueError, match='at most once'):
+        resolve_graph(['sales', 'sales'], None)
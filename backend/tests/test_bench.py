@@ -0,0 +1,90 @@
+import json
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from bench.fake_openai import FakeConfig, create_app
+from bench.load import Sample, compare, percentile, proc_stats, sse_session, summarize
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2, 3, 4], 95) == pytest.approx(3.85)
+
+
+def test_summarize_and_compare():
+    samples = [Sample(True, 1.0, 0.2, 40), Sample(True, 2.0, 0.4, 80),
+               Sample(False, 0.1, error="HTTP 429")]
+    report = summarize(samples, wall=2.0)
+    assert report["ok"] == 2 and report["errors"] == {"HTTP 429": 1}
+    assert report["ttft_ms"]["p50"] == pytest.approx(300.0)
+    assert report["tokens_per_s"]["aggregate"] == 60.0
+    assert report["tokens_per_s"]["per_stream_mean"] == 50.0
+
+    slower = json.loads(json.dumps(report))
+    slower["e2e_ms"]["p50"] *= 2
+    lines = compare({"scenarios": {"stream": slower}}, {"scenarios": {"stream": report}})
+    assert any("e2e_ms.p50" in line and "+100.0%" in line for line in lines)
+
+
+def test_proc_stats_reads_own_process():
+    import os
+    stat = proc_stats(os.getpid())
+    if stat is None:
+        pytest.skip("/proc not available")
+    threads, rss = stat
+    assert threads >= 1 and rss > 0
+
+
+def test_fake_openai_streams_chunks_and_done():
+    app = create_app(FakeConfig(latency=0, tokens_per_second=0, tokens=12))
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+            resp = await client.post("/v1/chat/completions", json={
+                "model": "m", "stream": True, "messages": [{"role": "user", "content": "hi"}],
+                "stream_options": {"include_usage": True},
+            })
+            plain = await client.post("/v1/chat/completions", json={"messages": []})
+            return resp.text, plain.json()
+
+    text, plain = run(go())
+    frames = [line[6:] for line in text.splitlines() if line.startswith("data: ")]
+    assert frames[-1] == "[DONE]"
+    chunks = [json.loads(f) for f in frames[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+    assert "Final Answer:" in content and len(content.split()) == 12
+    assert chunks[-1]["usage"]["completion_tokens"] == 12
+    assert "Final Answer:" in plain["choices"][0]["message"]["content"]
+    assert app.state.stats["requests"] == 2
+
+
+def test_sse_session_measures_ttft_and_tokens():
+    app = FastAPI()
+
+    @app.post("/chat/stream")
+    async def stream():
+        async def frames():
+            yield 'id: 1\ndata: {"type": "agent_started"}\n\n'
+            for i in range(3):
+                yield f'data: {{"type": "text_chunk", "content": "t{i}"}}\n\n'
+            yield 'data: {"type": "done"}\n\n'
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            return await sse_session(client, "/chat/stream", {})
+
+    sample = run(go())
+    assert sample.ok and sample.tokens == 3
+    assert 0 <= sample.ttft <= sample.e2e
@@ -0,0 +1,57 @@
+import os
+import json
+import stat
+
+import pytest
+
+import company_context
+
+
+@pytest.fixture
+def profile_path(tmp_path, monkeypatch):
+    path = tmp_path / 'company_profile.json'
+    monkeypatch.setattr(company_context, 'PROFILE_PATH', path)
+    monkeypatch.setattr(company_context, '_snapshot', None)
+    return path
+
+
+def test_defaults_when_no_file(profile_path):
+    assert company_context.load_profile() == company_context.DEFAULT_PROFILE
+    assert company_context.format_context() == ''
+
+
+def test_save_round_trips_and_formats(profile_path):
+    saved = company_context.save_profile({'company_name': 'Acme', 'unknown': 'x', 'stage': None})
+    assert saved['company_name'] == 'Acme'
+    assert saved['stage'] == ''
+    assert 'unknown' not in saved
+    assert json.loads(profile_path.read_text())['company_name'] == 'Acme'
+    assert 'Company: Acme' in company_context.format_context()
+    assert not list(profile_path.parent.glob('.company_profile.*'))
+
+
+def test_external_edit_invalidates_cache(profile_path):
+    company_context.save_profile({'company_name': 'Acme'})
+    before = company_context.profile_hash()
+    profile_path.write_text(json.dumps({'company_name': 'Globex Corporation'}))
+    assert company_context.load_profile()['company_name'] == 'Globex Corporation'
+    assert company_context.profile_hash() != before
+
+
+def test_load_returns_a_copy(profile_path):
+    company_context.load_profile()['company_name'] = 'mutated'
+    assert company_context.load_profile()['company_name'] == ''
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX permission bits')
+def test_new_file_is_world_readable(profile_path):
+    company_context.save_profile({'company_name': 'Acme'})
+    assert stat.S_IMODE(profile_path.stat().st_mode) == 0o644
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX permission bits')
+def test_save_keeps_existing_permissions(profile_path):
+    profile_path.write_text('{}')
+    os.chmod(profile_path, 0o664)
+    company_context.save_profile({'company_name': 'Acme'})
+    assert stat.S_IMODE(profile_path.stat().st_mode) == 0o664
@@ -0,0 +1,102 @@
+import pytest
+
+from conversation_store import ConversationStore, extractive_summary, estimate_tokens
+
+
+@pytest.fixture
+def store(tmp_path):
+    calls = []
+
+    def summarizer(previous, messages, max_tokens):
+        calls.append((previous, list(messages)))
+        return (previous + " | " if previous else "") + ",".join(c for _, c in messages)
+
+    s = ConversationStore(str(tmp_path / "conv.db"), window_tokens=30, summary_tokens=50,
+                          summarizer=summarizer)
+    s.calls = calls
+    yield s
+    s.close()
+
+
+def msg(i):
+    return f"m{i:02d} " + "x" * 32     # 10 tokens each
+
+
+def test_wal_and_index(store):
+    assert store._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = " ".join(str(r) for r in store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM messages WHERE conversation_id = 'c'"
+        " ORDER BY created_at DESC, id DESC"
+    ))
+    assert "messages_by_conversation" in plan
+
+
+def test_new_conversation_has_no_block(store):
+    assert store.prompt_block("c") == ""
+    assert not store.has_history("c")
+
+
+def test_window_is_token_bounded_and_overflow_is_summarized(store):
+    for i in range(8):
+        store.append("c", "user" if i % 2 == 0 else "assistant", msg(i))
+    store.flush(5)
+    summary, window = store.history("c")
+    assert [c[:3] for _, c in window] == ["m05", "m06", "m07"]
+    assert sum(estimate_tokens(c) for _, c in window) <= 30
+    # Everything before the window is folded into the summary, in order.
+    assert [c[:3] for c in summary.replace(" | ", ",").split(",")] == [f"m{i:02d}" for i in range(5)]
+    block = store.prompt_block("c")
+    assert "Summary of earlier messages" in block and "ASSISTANT: m07" in block
+
+
+def test_oversized_newest_message_is_elided_to_the_budget(store):
+    store.append("c", "user", msg(0))
+    store.append("c", "assistant", "HEAD " + "y" * 400 + " TAIL")
+    store.flush(5)
+    _, window = store.history("c")
+    assert len(window) == 1
+    content = window[0][1]
+    assert content.startswith("HEAD") and content.endswith("TAIL")
+    assert "tokens elided" in content
+    assert estimate_tokens(content) <= 30
+
+
+def test_summary_is_rolling(store):
+    for i in range(6):
+        store.append("c", "user", msg(i))
+    store.flush(5)
+    first = len(store.calls)
+    for i in range(6, 8):
+        store.append("c", "user", msg(i))
+    store.flush(5)
+    # Later passes only send the newly overflowed messages with the previous summary.
+    previous, messages = store.calls[-1]
+    assert previous and all(c[:3] in ("m03", "m04") for _, c in messages)
+    assert len(store.calls) > first
+
+
+def test_conversations_are_isolated(store):
+    store.append("a", "user", "hello from a")
+    store.append("b", "user", "hello from b")
+    assert store.history("a").window == [("user", "hello from a")]
+
+
+def test_llm_failure_falls_back_to_extractive(tmp_path):
+    def broken(previous, messages, max_tokens):
+        raise RuntimeError("no api key")
+
+    s = ConversationStore(str(tmp_path / "c.db"), window_tokens=15, summarizer=broken)
+    try:
+        for i in range(4):
+            s.append("c", "user", msg(i) + ". Second sentence.")
+        s.flush(5)
+        summary, _ = s.history("c")
+        assert "m00" in summary and "Second sentence" not in summary
+        assert s.stats["summary_fallbacks"] >= 1
+    finally:
+        s.close()
+
+
+def test_extractive_summary_keeps_budget():
+    text = extractive_summary("", [("user", "y" * 1000)] * 10, max_tokens=50)
+    assert len(text) <= 50 * 4 + 1
@@ -0,0 +1,172 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from crew_pool import CrewPool, PoolFull, PoolUnavailable, QueueTimeout
+
+
+def _blocker():
+    gate = threading.Event()
+    return gate, lambda: gate.wait(5)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not reached')
+        time.sleep(0.01)
+
+
+def test_admission_rejects_beyond_queue():
+    pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0)
+    gate, block = _blocker()
+    try:
+        pool.submit(block)
+        pool.submit(block)
+        with pytest.raises(PoolFull) as err:
+            pool.submit(block)
+        assert err.value.status_code == 429
+        assert err.value.retry_after >= 1
+        assert pool.stats()['rejected'] == 1
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_cancelled_queued_job_releases_its_slot():
+    pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0)
+    gate, block = _blocker()
+    try:
+        pool.submit(block)
+        queued = pool.submit(block)
+        assert pool.stats()['queue_depth'] == 1
+        assert queued.cancel()
+        _wait_for(lambda: pool.stats()['queue_depth'] == 0)
+        pool.submit(block)   # the slot is usable again
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_queue_timeout_is_enforced_while_waiting():
+    pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0.2)
+    gate, block = _blocker()
+    try:
+        pool.submit(block)
+        queued = pool.submit(lambda: 'ran')
+        with pytest.raises(QueueTimeout, match='waited') as excinfo:
+            queued.result(timeout=2)
+        assert excinfo.value.outcome == 'queue_timeout'
+        stats = pool.stats()
+        assert stats['timed_out'] == 1
+        assert stats['queue_depth'] == 0
+        assert stats['running'] == 1
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_timed_out_jobs_stay_out_of_run_average():
+    pool = CrewPool(max_concurrency=1, queue_size=2, queue_timeout=0.1)
+    gate, block = _blocker()
+    try:
+        before = pool._run_avg
+        pool.submit(block)
+        for f in [pool.submit(lambda: None), pool.submit(lambda: None)]:
+            with pytest.raises(PoolUnavailable):
+                f.result(timeout=2)
+        assert pool._run_avg == before
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_finished_jobs_leave_the_deadline_heap():
+    pool = CrewPool(max_concurrency=2, queue_size=2, queue_timeout=60)
+    try:
+        for f in [pool.submit(lambda: None) for _ in range(3)]:
+            f.result(timeout=2)
+        _wait_for(lambda: not pool._deadlines)
+    finally:
+        pool.shutdown()
+
+
+def test_run_awaits_result_and_cancellation_drops_queued_job():
+    async def scenario():
+        pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0)
+        gate, block = _blocker()
+        try:
+            assert await pool.run(lambda x: x * 2, 21) == 42
+            pool.submit(block)
+            task = asyncio.ensure_future(pool.run(lambda: 'never'))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.05)
+            assert pool.stats()['queue_depth'] == 0
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_rejects_new_work():
+    pool = CrewPool(max_concurrency=1, queue_size=1)
+    pool.shutdown()
+    with pytest.raises(PoolUnavailable):
+        pool.submit(lambda: None)
+
+
+def test_reservation_counts_against_the_queue_up_front():
+    pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0)
+    gate, block = _blocker()
+    try:
+        session = pool.reserve(2)
+        assert pool.stats()['reserved'] == 2
+        with pytest.raises(PoolFull):
+            pool.reserve(1)
+        with pytest.raises(PoolFull):
+            pool.submit(block)
+        session.submit(block)
+        session.submit(block)
+        with pytest.raises(RuntimeError):
+            session.submit(block)
+        stats = pool.stats()
+        assert stats['reserved'] == 0
+        assert stats['running'] + stats['queue_depth'] == 2
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_many_sessions_cannot_exceed_queue_size():
+    pool = CrewPool(max_concurrency=1, queue_size=1, queue_timeout=0)
+    gate, block = _blocker()
+    try:
+        admitted = []
+        for _ in range(20):
+            try:
+                admitted.append(pool.reserve(1))
+            except PoolFull:
+                pass
+        for session in admitted:
+            session.submit(block)
+        assert pool.stats()['queue_depth'] <= pool.queue_size
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_release_returns_unused_slots():
+    pool = CrewPool(max_concurrency=1, queue_size=2, queue_timeout=0)
+    session = pool.reserve(3)
+    session.submit(lambda: None).result(timeout=2)
+    session.release()
+    assert pool.stats()['reserved'] == 0
+    pool.reserve(3).release()
+    pool.shutdown()
@@ -0,0 +1,144 @@
+import httpx
+import pytest
+
+from tools.embedding_index import (
+    EmbeddingIndex, chunk_text, html_to_text, refresh_page, search_website,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingEmbed:
+    """Bag-of-letters vectors; records every text it is asked to embed."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[t.lower().count(c) for c in "abcdefghijklmnopqrstuvwxyz"] for t in texts]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def embed():
+    return CountingEmbed()
+
+
+@pytest.fixture
+def index(tmp_path, embed, clock):
+    return EmbeddingIndex(str(tmp_path / "emb.db"), embed=embed, max_pages=2,
+                          max_age_days=1, chunk_chars=60, clock=clock)
+
+
+PAGE = "\n".join(f"Paragraph {i} talks about topic number {i} in detail." for i in range(6))
+
+
+def test_chunking_covers_text_in_bounded_chunks():
+    chunks = chunk_text(PAGE, size=60, overlap=6)
+    assert len(chunks) > 1
+    assert all(len(c) <= 60 for c in chunks)
+    assert "Paragraph 5" in chunks[-1]
+
+
+def test_unchanged_page_is_not_reembedded(index, embed):
+    first = index.ensure("https://a.com", PAGE)
+    assert first > 0 and len(embed.texts) == first
+    assert index.ensure("https://a.com", PAGE) == 0
+    assert len(embed.texts) == first
+    assert index.stats["pages_unchanged"] == 1
+
+
+def test_changed_page_embeds_only_new_chunks(index, embed):
+    index.ensure("https://a.com", PAGE)
+    before = len(embed.texts)
+    changed = PAGE + "\nA brand new closing paragraph about pricing."
+    embedded = index.ensure("https://a.com", changed)
+    assert 0 < embedded < before
+    assert index.stats["chunks_reused"] > 0
+
+
+def test_shared_chunks_are_reused_across_pages(index, embed):
+    index.ensure("https://a.com", PAGE)
+    assert index.ensure("https://b.com", PAGE) == 0
+    assert index.size()["vectors"] == len(chunk_text(PAGE, 60, 6))
+
+
+def test_search_ranks_by_similarity(index):
+    lines = ["zzzz zzzz zzzz zzzz zzzz zzzz zzzz zzzz zz.",
+             "qqqq qqqq qqqq qqqq qqqq qqqq qqqq qqqq qq.",
+             "aaaa bbbb cccc aaaa bbbb cccc aaaa bbbb cc."]
+    index.ensure("https://a.com", "\n".join(lines))
+    (score, text), *_ = index.search("https://a.com", "zzz", k=1)
+    assert text == lines[0]
+    assert score == pytest.approx(1.0, abs=1e-6)
+    assert index.search("https://unknown.com", "zzz") == []
+
+
+def test_eviction_by_age_and_size(index, clock):
+    index.ensure("https://old.com", "old page about xylophones.")
+    clock.now += 2 * 86400
+    index.ensure("https://a.com", "page a about apples.")
+    clock.now += 1
+    index.ensure("https://b.com", "page b about bananas.")
+    clock.now += 1
+    index.ensure("https://c.com", "page c about cherries.")
+    assert index.evict() == 2          # old.com by age, a.com as least recently used
+    assert index.page("https://old.com") is None
+    assert index.page("https://a.com") is None
+    assert index.size() == {"pages": 2, "vectors": 2}
+
+
+def test_html_to_text_drops_scripts_and_styles():
+    html = "<html><head><title>t</title><style>p{}</style></head><body><h1>Acme</h1>" \
+           "<script>var x=1;</script><p>Pricing  from $10</p></body></html>"
+    assert html_to_text(html) == "Acme\nPricing from $10"
+
+
+def test_search_website_uses_conditional_fetch(index, embed):
+    seen = []
+
+    def handler(request):
+        seen.append((str(request.url), request.headers.get("if-none-match")))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"content-type": "text/html", "etag": '"v1"'},
+                              text="<p>Acme pricing starts at ten dollars.</p>")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    first = search_website("https://Acme.com/pricing/?utm_source=x", "pricing", index=index, client=client)
+    embedded = len(embed.texts)
+    second = search_website("acme.com/pricing", "pricing", index=index, client=client)
+    assert first == second == "Relevant Content:\nAcme pricing starts at ten dollars."
+    # The agent's URL is fetched as given; the normalized form is only the index key.
+    assert seen == [("https://acme.com/pricing/?utm_source=x", None),
+                    ("https://acme.com/pricing", '"v1"')]
+    assert len(embed.texts) == embedded + 1      # only the query was embedded again
+
+
+def test_refresh_page_caps_body_and_rejects_non_text(index):
+    body = "<p>" + "Acme pricing details. " * 200 + "</p><p>Footer we never reach.</p>"
+
+    def handler(request):
+        if request.url.path == "/report.pdf":
+            return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF")
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text=body)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    assert refresh_page("https://a.com/big", index=index, client=client, max_bytes=500) > 0
+    stored = index.search("https://a.com/big", "footer", k=10)
+    assert stored and all("Footer" not in text for _, text in stored)
+
+    with pytest.raises(ValueError, match="application/pdf"):
+        refresh_page("https://a.com/report.pdf", index=index, client=client)
+    assert index.page("https://a.com/report.pdf") is None
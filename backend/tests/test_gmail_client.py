@@ -0,0 +1,136 @@
+import os
+import json
+import stat
+import threading
+import datetime as dt
+
+import pytest
+
+pytest.importorskip('googleapiclient')
+from google.oauth2.credentials import Credentials
+
+from tools import gmail_client
+from tools.gmail_client import GmailClient
+
+
+def _token(path, expires_in):
+    expiry = (dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=expires_in)).replace(tzinfo=None)
+    path.write_text(json.dumps({
+        'token': 'access-0', 'refresh_token': 'refresh', 'client_id': 'id',
+        'client_secret': 'secret', 'token_uri': 'https://oauth2.test/token',
+        'expiry': expiry.isoformat() + 'Z',
+    }))
+
+
+@pytest.fixture
+def token_path(tmp_path, monkeypatch):
+    path = tmp_path / 'token.json'
+    monkeypatch.setenv('GMAIL_TOKEN_PATH', str(path))
+    monkeypatch.setenv('GMAIL_CREDENTIALS_PATH', str(tmp_path / 'missing.json'))
+    return path
+
+
+@pytest.fixture
+def refresh_calls(monkeypatch):
+    calls = []
+
+    def fake_refresh(self, request):
+        calls.append(threading.current_thread().name)
+        self.token = f'access-{len(calls)}'
+        self.expiry = (dt.datetime.now(dt.timezone.utc) + dt.timedelta(hours=1)).replace(tzinfo=None)
+
+    monkeypatch.setattr(Credentials, 'refresh', fake_refresh)
+    return calls
+
+
+def test_credentials_are_loaded_once(token_path, refresh_calls, monkeypatch):
+    _token(token_path, 3600)
+    loads = []
+    real = Credentials.from_authorized_user_file
+    monkeypatch.setattr(Credentials, 'from_authorized_user_file',
+                        lambda *a, **k: loads.append(1) or real(*a, **k))
+    client = GmailClient()
+    assert client.credentials() is client.credentials()
+    assert len(loads) == 1
+    assert refresh_calls == []
+
+
+def test_refreshes_before_expiry_once_across_threads(token_path, refresh_calls):
+    _token(token_path, 60)   # inside the default 300s margin
+    client = GmailClient()
+    threads = [threading.Thread(target=client.credentials) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(refresh_calls) == 1
+    saved = json.loads(token_path.read_text())
+    assert saved['token'] == 'access-1'
+    if os.name != 'nt':
+        assert stat.S_IMODE(token_path.stat().st_mode) == 0o600
+    assert not list(token_path.parent.glob('.token.*'))
+
+
+def test_missing_credentials_file(token_path):
+    with pytest.raises(FileNotFoundError):
+        GmailClient().credentials()
+
+
+def test_service_is_reused_per_thread(token_path, refresh_calls, monkeypatch):
+    _token(token_path, 3600)
+    builds = []
+    import googleapiclient.discovery as discovery
+    monkeypatch.setattr(discovery, 'build', lambda *a, **k: builds.append(k) or object())
+    client = GmailClient()
+    first = client.service()
+    assert client.service() is first
+    other = []
+    t = threading.Thread(target=lambda: other.append(client.service()))
+    t.start()
+    t.join()
+    assert other[0] is not first
+    assert len(builds) == 2
+    assert builds[0]['cache_discovery'] is False
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self.service, self.callback, self.calls = service, callback, []
+
+    def add(self, request, request_id):
+        self.calls.append((request, request_id))
+
+    def execute(self):
+        self.service.batches.append(len(self.calls))
+        for request, request_id in self.calls:
+            if request == 'gone':
+                self.callback(request_id, None, Exception('404'))
+            else:
+                self.callback(request_id, {'id': request}, None)
+
+
+class _FakeService:
+    def __init__(self, missing=()):
+        self.batches = []
+        self.missing = set(missing)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, **kwargs):
+        return 'gone' if id in self.missing else id
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+
+def test_fetch_messages_batches_and_keeps_order(monkeypatch):
+    monkeypatch.setattr(gmail_client, 'BATCH_SIZE', 3)
+    service = _FakeService(missing={'m4'})
+    ids = [f'm{i}' for i in range(7)]
+    results = GmailClient().fetch_messages(service, ids, format='metadata')
+    assert service.batches == [3, 3, 1]
+    assert [r and r['id'] for r in results] == ['m0', 'm1', 'm2', 'm3', None, 'm5', 'm6']
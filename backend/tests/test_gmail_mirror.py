@@ -0,0 +1,209 @@
+import time
+
+import pytest
+
+from tools.gmail_client import GmailClient
+from tools.gmail_mirror import GmailMirror, parse_query
+
+DAY_MS = 86_400_000
+
+
+class _Req:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class _HistoryGone(Exception):
+    class resp:
+        status = 404
+
+
+class FakeGmail:
+    """Just enough of the Gmail API for the mirror: list, get, profile, history, batch."""
+
+    def __init__(self):
+        self.now = int(time.time() * 1000)
+        self.store = {}
+        self.records = []        # (history_id, record)
+        self.history_id = 100
+        self.calls = []
+
+    def add(self, msg_id, sender, subject, age_days=0, labels=('INBOX', 'UNREAD'), record=True):
+        self.store[msg_id] = {
+            'id': msg_id, 'threadId': msg_id, 'snippet': f'snippet {msg_id}',
+            'internalDate': str(self.now - age_days * DAY_MS), 'labelIds': list(labels),
+            'payload': {'headers': [
+                {'name': 'From', 'value': sender}, {'name': 'Subject', 'value': subject},
+                {'name': 'Date', 'value': f'day -{age_days}'},
+            ]},
+        }
+        if record:
+            self._record({'messagesAdded': [{'message': {'id': msg_id}}]})
+
+    def relabel(self, msg_id, labels):
+        self.store[msg_id]['labelIds'] = list(labels)
+        self._record({'labelsRemoved': [{'message': {'id': msg_id}, 'labelIds': ['UNREAD']}]})
+
+    def delete(self, msg_id):
+        del self.store[msg_id]
+        self._record({'messagesDeleted': [{'message': {'id': msg_id}}]})
+
+    def _record(self, record):
+        self.history_id += 1
+        self.records.append((self.history_id, record))
+
+    # ── API surface ──
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        return _Req(lambda: {'historyId': str(self.history_id)})
+
+    def list(self, userId, q=None, maxResults=100, pageToken=None, startHistoryId=None, historyTypes=None):
+        if startHistoryId is not None:
+            self.calls.append('history.list')
+
+            def run():
+                start = int(startHistoryId)
+                if self.records and start < self.records[0][0] - 1:
+                    raise _HistoryGone()
+                return {'history': [r for h, r in self.records if h > start], 'historyId': str(self.history_id)}
+            return _Req(run)
+        self.calls.append('messages.list')
+        days = int(q.removeprefix('newer_than:').rstrip('d'))
+        ids = sorted(
+            (m for m in self.store.values() if self.now - int(m['internalDate']) <= days * DAY_MS),
+            key=lambda m: -int(m['internalDate']),
+        )
+        return _Req(lambda: {'messages': [{'id': m['id']} for m in ids[:maxResults]]})
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return self
+
+    def get(self, userId, id, **kwargs):
+        return id
+
+    def new_batch_http_request(self, callback):
+        gmail = self
+
+        class Batch:
+            ids = []
+
+            def add(self, request, request_id):
+                self.ids = self.ids + [request_id]
+
+            def execute(self):
+                gmail.calls.append('batch')
+                for msg_id in self.ids:
+                    msg = gmail.store.get(msg_id)
+                    callback(msg_id, msg, None if msg else Exception('404'))
+        return Batch()
+
+
+
+class _Client(GmailClient):
+    def __init__(self, fake):
+        super().__init__()
+        self.fake = fake
+
+    def service(self):
+        return self.fake
+
+
+@pytest.fixture
+def gmail():
+    return FakeGmail()
+
+
+def _mirror(fake):
+    return GmailMirror(_Client(fake), days=30, sync_seconds=3600)
+
+
+def _subjects(hits):
+    return [h['subject'] for h in hits]
+
+
+def test_parse_query_supported_and_unsupported():
+    now = 1_700_000_000_000
+    spec = parse_query('from:ana@acme.com subject:"Q3 plan" is:unread newer_than:7d', now_ms=now)
+    assert spec['fts'] == ['sender : "ana@acme.com"', 'subject : "Q3 plan"']
+    assert spec['labels'] == [('UNREAD', True)]
+    assert spec['after'] == now - 7 * DAY_MS
+    assert parse_query('after:2024/01/31 before:2024-02-02')['before'] > parse_query('after:2024/01/31')['after']
+    for query in ('invoice', 'has:attachment', 'from:a OR from:b', '-is:unread', 'label:vip', 'newer_than:soon'):
+        assert parse_query(query) is None
+
+
+def test_search_is_served_locally(gmail):
+    for i in range(6):
+        gmail.add(f'm{i}', f'Ana <ana{i % 2}@acme.com>', f'Deal {i}', age_days=i)
+    mirror = _mirror(gmail)
+    mirror.sync()
+    gmail.calls.clear()
+
+    hits = mirror.search('from:ana1@acme.com newer_than:10d', max_results=5)
+    assert _subjects(hits) == ['Deal 1', 'Deal 3', 'Deal 5']
+    assert _subjects(mirror.search('is:unread', max_results=2)) == ['Deal 0', 'Deal 1']
+    assert _subjects(mirror.search('subject:"deal 4" after:2000/01/01 newer_than:30d', 5)) == ['Deal 4']
+    assert gmail.calls == []
+
+
+def test_unsupported_or_uncovered_queries_fall_back(gmail):
+    gmail.add('m0', 'ana@acme.com', 'Deal')
+    mirror = _mirror(gmail)
+    mirror.sync()
+    assert mirror.search('invoice') is None
+    # One hit, five wanted, no lower date bound: older matches may exist.
+    assert mirror.search('from:ana@acme.com', max_results=5) is None
+    assert mirror.stats['live_fallbacks'] == 2
+
+
+def test_incremental_sync_applies_history(gmail):
+    gmail.add('m0', 'ana@acme.com', 'Old', age_days=1)
+    gmail.add('m1', 'bo@acme.com', 'Gone soon', age_days=2)
+    mirror = _mirror(gmail)
+    mirror.sync()
+
+    gmail.add('m2', 'cy@acme.com', 'New')
+    gmail.relabel('m0', ['INBOX'])
+    gmail.delete('m1')
+    gmail.calls.clear()
+    mirror.sync()
+
+    assert 'messages.list' not in gmail.calls
+    assert mirror.stats['incremental_syncs'] == 1
+    assert _subjects(mirror.search('in:inbox newer_than:30d', 10)) == ['New', 'Old']
+    assert _subjects(mirror.search('is:unread newer_than:30d', 10)) == ['New']
+
+
+def test_trashed_messages_leave_the_mirror(gmail):
+    gmail.add('m0', 'ana@acme.com', 'Spam-ish')
+    mirror = _mirror(gmail)
+    mirror.sync()
+    gmail.relabel('m0', ['TRASH'])
+    mirror.sync()
+    assert mirror.search('newer_than:30d', 5) == []
+
+
+def test_expired_history_triggers_full_sync(gmail):
+    gmail.add('m0', 'ana@acme.com', 'A', age_days=1)
+    mirror = _mirror(gmail)
+    mirror.sync()
+    gmail.add('m1', 'ana@acme.com', 'B')
+    gmail.records = gmail.records[-1:]   # Gmail dropped the older history
+    mirror._set_state(history_id=1)
+    mirror.sync()
+    assert mirror.stats['full_syncs'] == 2
+    assert _subjects(mirror.search('newer_than:30d', 2)) == ['B', 'A']
+
+
+def test_disabled_mirror_never_answers(gmail):
+    mirror = GmailMirror(_Client(gmail), sync_seconds=0)
+    assert mirror.search('is:unread') is None
+    assert not mirror.start()
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+import llm
+
+
+@pytest.fixture(autouse=True)
+def fresh_client():
+    llm.close()
+    yield
+    llm.close()
+
+
+def test_every_llm_shares_one_client_but_keeps_its_callbacks():
+    a, b = object(), object()
+    first = llm.llm_kwargs(callbacks=[a])
+    second = llm.llm_kwargs(callbacks=[b])
+    assert first["http_client"] is second["http_client"]
+    assert first["callbacks"] == [a] and second["callbacks"] == [b]
+    assert first["streaming"] is True
+
+
+def test_env_config(monkeypatch):
+    monkeypatch.setenv("MODEL_NAME", "gpt-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://local:9000/v1/")
+    monkeypatch.setenv("LLM_HTTP2", "0")
+    kwargs = llm.llm_kwargs(temperature=0.1)
+    assert kwargs["model"] == "gpt-test"
+    assert kwargs["temperature"] == 0.1
+    assert kwargs["base_url"] == "http://local:9000/v1"
+
+
+def test_closed_client_is_rebuilt():
+    client = llm.http_client()
+    client.close()
+    assert llm.http_client() is not client
+
+
+def test_prewarm_hits_models(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.headers["authorization"]))
+        return httpx.Response(200, json={"data": []})
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://api.test/v1")
+    monkeypatch.setattr(llm, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    assert llm.prewarm() == 200
+    assert seen == [("/v1/models", "Bearer sk-test")]
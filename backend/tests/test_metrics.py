@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from metrics import RunMetrics, render
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def iter_frames(frames):
+    for frame in frames:
+        yield frame
+
+
+async def exhaust(frames):
+    async for _ in frames:
+        pass
+
+
+def test_run_records_stages_ttft_tools_and_outcome():
+    clock = FakeClock()
+    labels = {"agent_type": "sales_t1"}
+    run = RunMetrics("sales_t1", "chat_stream", clock=clock)
+    clock.now += 0.5                       # queue wait
+    with run:
+        assert value("nexos_runs_in_flight", endpoint="chat_stream", **labels) == 1
+        t0 = run.now()
+        clock.now += 0.2
+        run.observe("agent_build", t0)
+        with run.stage("kickoff"):
+            clock.now += 0.3
+            run.token()
+            run.token()
+            clock.now += 1.0
+            run.step(SimpleNamespace(tool="gmail_read_emails", tool_input="{}"))
+            run.step(SimpleNamespace(text="thinking"))
+
+    assert value("nexos_runs_in_flight", endpoint="chat_stream", **labels) == 0
+    assert value("nexos_runs_total", endpoint="chat_stream", outcome="ok", **labels) == 1
+    assert value("nexos_stage_seconds_sum", stage="agent_build", **labels) == pytest.approx(0.2)
+    assert value("nexos_stage_seconds_sum", stage="kickoff", **labels) == pytest.approx(1.3)
+    assert value("nexos_ttft_seconds_sum", **labels) == pytest.approx(1.0)
+    assert value("nexos_ttft_seconds_count", **labels) == 1
+    assert value("nexos_tokens_total", **labels) == 2
+    assert value("nexos_tool_calls_total", tool="gmail_read_emails", **labels) == 1
+    assert value("nexos_tool_step_seconds_sum", tool="gmail_read_emails", **labels) == pytest.approx(1.5)
+    assert value("nexos_run_seconds_sum", endpoint="chat_stream", **labels) == pytest.approx(2.0)
+
+
+def test_errors_are_counted_per_stage_and_run():
+    labels = {"agent_type": "tech_t2"}
+    run = RunMetrics("tech_t2", "chat")
+    with pytest.raises(RuntimeError):
+        with run:
+            with run.stage("task_build"):
+                raise RuntimeError("bad prompt")
+    assert value("nexos_stage_errors_total", stage="task_build", **labels) == 1
+    assert value("nexos_runs_total", endpoint="chat", outcome="error", **labels) == 1
+
+
+def test_render_exposes_text_format():
+    RunMetrics("hr_t3", "chat").finish("cached")
+    body, content_type = render()
+    assert content_type.startswith("text/plain")
+    assert b'nexos_runs_total{agent_type="hr_t3",endpoint="chat",outcome="cached"} 1.0' in body
+
+
+def test_prompt_tokens_and_elapsed_ms():
+    clock = FakeClock()
+    run = RunMetrics("sales_t3", "agora", clock=clock)
+    run.prompt(1200)
+    clock.now += 1.25
+    assert run.elapsed_ms() == 1250
+    assert value("nexos_prompt_tokens_sum", agent_type="sales_t3") == 1200
+
+
+def test_streamed_run_is_recorded_when_the_stream_closes():
+    clock = FakeClock()
+    labels = {"agent_type": "stream_t3", "endpoint": "chat_stream"}
+    run = RunMetrics("stream_t3", "chat_stream", clock=clock)
+
+    async def source():
+        yield "data: a\n\n"
+        clock.now += 2.0                   # pump flush + client drain
+        yield "data: b\n\n"
+
+    async def drain(frames):
+        return [frame async for frame in frames]
+
+    frames = run.until_closed(source())
+    with run:
+        clock.now += 1.0
+    assert value("nexos_runs_total", outcome="ok", **labels) == 0
+    assert asyncio.run(drain(frames)) == ["data: a\n\n", "data: b\n\n"]
+    assert value("nexos_runs_total", outcome="ok", **labels) == 1
+    assert value("nexos_run_seconds_sum", **labels) == pytest.approx(3.0)
+
+
+def test_queue_timeout_is_recorded_with_its_own_outcome():
+    labels = {"agent_type": "stream_t4", "endpoint": "chat_stream"}
+    run = RunMetrics("stream_t4", "chat_stream")
+    frames = run.until_closed(iter_frames([]))
+    run.finish("queue_timeout")            # the job never entered the run
+    asyncio.run(exhaust(frames))
+    assert value("nexos_runs_total", outcome="queue_timeout", **labels) == 1
+
+    rejected = RunMetrics("stream_t4", "chat_stream")
+    rejected.until_closed(iter_frames([]))
+    rejected.discard_stream()              # admission failed; never served
+    rejected.finish("rejected")
+    assert value("nexos_runs_total", outcome="rejected", **labels) == 1
@@ -0,0 +1,118 @@
+import time
+import threading
+
+import pytest
+
+from tools import notion_api
+from tools.notion_api import create_page, read_blocks
+
+
+def _para(i):
+    return {'type': 'paragraph', 'paragraph': {'rich_text': [{'plain_text': f'p{i}'}]}}
+
+
+class FakeNotion:
+    """pages.create / blocks.children.append / blocks.children.list over an in-memory tree."""
+
+    def __init__(self, page_size=100):
+        self.page_size = page_size
+        self.children: dict = {}
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.pages = self
+        # client.blocks.children.* routes back to this object
+        self.blocks = type('Blocks', (), {'children': self})()
+
+    # pages.create
+    def create(self, parent, properties, children):
+        assert len(children) <= 100
+        self.requests.append(('create', len(children)))
+        self.children['page'] = list(children)
+        return {'id': 'page', 'url': 'https://notion.test/page'}
+
+    # blocks.children.append / list
+    def append(self, block_id, children):
+        assert len(children) <= 100
+        self.requests.append(('append', len(children)))
+        self.children[block_id].extend(children)
+        return {}
+
+    def list(self, block_id, page_size=100, start_cursor=None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        kids = self.children.get(block_id, [])
+        start = int(start_cursor or 0)
+        end = start + self.page_size
+        return {'results': kids[start:end], 'has_more': end < len(kids), 'next_cursor': str(end)}
+
+
+@pytest.fixture
+def fake():
+    return FakeNotion()
+
+
+def test_create_page_appends_in_100_block_chunks(fake):
+    blocks = (_para(i) for i in range(250))
+    page = create_page(fake, parent={}, properties={}, blocks=blocks)
+    assert fake.requests == [('create', 100), ('append', 100), ('append', 50)]
+    assert page['appended_blocks'] == 250
+    texts = [b['paragraph']['rich_text'][0]['plain_text'] for b in fake.children['page']]
+    assert texts == [f'p{i}' for i in range(250)]
+
+
+def test_create_small_page_is_one_request(fake):
+    create_page(fake, parent={}, properties={}, blocks=[_para(0)])
+    assert fake.requests == [('create', 1)]
+
+
+def test_read_blocks_paginates_and_recurses_in_order(fake):
+    fake.page_size = 2
+    fake.children['root'] = [
+        {'id': 'a', 'type': 'toggle', 'has_children': True},
+        {'id': 'b', 'type': 'paragraph', 'has_children': False},
+        {'id': 'c', 'type': 'toggle', 'has_children': True},
+        {'id': 'sub', 'type': 'child_page', 'has_children': True},
+    ]
+    fake.children['a'] = [{'id': 'a1', 'type': 'paragraph'}, {'id': 'a2', 'type': 'toggle', 'has_children': True}]
+    fake.children['a2'] = [{'id': 'a2x', 'type': 'paragraph'}]
+    fake.children['c'] = [{'id': f'c{i}', 'type': 'paragraph'} for i in range(5)]
+    fake.children['sub'] = [{'id': 'never', 'type': 'paragraph'}]
+
+    out = [(d, b['id']) for d, b in read_blocks(fake, 'root', max_depth=3, fan_out=4)]
+    assert out == [
+        (0, 'a'), (1, 'a1'), (1, 'a2'), (2, 'a2x'),
+        (0, 'b'),
+        (0, 'c'), (1, 'c0'), (1, 'c1'), (1, 'c2'), (1, 'c3'), (1, 'c4'),
+        (0, 'sub'),
+    ]
+
+
+def test_read_blocks_bounds_depth_and_fan_out(fake):
+    fake.children['root'] = [{'id': f't{i}', 'type': 'toggle', 'has_children': True} for i in range(10)]
+    for i in range(10):
+        fake.children[f't{i}'] = [{'id': f't{i}x', 'type': 'toggle', 'has_children': True}]
+    out = read_blocks(fake, 'root', max_depth=2, fan_out=3)
+    assert max(d for d, _ in out) == 1
+    assert fake.peak <= 3
+
+
+def test_shared_client_is_reused(monkeypatch):
+    pytest.importorskip('notion_client')
+    monkeypatch.setenv('NOTION_TOKEN', 'secret_a')
+    monkeypatch.setattr(notion_api, '_client', None)
+    first = notion_api.notion()
+    assert notion_api.notion() is first
+    monkeypatch.setenv('NOTION_TOKEN', 'secret_b')
+    assert notion_api.notion() is not first
+
+
+def test_missing_token(monkeypatch):
+    monkeypatch.delenv('NOTION_TOKEN', raising=False)
+    with pytest.raises(EnvironmentError):
+        notion_api.notion()
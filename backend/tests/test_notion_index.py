@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from tools.notion_index import NotionIndex, properties_text, _edited_ts, _fts_query
+
+
+def _page(pid, title, edited, body='', **props):
+    properties = {'Name': {'type': 'title', 'title': [{'plain_text': title}]}}
+    for name, value in props.items():
+        properties[name] = {'type': 'select', 'select': {'name': value}}
+    return {'object': 'page', 'id': pid, 'url': f'https://notion.test/{pid}',
+            'last_edited_time': edited, 'properties': properties, '_body': body}
+
+
+class FakeNotion:
+    def __init__(self):
+        self.items = []
+        self.reads = []
+        self.blocks = type('Blocks', (), {'children': self})()
+
+    def search(self, page_size=100, sort=None, start_cursor=None):
+        ordered = sorted(self.items, key=lambda i: i['last_edited_time'], reverse=True)
+        start = int(start_cursor or 0)
+        end = start + 2   # small pages to exercise the cursor
+        return {'results': ordered[start:end], 'has_more': end < len(ordered), 'next_cursor': str(end)}
+
+    def list(self, block_id, page_size=100, start_cursor=None):
+        self.reads.append(block_id)
+        item = next(i for i in self.items if i['id'] == block_id)
+        blocks = [{'id': f'{block_id}-{n}', 'type': 'paragraph',
+                   'paragraph': {'rich_text': [{'plain_text': line}]}}
+                  for n, line in enumerate(item['_body'].splitlines())]
+        return {'results': blocks, 'has_more': False}
+
+
+@pytest.fixture
+def notion():
+    fake = FakeNotion()
+    fake.items = [
+        _page('p1', 'Q3 hiring plan', '2024-05-01T10:00:00.000Z', 'Two SDRs and a designer', Status='Draft'),
+        _page('p2', 'Pricing research', '2024-05-02T10:00:00.000Z', 'Competitors charge per seat. Hiring not covered.'),
+        _page('p3', 'Board meeting notes', '2024-05-03T10:00:00.000Z', 'Discussed runway'),
+    ]
+    return fake
+
+
+def _index(fake, **kwargs):
+    return NotionIndex(refresh_seconds=3600, client_factory=lambda: fake, **kwargs)
+
+
+def _built(fake, **kwargs):
+    index = _index(fake, **kwargs)
+    assert index.refresh()
+    return index
+
+
+def test_search_ranks_title_above_body(notion):
+    index = _built(notion)
+    hits = index.search('hiring', limit=5)
+    assert [h['id'] for h in hits] == ['p1', 'p2']
+    assert hits[0]['url'] == 'https://notion.test/p1'
+
+
+def test_properties_and_prefixes_are_searchable(notion):
+    index = _built(notion)
+    assert [h['id'] for h in index.search('draft')] == ['p1']
+    assert [h['id'] for h in index.search('compet')] == ['p2']
+    assert index.search('   ') == []
+
+
+def test_refresh_only_rereads_edited_pages(notion):
+    index = _index(notion)
+    index.refresh()
+    assert sorted(notion.reads) == ['p1', 'p2', 'p3']
+    notion.reads.clear()
+
+    notion.items[0] = _page('p1', 'Q3 hiring plan', '2024-06-01T10:00:00.000Z', 'Now hiring engineers')
+    index.refresh()
+    assert notion.reads == ['p1']
+    assert [h['id'] for h in index.search('engineers')] == ['p1']
+
+
+def test_archived_pages_are_dropped(notion):
+    index = _index(notion)
+    index.refresh()
+    notion.items[2] = {**notion.items[2], 'last_edited_time': '2024-06-01T00:00:00.000Z', 'archived': True}
+    index.refresh()
+    assert index.search('runway') == []
+
+
+def test_upsert_makes_new_pages_searchable_immediately(notion):
+    index = _built(notion)
+    index.upsert(_page('p4', 'Deep research: fintech', '2024-06-02T00:00:00.000Z'), 'Market size is large')
+    assert [h['id'] for h in index.search('market size')] == ['p4']
+
+
+def test_search_never_blocks_on_the_first_build(notion):
+    index = _index(notion)
+    gate = threading.Event()
+    index._client_factory = lambda: gate.wait(5) and notion
+    assert index.search('hiring') is None          # still building: caller goes live
+    assert notion.reads == []
+    gate.set()
+    index._worker.join(5)
+    assert index.ready
+    assert [h['id'] for h in index.search('hiring')] == ['p1', 'p2']
+
+
+def test_capped_passes_resume_without_rereading(notion):
+    index = _index(notion, pass_pages=2)
+    assert index.refresh() is False
+    assert not index.ready and len(notion.reads) == 2
+    assert index.refresh() is True
+    assert sorted(notion.reads) == ['p1', 'p2', 'p3']
+
+
+def test_edit_in_the_same_minute_as_indexing_is_picked_up(notion):
+    edited = '2024-06-01T10:00:00.000Z'
+    now = [_edited_ts(edited) + 20]               # indexed 20 s into the edit's minute
+    index = _built(notion, clock=lambda: now[0])
+    notion.items[0] = _page('p1', 'Q3 hiring plan', edited, 'Old body')
+    index.refresh()
+    notion.reads.clear()
+    notion.items[0]['_body'] = 'Edited again within the minute'
+    now[0] += 30
+    index.refresh()
+    assert notion.reads == ['p1']
+    assert [h['id'] for h in index.search('within')] == ['p1']
+    notion.reads.clear()
+    now[0] += 120
+    index.refresh()                               # read a minute later → now current
+    index.refresh()
+    assert notion.reads == ['p1']
+
+
+def test_helpers():
+    assert _fts_query('Q3 "plan"') == '"q3"* OR "plan"*'
+    item = {'properties': {
+        'Tags': {'type': 'multi_select', 'multi_select': [{'name': 'ops'}, {'name': 'hr'}]},
+        'Owner': {'type': 'people', 'people': [{'name': 'Ana'}]},
+        'Due': {'type': 'date', 'date': {'start': '2024-07-01'}},
+    }}
+    assert properties_text(item) == 'Tags: ops hr\nOwner: Ana\nDue: 2024-07-01'
@@ -0,0 +1,56 @@
+import time
+
+from response_cache import ResponseCache, is_side_effect_tool, normalize_message
+
+
+def test_key_ignores_case_whitespace_and_trailing_punctuation():
+    a = ResponseCache.make_key('sales', 'Top 3  priorities?', 'p1', 'gpt')
+    b = ResponseCache.make_key('sales', 'top 3 priorities', 'p1', 'gpt')
+    assert a == b
+    assert a != ResponseCache.make_key('sales', 'top 3 priorities', 'p2', 'gpt')
+    assert normalize_message('  Hello\n World!! ') == 'hello world'
+
+
+def test_memory_tier_is_bounded_lru():
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'   # 'b' is now least recently used
+    cache.put('c', 'C')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.stats()['entries'] == 2
+
+
+def test_sqlite_promotion_respects_max_entries(tmp_path):
+    db = str(tmp_path / 'cache.db')
+    writer = ResponseCache(max_entries=10, ttl=60, db_path=db)
+    for i in range(5):
+        writer.put(f'k{i}', f'v{i}')
+
+    reader = ResponseCache(max_entries=2, ttl=60, db_path=db)
+    assert reader.persistent
+    for i in range(5):
+        assert reader.get(f'k{i}') == f'v{i}'
+    assert reader.stats()['entries'] == 2
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(max_entries=4, ttl=60, db_path=str(tmp_path / 'c.db'))
+    cache.put('k', 'v')
+    cache._mem['k'] = (time.time() - 120, 'v')
+    assert cache.get('k') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(ttl=0)
+    cache.put('k', 'v')
+    assert not cache.enabled
+    assert cache.get('k') is None
+
+
+def test_side_effect_tools_are_detected():
+    assert is_side_effect_tool('Send Gmail Email')
+    assert is_side_effect_tool('Slack Post Message')
+    assert not is_side_effect_tool('Read Gmail Inbox')
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from tools import slack_api
+from tools.slack_api import ChannelDirectory, read_history, post_many
+
+
+class FakeSlack:
+    def __init__(self, channels, history=None):
+        self._channels = channels
+        self._history = history or []
+        self.calls = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def conversations_list(self, types, limit, exclude_archived, cursor=None):
+        self.calls.append(("list", cursor))
+        start = int(cursor or 0)
+        page = self._channels[start:start + 2]
+        nxt = str(start + 2) if start + 2 < len(self._channels) else ""
+        return {"channels": page, "response_metadata": {"next_cursor": nxt}}
+
+    def conversations_history(self, channel, limit, cursor=None):
+        self.calls.append(("history", limit, cursor))
+        start = int(cursor or 0)
+        page = self._history[start:start + limit]
+        more = start + limit < len(self._history)
+        return {"messages": page, "has_more": more,
+                "response_metadata": {"next_cursor": str(start + limit) if more else ""}}
+
+    def chat_postMessage(self, channel, text):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        if channel == "C_BAD":
+            raise RuntimeError("channel_not_found")
+        return {"ts": f"ts-{channel}"}
+
+
+CHANNELS = [{"name": f"ch{i}", "id": f"C{i:03d}"} for i in range(5)] + [{"name": "bad", "id": "C_BAD"}]
+
+
+@pytest.fixture(autouse=True)
+def fresh_directory(monkeypatch):
+    monkeypatch.setattr(slack_api, "CHANNELS", ChannelDirectory(ttl_seconds=60))
+
+
+def test_directory_paginates_and_caches():
+    client = FakeSlack(CHANNELS)
+    assert slack_api.CHANNELS.resolve(client, "#ch4") == "C004"
+    assert slack_api.CHANNELS.resolve(client, "ch1") == "C001"
+    assert len(slack_api.CHANNELS.channels(client)) == 6
+    assert [c for c in client.calls if c[0] == "list"] == [("list", None), ("list", "2"), ("list", "4")]
+
+
+def test_unknown_name_refreshes_once_and_ids_pass_through():
+    client = FakeSlack(CHANNELS)
+    slack_api.CHANNELS.channels(client)
+    client._channels = CHANNELS + [{"name": "new", "id": "C999"}]
+    assert slack_api.CHANNELS.resolve(client, "#new") == "C999"
+    assert slack_api.CHANNELS.resolve(client, "C123ABC") == "C123ABC"
+    assert slack_api.CHANNELS.stats["loads"] == 2
+
+
+def test_unknown_name_reloads_at_most_once_per_ttl():
+    now = [1000.0]
+    directory = ChannelDirectory(ttl_seconds=60, clock=lambda: now[0])
+    client = FakeSlack(CHANNELS)
+    for _ in range(5):
+        assert directory.resolve(client, "#typo") == "#typo"
+    assert directory.stats["loads"] == 2              # initial load + one refresh for the miss
+    now[0] += 30
+    directory.resolve(client, "#ch1")
+    assert directory.stats["loads"] == 2
+    now[0] += 31                                     # TTL over: miss may reload again
+    directory.resolve(client, "#typo")
+    assert directory.stats["loads"] == 4              # TTL reload + the miss
+
+
+def test_concurrent_lookups_share_one_load():
+    client = FakeSlack(CHANNELS)
+    gate = threading.Event()
+    slow_list = client.conversations_list
+
+    def conversations_list(**kwargs):
+        gate.wait(2)
+        return slow_list(**kwargs)
+
+    client.conversations_list = conversations_list
+    directory = ChannelDirectory(ttl_seconds=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(directory.resolve(client, "#ch2")))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join(2)
+    assert results == ["C002"] * 8
+    assert directory.stats["loads"] == 1
+
+
+def test_read_history_stops_at_total():
+    client = FakeSlack([], history=[{"text": str(i)} for i in range(450)])
+    msgs = read_history(client, "C001", 250)
+    assert [m["text"] for m in msgs] == [str(i) for i in range(250)]
+    assert [c[1] for c in client.calls] == [200, 50]
+
+
+def test_read_history_short_channel():
+    client = FakeSlack([], history=[{"text": "a"}, {"text": "b"}])
+    assert len(read_history(client, "C001", 100)) == 2
+
+
+def test_post_many_bounded_dedupes_and_reports_errors():
+    client = FakeSlack(CHANNELS)
+    targets = ["#ch0", "#ch1", " #ch2", "#ch3", "#ch4", "#ch0", "#bad", ""]
+    results = post_many(client, targets, "hi", concurrency=3)
+    assert [r[0] for r in results] == ["#ch0", "#ch1", "#ch2", "#ch3", "#ch4", "#bad"]
+    assert results[0][1] == "ts-C000" and results[0][2] is None
+    assert results[-1][1] is None and "channel_not_found" in results[-1][2]
+    assert client.peak <= 3
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from startup import Startup
+
+
+def test_stages_run_in_order_with_parallel_steps():
+    seen = []
+    barrier = threading.Barrier(2, timeout=2)
+
+    def step(name):
+        def run():
+            if name in ("a", "b"):
+                barrier.wait()          # only passes if a and b run concurrently
+            seen.append(name)
+        return run
+
+    s = Startup(workers=4)
+    s.run([("one", {"a": step("a"), "b": step("b")}), ("two", {"c": step("c")})])
+    assert set(seen[:2]) == {"a", "b"} and seen[2] == "c"
+    report = s.report()
+    assert report["state"] == "ready" and report["ready"]
+    assert [st["name"] for st in report["stages"]] == ["one", "two"]
+    assert all("ms" in step for st in report["stages"] for step in st["steps"])
+
+
+def test_optional_failure_degrades_required_failure_fails():
+    def boom():
+        raise RuntimeError("no key")
+
+    s = Startup()
+    s.run([("imports", {"ok": lambda: None}), ("tools", {"llm": boom}, False)])
+    assert s.state == "degraded" and s.ready
+    step = s.report()["stages"][1]["steps"][0]
+    assert step["ok"] is False and "RuntimeError: no key" in step["error"]
+
+    s = Startup()
+    s.run([("imports", {"crewai": boom})])
+    assert s.state == "failed" and not s.ready
+
+
+def test_partial_failures_are_reported_as_detail():
+    s = Startup()
+    s.run([("agents", {"sales": lambda: {"sales": "bad tool"}}, False)])
+    assert s.state == "ready"
+    assert s.report()["stages"][0]["steps"][0]["detail"] == {"sales": "bad tool"}
+
+
+def test_start_runs_in_background():
+    gate = threading.Event()
+    s = Startup()
+    s.start([("slow", {"wait": gate.wait})])
+    time.sleep(0.01)
+    assert s.state == "warming" and not s.ready
+    assert s.report()["app_import_ms"] is not None
+    gate.set()
+    assert s.wait(2)
+    assert s.ready
@@ -0,0 +1,118 @@
+import json
+import asyncio
+
+from streaming import EventBridge, RUNS
+
+
+def _events(frames):
+    out = []
+    for frame in frames:
+        for line in frame.splitlines():
+            if line.startswith('data: '):
+                out.append(json.loads(line[len('data: '):]))
+    return out
+
+
+async def _collect(bridge, last_event_id=0):
+    return [f async for f in bridge.stream(last_event_id)]
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+def test_tokens_are_coalesced_per_agent_and_first_token_is_immediate():
+    async def scenario():
+        bridge = EventBridge(coalesce_ms=1000, coalesce_bytes=10_000)
+        for i in range(5):
+            bridge.put({'type': 'text_chunk', 'agent': 'a', 'content': f't{i}'})
+        bridge.put({'type': 'final_answer', 'content': 'x'})
+        bridge.close()
+        return bridge, _events(await _collect(bridge))
+
+    bridge, events = _run(scenario)
+    chunks = [e['content'] for e in events if e['type'] == 'text_chunk']
+    assert chunks == ['t0', 't1t2t3t4']
+    assert [e['type'] for e in events] == ['text_chunk', 'text_chunk', 'final_answer', 'done']
+    assert bridge.stats == {'tokens': 5, 'text_frames': 2, 'frames': 4}
+    assert events[-1]['stream_stats'] == bridge.stats
+
+
+def test_flush_threshold_counts_utf8_bytes():
+    async def scenario():
+        bridge = EventBridge(coalesce_ms=1000, coalesce_bytes=8)
+        bridge.put({'type': 'text_chunk', 'agent': 'a', 'content': 'go'})
+        # Two 4-byte characters reach 8 bytes even though len() is only 2.
+        bridge.put({'type': 'text_chunk', 'agent': 'a', 'content': '🙂'})
+        bridge.put({'type': 'text_chunk', 'agent': 'a', 'content': '🙂'})
+        await asyncio.sleep(0.05)
+        sent = bridge.text_frames
+        bridge.close()
+        await _collect(bridge)
+        return sent
+
+    assert _run(scenario) == 2
+
+
+def test_reconnect_replays_after_last_event_id():
+    async def scenario():
+        bridge = EventBridge(first={'type': 'agent_started'}, coalesce_ms=0)
+        for i in range(3):
+            bridge.put({'type': 'step', 'content': str(i)})
+        bridge.close()
+        full = _events(await _collect(bridge))
+        tail = _events(await _collect(bridge, last_event_id=2))
+        return bridge, full, tail
+
+    bridge, full, tail = _run(scenario)
+    assert full[0]['run_id'] == bridge.run_id
+    assert tail == full[2:]
+    assert RUNS[bridge.run_id] is bridge
+
+
+def test_replay_gap_is_reported_when_buffer_wrapped():
+    async def scenario():
+        bridge = EventBridge(coalesce_ms=0, replay_frames=2)
+        for i in range(4):
+            bridge.put({'type': 'step', 'content': str(i)})
+        bridge.close()
+        return _events(await _collect(bridge))
+
+    events = _run(scenario)
+    assert events[0] == {'type': 'replay_gap', 'missed': 3}
+    assert [e['type'] for e in events[1:]] == ['step', 'done']
+
+
+def test_discard_unregisters_run():
+    async def scenario():
+        bridge = EventBridge()
+        bridge.discard()
+        return bridge.run_id
+
+    assert _run(scenario) not in RUNS
+
+
+def test_negative_last_event_id_replays_from_start():
+    async def scenario():
+        bridge = EventBridge(first={'type': 'agent_started'}, coalesce_ms=0)
+        bridge.close()
+        return _events(await _collect(bridge, last_event_id=-5))
+
+    events = _run(scenario)
+    assert [e['type'] for e in events] == ['agent_started', 'done']
+
+
+def test_unserialisable_event_still_finishes_the_run():
+    async def scenario():
+        bridge = EventBridge(coalesce_ms=0)
+        bridge.put({'type': 'step', 'content': 'ok'})
+        bridge.put({'type': 'step', 'content': object()})
+        frames = await asyncio.wait_for(_collect(bridge), 2)
+        return bridge, frames
+
+    bridge, frames = _run(scenario)
+    events = _events(frames)
+    assert bridge.finished
+    assert [e['type'] for e in events] == ['step', 'error', 'done']
+    assert [f.split('\n')[0] for f in frames] == ['id: 1', 'id: 2', 'id: 3']
+    assert events[-1]['stream_stats']['frames'] == bridge.frames == 3
@@ -0,0 +1,83 @@
+from pydantic import BaseModel
+
+from tools.integrations import ToolCache, _wire, TOOL_CACHE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_on_normalized_args_until_ttl():
+    clock = FakeClock()
+    cache = ToolCache({"slack_read": 30}, clock=clock)
+    calls = []
+
+    def read(channel="", limit=10):
+        calls.append((channel, limit))
+        return f"messages in {channel}"
+
+    cached = cache.wrap("slack_read", read)
+    assert cached(channel="#eng", limit=5) == "messages in #eng"
+    assert cached(limit=5, channel="  #eng ") == "messages in #eng"
+    assert len(calls) == 1
+    clock.now = 31
+    cached(channel="#eng", limit=5)
+    assert len(calls) == 2
+    assert cache.stats()["slack_read"] == {
+        "hits": 1, "misses": 2, "invalidations": 0, "entries": 1, "ttl": 30,
+    }
+
+
+def test_errors_are_not_cached_and_zero_ttl_disables():
+    cache = ToolCache({"gmail_read": 60, "wa_status": 0})
+    results = iter(["[Gmail error] boom", "2 emails"])
+    cached = cache.wrap("gmail_read", lambda query="": next(results))
+    assert cached(query="x").startswith("[Gmail error]")
+    assert cached(query="x") == "2 emails"
+    fn = lambda sid: sid
+    assert cache.wrap("wa_status", fn) is fn
+
+
+def test_write_tool_invalidates_affected_reads_only():
+    cache = ToolCache({"trello_cards": 60, "slack_list": 60})
+    cards = cache.wrap("trello_cards", lambda board_id: f"cards {board_id}")
+    channels = cache.wrap("slack_list", lambda: "channels")
+    cards(board_id="b1")
+    channels()
+    move = cache.invalidating("trello_move", lambda card_id, list_id: "✅ moved")
+    assert move(card_id="c1", list_id="l2") == "✅ moved"
+    stats = cache.stats()
+    assert stats["trello_cards"]["entries"] == 0
+    assert stats["trello_cards"]["invalidations"] == 1
+    assert stats["slack_list"]["entries"] == 1
+
+
+def test_lru_bound():
+    cache = ToolCache({"notion_search": 60}, max_entries=2)
+    search = cache.wrap("notion_search", lambda query: query)
+    for q in ("a", "b", "c"):
+        search(query=q)
+    assert cache.stats()["notion_search"]["entries"] == 2
+
+
+def test_wire_shadows_pydantic_tool_run():
+    class Tool(BaseModel):
+        name: str = "slack_list_channels"
+        calls: int = 0
+
+        def _run(self) -> str:
+            self.calls += 1
+            return "channels"
+
+    tool = Tool()
+    _wire("slack_list", tool)
+    try:
+        tool._run()
+        tool._run()
+        assert tool.calls == 1
+    finally:
+        TOOL_CACHE.invalidate("slack_list")
@@ -0,0 +1,108 @@
+import time
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from tools.trello_client import TrelloClient, TrelloError
+
+
+@pytest.fixture(autouse=True)
+def trello_creds(monkeypatch):
+    monkeypatch.setenv('TRELLO_API_KEY', 'k')
+    monkeypatch.setenv('TRELLO_TOKEN', 't')
+
+
+def _client(handler, **kwargs):
+    return TrelloClient(base_url='https://trello.test/1', transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_get_sends_credentials_and_params():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        return httpx.Response(200, json=[{'id': 'b1'}])
+
+    client = _client(handler)
+    try:
+        assert client.get('members/me/boards', {'fields': 'name'}) == [{'id': 'b1'}]
+    finally:
+        client.close()
+    assert seen[0].path == '/1/members/me/boards'
+    assert dict(seen[0].params) == {'key': 'k', 'token': 't', 'fields': 'name'}
+
+
+def test_get_many_runs_concurrently_and_keeps_order():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return httpx.Response(200, json={'path': request.url.path})
+
+    client = _client(handler)
+    try:
+        results = client.get_many(('boards/x/cards', {}), ('boards/x/lists', {}))
+    finally:
+        client.close()
+    assert [r['path'] for r in results] == ['/1/boards/x/cards', '/1/boards/x/lists']
+    assert peak == 2
+
+
+def test_429_is_retried_after_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={'Retry-After': '0.1'}, text='slow down')
+        return httpx.Response(200, json={'ok': True})
+
+    client = _client(handler)
+    try:
+        assert client.get('cards/c1') == {'ok': True}
+    finally:
+        client.close()
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.09
+
+
+def test_errors_surface_as_trello_error():
+    client = _client(lambda request: httpx.Response(429, text='limit'), max_retries=1)
+    try:
+        with pytest.raises(TrelloError) as err:
+            client.get('cards/c1')
+        assert err.value.status_code == 429
+    finally:
+        client.close()
+
+
+def test_async_facade_from_another_loop():
+    client = _client(lambda request: httpx.Response(200, json={'id': 'b1'}))
+
+    async def scenario():
+        return await client.aget('boards/b1')
+
+    try:
+        assert asyncio.run(scenario()) == {'id': 'b1'}
+    finally:
+        client.close()
+
+
+def test_missing_credentials(monkeypatch):
+    monkeypatch.delenv('TRELLO_TOKEN')
+    client = _client(lambda request: httpx.Response(200, json={}))
+    try:
+        with pytest.raises(EnvironmentError):
+            client.get('members/me/boards')
+    finally:
+        client.close()
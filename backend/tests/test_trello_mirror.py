@@ -0,0 +1,155 @@
+import json
+import base64
+import hashlib
+import hmac
+
+import httpx
+import pytest
+
+from tools.trello_client import TrelloClient
+from tools.trello_mirror import TrelloMirror, verify_webhook
+
+
+class FakeTrello:
+    """In-memory stand-in for the parts of the Trello API the mirror uses."""
+
+    def __init__(self):
+        self.lists = {'l1': {'id': 'l1', 'name': 'To Do', 'pos': 1}, 'l2': {'id': 'l2', 'name': 'Done', 'pos': 2}}
+        self.cards = {
+            'c1': {'id': 'c1', 'name': 'Call Acme', 'idList': 'l1', 'idBoard': 'b1', 'pos': 1, 'closed': False},
+            'c2': {'id': 'c2', 'name': 'Send deck', 'idList': 'l1', 'idBoard': 'b1', 'pos': 2, 'closed': False},
+        }
+        self.actions = [{'id': 'a1', 'type': 'createCard', 'data': {'card': {'id': 'c2'}}}]   # newest first
+        self.requests = []
+
+    def act(self, kind, **data):
+        action = {'id': f'a{len(self.actions) + 1}', 'type': kind, 'data': {'board': {'id': 'b1'}, **data}}
+        self.actions.insert(0, action)
+        return action
+
+    def handler(self, request):
+        path = request.url.path.removeprefix('/1/')
+        self.requests.append(path)
+        if path == 'boards/b1/cards':
+            return httpx.Response(200, json=[c for c in self.cards.values() if not c['closed']])
+        if path == 'boards/b1/lists':
+            return httpx.Response(200, json=list(self.lists.values()))
+        if path == 'boards/b1/actions':
+            since = request.url.params.get('since')
+            ids = [a['id'] for a in self.actions]
+            newer = self.actions[:ids.index(since)] if since in ids else self.actions
+            return httpx.Response(200, json=newer[:int(request.url.params.get('limit', 50))])
+        if path.startswith('cards/'):
+            card = self.cards.get(path.split('/')[1])
+            if card is None:
+                return httpx.Response(404, text='card not found')
+            return httpx.Response(200, json={**card, 'checklists': [], 'actions': []})
+        return httpx.Response(404, text='unknown')
+
+
+@pytest.fixture
+def trello(monkeypatch):
+    monkeypatch.setenv('TRELLO_API_KEY', 'k')
+    monkeypatch.setenv('TRELLO_TOKEN', 't')
+    fake = FakeTrello()
+    client = TrelloClient(base_url='https://trello.test/1', transport=httpx.MockTransport(fake.handler))
+    yield fake, client
+    client.close()
+
+
+def _names(cards):
+    return [c['name'] for c in cards]
+
+
+def test_first_read_fills_then_serves_locally(trello):
+    fake, client = trello
+    mirror = TrelloMirror(client, poll_seconds=3600)
+    cards, lists = mirror.board('b1')
+    assert _names(cards) == ['Call Acme', 'Send deck']
+    assert [l['name'] for l in lists] == ['To Do', 'Done']
+    fetched = len(fake.requests)
+    mirror.board('b1')
+    assert len(fake.requests) == fetched
+
+
+def test_poll_refetches_only_touched_cards(trello):
+    fake, client = trello
+    mirror = TrelloMirror(client, poll_seconds=0)
+    mirror.board('b1')
+    fake.cards['c1']['idList'] = 'l2'
+    fake.act('updateCard', card={'id': 'c1'})
+    fake.requests.clear()
+
+    cards, _ = mirror.board('b1')
+    assert {c['id']: c['idList'] for c in cards}['c1'] == 'l2'
+    assert 'boards/b1/cards' not in fake.requests
+    assert fake.requests.count('cards/c1') == 1
+    assert mirror.stats['fills'] == 1
+
+    # Cursor advanced: nothing new → nothing re-fetched.
+    fake.requests.clear()
+    mirror.board('b1')
+    assert fake.requests == ['boards/b1/actions']
+
+
+def test_deleted_archived_and_new_cards(trello):
+    fake, client = trello
+    mirror = TrelloMirror(client, poll_seconds=0)
+    mirror.board('b1')
+    del fake.cards['c2']
+    fake.act('deleteCard', card={'id': 'c2'})
+    fake.cards['c3'] = {'id': 'c3', 'name': 'Hire SDR', 'idList': 'l1', 'idBoard': 'b1', 'pos': 3, 'closed': False}
+    fake.act('createCard', card={'id': 'c3'})
+    fake.cards['c1']['closed'] = True
+    fake.act('updateCard', card={'id': 'c1'})
+    fake.lists['l3'] = {'id': 'l3', 'name': 'Blocked', 'pos': 3}
+    fake.act('createList', list={'id': 'l3'})
+
+    cards, lists = mirror.board('b1')
+    assert _names(cards) == ['Hire SDR']
+    assert [l['name'] for l in lists] == ['To Do', 'Done', 'Blocked']
+
+
+def test_webhook_applies_immediately(trello):
+    fake, client = trello
+    mirror = TrelloMirror(client, poll_seconds=3600)
+    mirror.board('b1')
+    fake.cards['c1']['name'] = 'Call Acme (rescheduled)'
+    action = fake.act('updateCard', card={'id': 'c1'})
+
+    assert mirror.apply_webhook({'action': action, 'model': {'id': 'b1'}})
+    assert _names(mirror.board('b1')[0])[0] == 'Call Acme (rescheduled)'
+    assert not mirror.apply_webhook({'action': {'data': {'board': {'id': 'other'}}}})
+
+
+def test_card_details_cached_until_touched(trello):
+    fake, client = trello
+    mirror = TrelloMirror(client, poll_seconds=3600)
+    mirror.board('b1')
+    assert mirror.card_details('c1')['name'] == 'Call Acme'
+    fake.cards['c1']['name'] = 'Renamed'
+    assert mirror.card_details('c1')['name'] == 'Call Acme'
+    mirror.apply_webhook({'action': fake.act('commentCard', card={'id': 'c1'})})
+    assert mirror.card_details('c1')['name'] == 'Renamed'
+
+
+def test_card_details_expire_for_unmirrored_boards(trello):
+    fake, client = trello
+    now = [1000.0]
+    mirror = TrelloMirror(client, poll_seconds=3600, details_ttl=60, clock=lambda: now[0])
+    assert mirror.card_details('c1')['name'] == 'Call Acme'
+    fake.cards['c1']['name'] = 'Renamed'
+    now[0] += 30
+    assert mirror.card_details('c1')['name'] == 'Call Acme'
+    now[0] += 31
+    assert mirror.card_details('c1')['name'] == 'Renamed'
+    assert not mirror.is_mirrored('b1')
+
+
+def test_webhook_signature():
+    body = json.dumps({'action': {}}).encode()
+    url = 'https://example.com/trello/webhook'
+    good = base64.b64encode(hmac.new(b's3cret', body + url.encode(), hashlib.sha1).digest()).decode()
+    assert verify_webhook(body, good, 's3cret', url)
+    assert not verify_webhook(body, good, 'other', url)
+    assert not verify_webhook(body, '', 's3cret', url)
@@ -0,0 +1,85 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from twilio.base.exceptions import TwilioRestException
+
+from tools.twilio_client import TokenBucket, dispatch, status_table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        bucket.acquire()
+    # Two free, then one every half second.
+    assert clock.now == 1.5
+
+
+def test_dispatch_bounds_in_flight_and_keeps_order():
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def send(to):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+        if to == "+3":
+            raise TwilioRestException(400, "/Messages", "Invalid 'To' number", code=21211)
+        return SimpleNamespace(sid=f"SM{to}", status="queued")
+
+    recipients = ["+1", " +2", "+3", "+4", "+5", "+1", ""]
+    results = dispatch(send, recipients, TokenBucket(rate=0), concurrency=2)
+    assert [r.recipient for r in results] == ["+1", "+2", "+3", "+4", "+5"]
+    assert state["peak"] <= 2
+    assert results[0].sid == "SM+1" and results[0].status == "queued"
+    assert results[2].sid is None and results[2].status == "failed"
+    assert "Invalid 'To' number" in results[2].error
+
+
+def test_dispatch_retries_rate_limits_with_backoff():
+    attempts = []
+    sleeps = []
+
+    def send(to):
+        attempts.append(to)
+        if len(attempts) < 3:
+            raise TwilioRestException(429, "/Calls", "Too Many Requests", code=20429)
+        return SimpleNamespace(sid="CA1", status="queued")
+
+    results = dispatch(send, ["+1"], TokenBucket(rate=0), max_retries=3, backoff=0.5,
+                       sleep=sleeps.append)
+    assert results[0].sid == "CA1"
+    assert sleeps == [0.5, 1.0]
+
+
+def test_dispatch_gives_up_after_max_retries():
+    def send(to):
+        raise TwilioRestException(429, "/Calls", "Too Many Requests")
+
+    results = dispatch(send, ["+1"], TokenBucket(rate=0), max_retries=1, sleep=lambda s: None)
+    assert results[0].status == "failed"
+
+
+def test_status_table():
+    results = dispatch(lambda to: SimpleNamespace(sid="SM1", status="sent"), ["+977"],
+                       TokenBucket(rate=0))
+    table = status_table(results)
+    assert "1/1 dispatched" in table
+    assert "+977" in table and "SM1" in table
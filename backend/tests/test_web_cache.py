@@ -0,0 +1,92 @@
+import pytest
+
+from tools.web_cache import WebCache, normalize_url, normalize_args
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return WebCache(str(tmp_path / "web.db"), max_bytes=10_000,
+                    ttls={"serper": 60, "website": 600}, clock=clock)
+
+
+def test_url_normalization():
+    assert normalize_url("HTTPS://Example.com/Pricing/?utm_source=x&b=2&a=1#plans") == \
+        "https://example.com/Pricing?a=1&b=2"
+    assert normalize_url("example.com/") == "https://example.com"
+
+
+def test_query_normalization():
+    assert normalize_args((), {"search_query": "  Acme   PRICING "}) == \
+        normalize_args((), {"search_query": "acme pricing"})
+    assert normalize_args((), {"search_query": "q", "website_url": "https://a.com/x/"}) == \
+        normalize_args((), {"search_query": "Q", "website_url": "a.com/x?utm_medium=e"})
+
+
+def test_hit_miss_and_ttl_per_tool(cache, clock):
+    calls = []
+
+    def search(search_query):
+        calls.append(search_query)
+        return {"organic": [{"title": search_query}]}
+
+    cached = cache.wrap("serper", search)
+    assert cached(search_query="Acme") == {"organic": [{"title": "Acme"}]}
+    assert cached(search_query=" acme ") == {"organic": [{"title": "Acme"}]}
+    assert calls == ["Acme"]
+    clock.now += 61
+    cached(search_query="acme")
+    assert len(calls) == 2
+    stats = cache.stats()["tools"]["serper"]
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+def test_errors_and_unserializable_results_are_not_cached(cache):
+    results = iter(["Error: rate limited", "ok page"])
+    cached = cache.wrap("website", lambda search_query, website_url: next(results))
+    assert cached(search_query="q", website_url="a.com").startswith("Error")
+    assert cached(search_query="q", website_url="a.com") == "ok page"
+    assert cache.put("website", "k", object()) is False
+
+
+def test_lru_eviction_by_total_size(tmp_path, clock):
+    cache = WebCache(str(tmp_path / "w.db"), max_bytes=2500, ttls={"serper": 60}, clock=clock)
+    for i in range(3):
+        clock.now += 1
+        cache.put("serper", f"k{i}", "x" * 1000)
+    clock.now += 1
+    assert cache.get("serper", "k0")[0] is False      # oldest evicted
+    assert cache.stats()["bytes"] <= 2500
+    assert cache.stats()["tools"]["serper"]["evictions"] == 1
+
+
+def test_lru_touch_protects_recent_entries(tmp_path, clock):
+    cache = WebCache(str(tmp_path / "w.db"), max_bytes=2500, ttls={"serper": 60}, clock=clock)
+    cache.put("serper", "a", "x" * 1000)
+    clock.now += 1
+    cache.put("serper", "b", "x" * 1000)
+    clock.now += 1
+    cache.get("serper", "a")
+    clock.now += 1
+    cache.put("serper", "c", "x" * 1000)
+    assert cache.get("serper", "a")[0] and not cache.get("serper", "b")[0]
+
+
+def test_persists_across_instances(tmp_path, clock):
+    path = str(tmp_path / "p.db")
+    WebCache(path, 10_000, {"serper": 60}, clock=clock).put("serper", "k", [1, 2])
+    again = WebCache(path, 10_000, {"serper": 60}, clock=clock)
+    assert again.get("serper", "k") == (True, [1, 2])
+    assert again.stats()["bytes"] > 0
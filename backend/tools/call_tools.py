@@ -10,6 +10,8 @@ Voice calls — Twilio:
 Meeting scheduling (email-based, no Google Calendar OAuth needed):
   Generates a unique Google Meet link and sends HTML email via Gmail.
   Requires Gmail tool to be configured (GMAIL_CREDENTIALS_FILE / GMAIL_TOKEN_FILE).
+
+The Twilio client, call-rate limiting and bulk dispatch live in tools/twilio_client.py.
 """
 
 import os
@@ -19,19 +21,50 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from tools.twilio_client import (
+    twilio, dispatch, status_table, CALL_BUCKET, BULK_CONCURRENCY, MAX_RETRIES,
+)
+
 
 # ── Shared helpers ────────────────────────────────────────────
 
 
 def _twilio_client():
-    sid = os.getenv("TWILIO_ACCOUNT_SID", "")
-    token = os.getenv("TWILIO_AUTH_TOKEN", "")
-    if not sid or not token:
+    return twilio()
+
+
+def _from_phone() -> str:
+    from_number = os.getenv("TWILIO_PHONE_FROM", "")
+    if not from_number:
         raise EnvironmentError(
-            "TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set in .env"
+            "TWILIO_PHONE_FROM must be set in .env — this is your Twilio "
+            "voice-capable phone number (not the WhatsApp sandbox number)."
         )
-    from twilio.rest import Client
-    return Client(sid, token)
+    return from_number
+
+
+def _say(spoken: str) -> str:
+    """Inline TwiML — no external URL needed."""
+    return (
+        '<Response>'
+        '<Say voice="Polly.Amy" language="en-GB">'
+        f'{spoken}'
+        '</Say>'
+        '</Response>'
+    )
+
+
+def _alert_message(task_title: str, urgency: str) -> str:
+    prefix = (
+        "Urgent notice from Engram."
+        if urgency == "urgent"
+        else "Hello, this is Engram, your AI operations assistant."
+    )
+    return (
+        f"{prefix} "
+        f"You have a task that requires immediate attention: {task_title}. "
+        f"Please review it on your Trello board as soon as possible. Thank you."
+    )
 
 
 def _generate_meet_link() -> str:
@@ -74,29 +107,15 @@ class TwilioVoiceCallTool(BaseTool):
 
     def _run(self, to: str, message: str = "") -> str:
         try:
-            from_number = os.getenv("TWILIO_PHONE_FROM", "")
-            if not from_number:
-                raise EnvironmentError(
-                    "TWILIO_PHONE_FROM must be set in .env — this is your Twilio "
-                    "voice-capable phone number (not the WhatsApp sandbox number)."
-                )
+            from_number = _from_phone()
 
             spoken = message or (
                 "Hello, this is Engram. Your team has flagged a task that requires "
                 "your attention. Please check your Trello board. Goodbye."
             )
 
-            # Inline TwiML — no external URL needed
-            twiml = (
-                '<Response>'
-                '<Say voice="Polly.Amy" language="en-GB">'
-                f'{spoken}'
-                '</Say>'
-                '</Response>'
-            )
-
             client = _twilio_client()
-            call = client.calls.create(to=to, from_=from_number, twiml=twiml)
+            call = client.calls.create(to=to, from_=from_number, twiml=_say(spoken))
             return (
                 f"✅ Voice call placed → {to}\n"
                 f"Call SID: {call.sid}\n"
@@ -214,15 +233,50 @@ class TwilioTaskAlertCallTool(BaseTool):
     args_schema: Type[BaseModel] = _AlertInput
 
     def _run(self, to: str, task_title: str, urgency: str = "normal") -> str:
-        prefix = (
-            "Urgent notice from Engram."
-            if urgency == "urgent"
-            else "Hello, this is Engram, your AI operations assistant."
-        )
-        message = (
-            f"{prefix} "
-            f"You have a task that requires immediate attention: {task_title}. "
-            f"Please review it on your Trello board as soon as possible. Thank you."
-        )
         tool = TwilioVoiceCallTool()
-        return tool._run(to=to, message=message)
+        return tool._run(to=to, message=_alert_message(task_title, urgency))
+
+
+# ── 4. Bulk Voice Alert ───────────────────────────────────────
+
+
+class _BulkAlertInput(BaseModel):
+    recipients: str = Field(
+        ...,
+        description="Comma-separated phone numbers in E.164 format, e.g. '+9779820742195, +14155551234'.",
+    )
+    task_title: str = Field(..., description="Task or card title to mention in every call.")
+    urgency: str = Field(
+        default="normal",
+        description="'normal' or 'urgent' — affects the opening of the message.",
+    )
+
+
+class TwilioBulkTaskAlertCallTool(BaseTool):
+    name: str = "twilio_bulk_task_alert_call"
+    description: str = (
+        "Place the same short voice alert call about a task to several people at once. "
+        "Use this to escalate to a whole team instead of calling twilio_task_alert_call per person. "
+        "Returns a per-recipient status table."
+    )
+    args_schema: Type[BaseModel] = _BulkAlertInput
+
+    def _run(self, recipients: str, task_title: str, urgency: str = "normal") -> str:
+        try:
+            from_number = _from_phone()
+            client = _twilio_client()
+            twiml = _say(_alert_message(task_title, urgency))
+            results = dispatch(
+                lambda to: client.calls.create(to=to, from_=from_number, twiml=twiml),
+                recipients.split(","),
+                CALL_BUCKET,
+                concurrency=BULK_CONCURRENCY,
+                max_retries=MAX_RETRIES,
+            )
+            if not results:
+                return "No recipients given."
+            return status_table(results)
+        except EnvironmentError as e:
+            return f"[Voice call not configured] {e}"
+        except Exception as e:
+            return f"[Voice call error] {e}"
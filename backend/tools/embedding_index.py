@@ -0,0 +1,396 @@
+"""
+Persistent embedding index for website search.
+──────────────────────────────────────────────
+crewai_tools' WebsiteSearchTool chunks and embeds a site on first use in
+every new EngramAgents, i.e. once per request. EMBEDDING_INDEX keeps page
+chunks and their vectors in SQLite instead, so a page is embedded once and
+reused by every agent, request and restart:
+
+  • pages are keyed by normalized URL and remembered with the sha256 of
+    their text (plus ETag / Last-Modified for conditional re-fetches);
+    an unchanged page is never re-embedded
+  • vectors are keyed by the sha256 of the chunk text, so when a page
+    changes only its new or edited chunks are embedded — the rest are
+    reused, even across pages that share boilerplate
+  • evict() drops pages not used for EMBEDDING_INDEX_MAX_AGE_DAYS, then the
+    least recently used ones beyond EMBEDDING_INDEX_MAX_PAGES, then vectors
+    no page references any more
+
+search_website() fetches the URL the agent gave — the normalized form is
+only the index key — conditionally (If-None-Match / If-Modified-Since), so
+a 304 or an unchanged body costs no embedding calls, and runs evict() after
+a page is (re)indexed. Only text responses (text/*, XHTML, XML, JSON) are
+indexed, and at most WEBSITE_MAX_BYTES of each body is read.
+tools/website_search.py wraps it as the agents' "Search in a specific
+website" tool.
+
+Env vars:
+  EMBEDDING_INDEX_DB             — SQLite file (default: backend/embedding_index.db)
+  EMBEDDING_MODEL                — OpenAI embedding model  (default text-embedding-3-small)
+  EMBEDDING_INDEX_MAX_PAGES      — pages kept              (default 2000)
+  EMBEDDING_INDEX_MAX_AGE_DAYS   — unused pages kept for   (default 30)
+  EMBEDDING_CHUNK_CHARS          — characters per chunk    (default 1500)
+  WEBSITE_FETCH_TIMEOUT          — page fetch timeout, s   (default 20)
+  WEBSITE_MAX_BYTES              — body bytes read per page (default 2000000)
+  WEBSITE_SEARCH_RESULTS         — chunks per search       (default 4)
+"""
+
+import os
+import math
+import time
+import hashlib
+import sqlite3
+import threading
+from array import array
+from html.parser import HTMLParser
+from typing import Callable
+
+import httpx
+
+from tools.web_cache import normalize_url
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_EMBED_BATCH = 96
+
+_TEXT_TYPES = ("text/", "application/xhtml+xml", "application/xml", "application/json")
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+_BLOCK_TAGS = {"p", "div", "section", "article", "li", "br", "tr", "h1", "h2", "h3",
+               "h4", "h5", "h6", "header", "footer", "main", "table", "ul", "ol"}
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    indexed_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    url TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    chunk_hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (url, idx)
+);
+CREATE TABLE IF NOT EXISTS vectors (
+    chunk_hash TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_by_hash ON chunks (chunk_hash);
+CREATE INDEX IF NOT EXISTS pages_by_last_used ON pages (last_used);
+"""
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def chunk_text(text: str, size: int = 1500, overlap: int = 150) -> list:
+    """Split on paragraph/sentence boundaries into ~size-character chunks with some overlap."""
+    text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    chunks, start = [], 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = max(text.rfind("\n", start + size // 2, end), text.rfind(". ", start + size // 2, end))
+            if cut > start:
+                end = cut + 1
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [c for c in chunks if c]
+
+
+def _pack(vector: list) -> bytes:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return array("f", (v / norm for v in vector)).tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec
+
+
+def openai_embed(texts: list) -> list:
+    """Embeddings from the OpenAI API over the shared LLM HTTP client."""
+    import llm
+
+    resp = llm.http_client().post(
+        f"{llm.base_url()}/embeddings",
+        headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"},
+        json={"model": os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"), "input": texts},
+    )
+    resp.raise_for_status()
+    data = sorted(resp.json()["data"], key=lambda d: d["index"])
+    return [d["embedding"] for d in data]
+
+
+class EmbeddingIndex:
+    def __init__(
+        self,
+        db_path: str,
+        embed: Callable[[list], list] = openai_embed,
+        model: str = "text-embedding-3-small",
+        max_pages: int = 2000,
+        max_age_days: float = 30.0,
+        chunk_chars: int = 1500,
+        clock=time.time,
+    ):
+        self.embed = embed
+        self.model = model
+        self.max_pages = max_pages
+        self.max_age_days = max_age_days
+        self.chunk_chars = chunk_chars
+        self._clock = clock
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self.stats = {"pages_indexed": 0, "pages_unchanged": 0, "chunks_embedded": 0,
+                      "chunks_reused": 0, "searches": 0, "evicted_pages": 0}
+
+    # ── Pages ────────────────────────────────────────────────
+
+    def page(self, url: str) -> dict | None:
+        """Stored validators for a page: {content_hash, etag, last_modified} or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, etag, last_modified FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(zip(("content_hash", "etag", "last_modified"), row)) if row else None
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE pages SET last_used = ? WHERE url = ?", (self._clock(), url))
+            self._db.commit()
+
+    def ensure(self, url: str, text: str, etag: str | None = None, last_modified: str | None = None) -> int:
+        """
+        Index `text` as the current content of `url`. Returns how many chunks
+        were embedded (0 when the page is unchanged or every chunk was known).
+        """
+        content_hash = _sha(text)
+        known = self.page(url)
+        if known and known["content_hash"] == content_hash:
+            with self._lock:
+                self._db.execute(
+                    "UPDATE pages SET last_used = ?, etag = COALESCE(?, etag),"
+                    " last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                    (self._clock(), etag, last_modified, url),
+                )
+                self._db.commit()
+            self.stats["pages_unchanged"] += 1
+            return 0
+
+        chunks = chunk_text(text, self.chunk_chars, self.chunk_chars // 10)
+        hashes = [_sha(c) for c in chunks]
+        with self._lock:
+            have = {
+                h for (h,) in self._db.execute(
+                    f"SELECT chunk_hash FROM vectors WHERE model = ? AND chunk_hash IN "
+                    f"({','.join('?' * len(hashes))})", (self.model, *hashes),
+                )
+            } if hashes else set()
+        missing = list(dict.fromkeys(
+            (h, c) for h, c in zip(hashes, chunks) if h not in have
+        ))
+        vectors = []
+        for start in range(0, len(missing), _EMBED_BATCH):
+            batch = missing[start:start + _EMBED_BATCH]
+            vectors.extend(self.embed([c for _, c in batch]))
+
+        now = self._clock()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors (chunk_hash, model, vector) VALUES (?, ?, ?)",
+                [(h, self.model, _pack(v)) for (h, _), v in zip(missing, vectors)],
+            )
+            self._db.execute("DELETE FROM chunks WHERE url = ?", (url,))
+            self._db.executemany(
+                "INSERT INTO chunks (url, idx, chunk_hash, text) VALUES (?, ?, ?, ?)",
+                [(url, i, h, c) for i, (h, c) in enumerate(zip(hashes, chunks))],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, etag, last_modified, indexed_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (url, content_hash, etag, last_modified, now, now),
+            )
+            self._db.commit()
+        self.stats["pages_indexed"] += 1
+        self.stats["chunks_embedded"] += len(missing)
+        self.stats["chunks_reused"] += len(chunks) - len(missing)
+        return len(missing)
+
+    # ── Search ───────────────────────────────────────────────
+
+    def search(self, url: str, query: str, k: int = 4) -> list:
+        """[(score, chunk text)] of the page's chunks most similar to `query`."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT c.text, v.vector FROM chunks c JOIN vectors v"
+                " ON v.chunk_hash = c.chunk_hash AND v.model = ?"
+                " WHERE c.url = ? ORDER BY c.idx",
+                (self.model, url),
+            ).fetchall()
+        if not rows:
+            return []
+        q = _unpack(_pack(self.embed([query])[0]))
+        scored = [(sum(a * b for a, b in zip(q, _unpack(blob))), text) for text, blob in rows]
+        scored.sort(key=lambda s: s[0], reverse=True)
+        self.touch(url)
+        self.stats["searches"] += 1
+        return scored[:k]
+
+    # ── Eviction ─────────────────────────────────────────────
+
+    def evict(self) -> int:
+        """Apply the age and size limits. Returns pages removed."""
+        cutoff = self._clock() - self.max_age_days * 86400
+        with self._lock:
+            stale = [u for (u,) in self._db.execute(
+                "SELECT url FROM pages WHERE last_used < ?", (cutoff,)
+            )]
+            overflow = [u for (u,) in self._db.execute(
+                "SELECT url FROM pages WHERE last_used >= ? ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                (cutoff, self.max_pages),
+            )]
+            doomed = stale + overflow
+            for url in doomed:
+                self._db.execute("DELETE FROM chunks WHERE url = ?", (url,))
+                self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            if doomed:
+                self._db.execute(
+                    "DELETE FROM vectors WHERE chunk_hash NOT IN (SELECT chunk_hash FROM chunks)"
+                )
+            self._db.commit()
+        self.stats["evicted_pages"] += len(doomed)
+        return len(doomed)
+
+    def size(self) -> dict:
+        with self._lock:
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            vectors = self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        return {"pages": pages, "vectors": vectors}
+
+
+EMBEDDING_INDEX = EmbeddingIndex(
+    db_path=os.getenv("EMBEDDING_INDEX_DB", os.path.join(_BACKEND_DIR, "embedding_index.db")),
+    model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+    max_pages=int(os.getenv("EMBEDDING_INDEX_MAX_PAGES", "2000")),
+    max_age_days=float(os.getenv("EMBEDDING_INDEX_MAX_AGE_DAYS", "30")),
+    chunk_chars=int(os.getenv("EMBEDDING_CHUNK_CHARS", "1500")),
+)
+
+
+# ── Fetching ─────────────────────────────────────────────────
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts: list = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _http() -> httpx.Client:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                timeout=float(os.getenv("WEBSITE_FETCH_TIMEOUT", "20")),
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; NexOS research agent)"},
+            )
+        return _client
+
+
+def _read_capped(resp: httpx.Response, max_bytes: int) -> bytes:
+    """The body up to `max_bytes`; the rest of the page is never downloaded."""
+    body = bytearray()
+    for data in resp.iter_bytes():
+        body += data
+        if len(body) >= max_bytes:
+            break
+    return bytes(body[:max_bytes])
+
+
+def refresh_page(url: str, index=None, client: httpx.Client | None = None,
+                 key: str | None = None, max_bytes: int | None = None) -> int:
+    """
+    Fetch `url` (conditionally) and bring the index entry `key` (default: the
+    normalized URL) up to date. Returns chunks embedded. Raises ValueError
+    for a non-text response.
+    """
+    index = index or EMBEDDING_INDEX
+    client = client or _http()
+    key = key or normalize_url(url)
+    max_bytes = max_bytes or int(os.getenv("WEBSITE_MAX_BYTES", "2000000"))
+    known = index.page(key)
+    headers = {}
+    if known and known["etag"]:
+        headers["If-None-Match"] = known["etag"]
+    if known and known["last_modified"]:
+        headers["If-Modified-Since"] = known["last_modified"]
+    with client.stream("GET", url, headers=headers) as resp:
+        if resp.status_code == 304 and known:
+            index.touch(key)
+            return 0
+        resp.raise_for_status()
+        content_type = resp.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and not content_type.startswith(_TEXT_TYPES):
+            raise ValueError(f"{url} is {content_type}, not a text page")
+        body = _read_capped(resp, max_bytes)
+        etag, last_modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+        text = body.decode(resp.charset_encoding or "utf-8", errors="replace")
+    if "html" in content_type or not content_type:
+        text = html_to_text(text)
+    embedded = index.ensure(key, text, etag=etag, last_modified=last_modified)
+    if embedded:
+        index.evict()
+    return embedded
+
+
+def search_website(url: str, query: str, k: int | None = None, index=None,
+                   client: httpx.Client | None = None) -> str:
+    index = index or EMBEDDING_INDEX
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    key = normalize_url(url)
+    refresh_page(url, index=index, client=client, key=key)
+    hits = index.search(key, query, k or int(os.getenv("WEBSITE_SEARCH_RESULTS", "4")))
+    if not hits:
+        return f"No content found on {url}."
+    return "Relevant Content:\n" + "\n\n".join(text for _, text in hits)
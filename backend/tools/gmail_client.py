@@ -0,0 +1,166 @@
+"""
+Process-wide Gmail API client.
+──────────────────────────────
+Building the Gmail service used to cost a token.json read, a possible token
+refresh + file rewrite, and a discovery-client build on every tool call.
+GMAIL keeps all of that in memory instead:
+
+  • credentials are loaded once and refreshed proactively (before they
+    expire, under a lock, so concurrent crew threads refresh only once);
+    refreshed tokens are written back atomically
+  • each thread gets its own service object — httplib2 connections are not
+    thread-safe — built once and reused for that thread's lifetime
+  • fetch_messages() turns N `messages.get` calls into one batch HTTP request
+
+    service = GMAIL.service()
+    msgs = GMAIL.fetch_messages(service, ids, format="metadata",
+                                metadataHeaders=["From", "Subject", "Date"])
+
+Env vars:
+  GMAIL_CREDENTIALS_PATH  path to credentials.json  (default: backend/credentials.json)
+  GMAIL_TOKEN_PATH        path to token.json         (default: backend/token.json)
+  GMAIL_REFRESH_MARGIN    refresh this many seconds before expiry (default 300)
+"""
+
+import os
+import tempfile
+import threading
+import datetime as _dt
+
+SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
+
+# Use absolute paths so the backend works regardless of cwd
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CREDS_PATH = lambda: os.getenv("GMAIL_CREDENTIALS_PATH", os.path.join(_BACKEND_DIR, "credentials.json"))
+_TOKEN_PATH = lambda: os.getenv("GMAIL_TOKEN_PATH", os.path.join(_BACKEND_DIR, "token.json"))
+
+# Gmail accepts up to 100 calls per batch; Google recommends staying well below.
+BATCH_SIZE = 50
+
+
+def _write_token(path: str, data: str) -> None:
+    """Replace token.json atomically, readable by the owner only."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".token.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class GmailClient:
+    def __init__(self, refresh_margin: float = 300.0):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._creds = None
+        self._local = threading.local()
+        self.refreshes = 0
+
+    # ── Credentials ──────────────────────────────────────────
+
+    def _needs_refresh(self, creds) -> bool:
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime.
+        now = _dt.datetime.now(_dt.timezone.utc).replace(tzinfo=None)
+        return (creds.expiry - now).total_seconds() < self.refresh_margin
+
+    def credentials(self):
+        """Valid credentials, refreshed ahead of expiry. Thread-safe."""
+        creds = self._creds
+        if creds is not None and not self._needs_refresh(creds):
+            return creds
+        with self._lock:
+            creds = self._creds
+            if creds is None:
+                creds = self._load()
+            elif self._needs_refresh(creds):
+                self._refresh(creds)
+            self._creds = creds
+            return creds
+
+    def _load(self):
+        """First use: token.json, refreshing or running the consent flow if needed."""
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        token_path = _TOKEN_PATH()
+        creds_path = _CREDS_PATH()
+        creds = None
+        if os.path.exists(token_path):
+            creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+
+        if creds and creds.refresh_token:
+            if self._needs_refresh(creds):
+                self._refresh(creds)
+            return creds
+
+        if not os.path.exists(creds_path):
+            raise FileNotFoundError(
+                f"Gmail credentials not found at '{creds_path}'. "
+                "Download credentials.json from Google Cloud Console and "
+                "place it in Crew/backend/."
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(creds_path, SCOPES)
+        creds = flow.run_local_server(port=0)
+        _write_token(token_path, creds.to_json())
+        return creds
+
+    def _refresh(self, creds) -> None:
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+        self.refreshes += 1
+        _write_token(_TOKEN_PATH(), creds.to_json())
+
+    # ── Service ──────────────────────────────────────────────
+
+    def service(self):
+        """This thread's Gmail service, built once and reused."""
+        creds = self.credentials()
+        service = getattr(self._local, "service", None)
+        if service is None or self._local.creds is not creds:
+            from googleapiclient.discovery import build
+
+            service = build("gmail", "v1", credentials=creds, cache_discovery=False)
+            self._local.service = service
+            self._local.creds = creds
+        return service
+
+    def reset(self) -> None:
+        """Forget cached credentials (e.g. after token.json was replaced)."""
+        with self._lock:
+            self._creds = None
+
+    # ── Batched reads ────────────────────────────────────────
+
+    def fetch_messages(self, service, ids: list, **get_kwargs) -> list:
+        """
+        messages.get for every id via batch HTTP — one round trip per
+        BATCH_SIZE ids instead of one per message. Returns results in `ids`
+        order; a message that failed (e.g. deleted meanwhile) is None.
+        """
+        results: dict = {}
+
+        def collect(request_id, response, exception):
+            results[request_id] = None if exception is not None else response
+
+        messages = service.users().messages()
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=collect)
+            for msg_id in ids[start:start + BATCH_SIZE]:
+                batch.add(messages.get(userId="me", id=msg_id, **get_kwargs), request_id=msg_id)
+            batch.execute()
+        return [results.get(msg_id) for msg_id in ids]
+
+
+GMAIL = GmailClient(refresh_margin=float(os.getenv("GMAIL_REFRESH_MARGIN", "300")))
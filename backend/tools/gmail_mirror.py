@@ -0,0 +1,361 @@
+"""
+Local Gmail mirror with indexed search.
+───────────────────────────────────────
+Sales and customer-service agents call gmail_read_emails many times per
+conversation, and each call used to be a live Gmail search plus N metadata
+fetches. The mirror keeps message metadata and snippets for the last
+GMAIL_MIRROR_DAYS in SQLite (FTS5 over sender / subject) and answers the
+common query shapes locally:
+
+    from:…  subject:…  is:unread / is:read / is:starred / is:important
+    in:inbox / in:sent  after:/before: YYYY/MM/DD  newer_than:/older_than: Nd|Nm|Ny
+
+Anything else (free text, OR, negation, labels, attachments…) returns None
+and the tool falls back to the live API. So does a query whose results might
+reach back past what the mirror holds.
+
+Sync: one full listing, then incremental updates through the Gmail
+`history.list` API from the stored historyId — a background thread every
+GMAIL_MIRROR_SYNC_SECONDS, and inline before a search if the last sync is
+older than that. An expired historyId triggers a fresh full sync.
+
+Env vars:
+  GMAIL_MIRROR_DB            — SQLite file (default: in-memory, per process)
+  GMAIL_MIRROR_DAYS          — days of mail kept locally            (default 30)
+  GMAIL_MIRROR_MAX           — max messages in the initial listing  (default 2000)
+  GMAIL_MIRROR_SYNC_SECONDS  — background sync interval; 0 = mirror off (default 60)
+"""
+
+import os
+import re
+import time
+import logging
+import sqlite3
+import threading
+import datetime as _dt
+
+from tools.gmail_client import GMAIL, GmailClient, _TOKEN_PATH
+
+logger = logging.getLogger(__name__)
+
+_METADATA = {"format": "metadata", "metadataHeaders": ["From", "Subject", "Date"]}
+
+# Gmail search operator → label that must be present (True) or absent (False).
+_LABEL_OPERATORS = {
+    "is:unread":    ("UNREAD", True),
+    "is:read":      ("UNREAD", False),
+    "is:starred":   ("STARRED", True),
+    "is:important": ("IMPORTANT", True),
+    "is:inbox":     ("INBOX", True),
+    "in:inbox":     ("INBOX", True),
+    "in:sent":      ("SENT", True),
+}
+# Messages carrying these labels are not returned by a default Gmail search.
+_HIDDEN_LABELS = {"TRASH", "SPAM"}
+
+_UNIT_MS = {"h": 3_600_000, "d": 86_400_000, "m": 30 * 86_400_000, "y": 365 * 86_400_000}
+_TOKEN = re.compile(r'(\w+):("[^"]*"|\S+)|("[^"]*"|\S+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY, thread_id TEXT, internal_date INTEGER NOT NULL,
+    sender TEXT, subject TEXT, date TEXT, snippet TEXT, labels TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_date ON messages (internal_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(sender, subject);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _phrase(text: str) -> str:
+    return '"' + text.strip('"').replace('"', '""') + '"'
+
+
+def _date_ms(value: str) -> int | None:
+    if value.isdigit():
+        return int(value) * 1000   # Gmail also accepts epoch seconds
+    try:
+        day = _dt.datetime.strptime(value.replace("-", "/"), "%Y/%m/%d")
+    except ValueError:
+        return None
+    return int(day.timestamp() * 1000)
+
+
+def parse_query(query: str, now_ms: int | None = None) -> dict | None:
+    """
+    Translate a Gmail query into mirror filters, or None if the mirror can't
+    answer it exactly. Result: {fts: [...], labels: [(label, present)],
+    after: ms|None, before: ms|None}.
+    """
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    spec = {"fts": [], "labels": [], "after": None, "before": None}
+    for op, value, bare in _TOKEN.findall(query or ""):
+        if bare:
+            return None
+        op = op.lower()
+        key = f"{op}:{value.lower()}"
+        if key in _LABEL_OPERATORS:
+            spec["labels"].append(_LABEL_OPERATORS[key])
+        elif op in ("from", "subject") and value.strip('"'):
+            column = "sender" if op == "from" else "subject"
+            spec["fts"].append(f"{column} : {_phrase(value)}")
+        elif op in ("after", "before"):
+            ms = _date_ms(value)
+            if ms is None:
+                return None
+            bound = "after" if op == "after" else "before"
+            spec[bound] = ms if spec[bound] is None else (
+                max(spec[bound], ms) if bound == "after" else min(spec[bound], ms)
+            )
+        elif op in ("newer_than", "older_than"):
+            m = re.fullmatch(r"(\d+)([hdmy])", value.lower())
+            if not m:
+                return None
+            ms = now_ms - int(m.group(1)) * _UNIT_MS[m.group(2)]
+            bound = "after" if op == "newer_than" else "before"
+            spec[bound] = ms if spec[bound] is None else (
+                max(spec[bound], ms) if bound == "after" else min(spec[bound], ms)
+            )
+        else:
+            return None
+    return spec
+
+
+def _row(msg: dict) -> tuple:
+    headers = {h["name"]: h["value"] for h in (msg.get("payload") or {}).get("headers", [])}
+    return (
+        msg["id"], msg.get("threadId"), int(msg.get("internalDate", 0)),
+        headers.get("From", ""), headers.get("Subject", ""), headers.get("Date", ""),
+        msg.get("snippet", ""), " ".join(msg.get("labelIds") or []),
+    )
+
+
+def _http_status(exc: Exception) -> int | None:
+    return getattr(getattr(exc, "resp", None), "status", None)
+
+
+class GmailMirror:
+    def __init__(
+        self,
+        client: GmailClient = GMAIL,
+        db_path: str = "",
+        days: int = 30,
+        max_messages: int = 2000,
+        sync_seconds: float = 60.0,
+    ):
+        self.client = client
+        self.days = days
+        self.max_messages = max_messages
+        self.sync_seconds = sync_seconds
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+        self._thread: threading.Thread | None = None
+        self.stats = {"full_syncs": 0, "incremental_syncs": 0, "local_hits": 0, "live_fallbacks": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sync_seconds > 0
+
+    # ── State ────────────────────────────────────────────────
+
+    def _get_state(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, **values) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [(k, str(v)) for k, v in values.items()],
+            )
+            self._db.commit()
+
+    # ── Sync ─────────────────────────────────────────────────
+
+    def sync(self) -> None:
+        """Bring the mirror up to date (full listing first time, then history)."""
+        with self._sync_lock:
+            service = self.client.service()
+            history_id = self._get_state("history_id")
+            if history_id is None:
+                self._full_sync(service)
+            else:
+                try:
+                    self._incremental_sync(service, history_id)
+                except Exception as e:
+                    if _http_status(e) != 404:
+                        raise
+                    # historyId too old — Gmail only keeps about a week of history.
+                    self._full_sync(service)
+            self._synced_at = time.time()
+
+    def _full_sync(self, service) -> None:
+        # Take the history cursor first so nothing that arrives mid-listing is lost.
+        history_id = service.users().getProfile(userId="me").execute()["historyId"]
+        ids: list = []
+        page_token = None
+        while len(ids) < self.max_messages:
+            resp = service.users().messages().list(
+                userId="me", q=f"newer_than:{self.days}d",
+                maxResults=min(500, self.max_messages - len(ids)), pageToken=page_token,
+            ).execute()
+            ids.extend(m["id"] for m in resp.get("messages", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                break
+        messages = [m for m in self.client.fetch_messages(service, ids, **_METADATA) if m]
+
+        now_ms = int(time.time() * 1000)
+        window_start = now_ms - self.days * _UNIT_MS["d"]
+        if page_token and messages:
+            # Hit GMAIL_MIRROR_MAX: we only fully cover back to the oldest message kept.
+            window_start = min(int(m.get("internalDate", now_ms)) for m in messages)
+        with self._lock:
+            self._db.execute("DELETE FROM messages")
+            self._db.execute("DELETE FROM message_fts")
+            self._upsert(messages)
+            self._db.commit()
+        self._set_state(history_id=history_id, window_start=window_start)
+        self.stats["full_syncs"] += 1
+
+    def _incremental_sync(self, service, history_id: str) -> None:
+        changed: list = []
+        deleted: set = set()
+        page_token = None
+        latest = history_id
+        while True:
+            resp = service.users().history().list(
+                userId="me", startHistoryId=history_id, pageToken=page_token,
+                historyTypes=["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"],
+            ).execute()
+            for record in resp.get("history", []):
+                for item in record.get("messagesDeleted", []):
+                    deleted.add(item["message"]["id"])
+                for kind in ("messagesAdded", "labelsAdded", "labelsRemoved"):
+                    for item in record.get(kind, []):
+                        msg_id = item["message"]["id"]
+                        if msg_id not in changed:
+                            changed.append(msg_id)
+            latest = resp.get("historyId", latest)
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                break
+
+        changed = [m for m in changed if m not in deleted]
+        fetched = self.client.fetch_messages(service, changed, **_METADATA) if changed else []
+        with self._lock:
+            # A None result means the message is gone (deleted since the change).
+            for msg_id, msg in zip(changed, fetched):
+                if msg is None:
+                    deleted.add(msg_id)
+            self._delete(deleted)
+            self._upsert([m for m in fetched if m])
+            self._db.commit()
+        self._set_state(history_id=latest)
+        self.stats["incremental_syncs"] += 1
+
+    def _upsert(self, messages: list) -> None:
+        for msg in messages:
+            row = _row(msg)
+            self._delete([row[0]])
+            if set(row[7].split()) & _HIDDEN_LABELS:
+                continue
+            cur = self._db.execute(
+                "INSERT INTO messages (id, thread_id, internal_date, sender, subject, date, snippet, labels)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row,
+            )
+            self._db.execute(
+                "INSERT INTO message_fts (rowid, sender, subject) VALUES (?, ?, ?)",
+                (cur.lastrowid, row[3], row[4]),
+            )
+
+    def _delete(self, ids) -> None:
+        for msg_id in ids:
+            found = self._db.execute("SELECT rowid FROM messages WHERE id = ?", (msg_id,)).fetchone()
+            if found:
+                self._db.execute("DELETE FROM message_fts WHERE rowid = ?", (found[0],))
+                self._db.execute("DELETE FROM messages WHERE rowid = ?", (found[0],))
+
+    # ── Background thread ────────────────────────────────────
+
+    def start(self) -> bool:
+        """Start background syncing if enabled and Gmail is authorised."""
+        if not self.enabled or self._thread is not None or not os.path.exists(_TOKEN_PATH()):
+            return False
+        self._thread = threading.Thread(target=self._loop, name="gmail-mirror", daemon=True)
+        self._thread.start()
+        return True
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.sync()
+            except Exception:
+                logger.warning("Gmail mirror sync failed", exc_info=True)
+            time.sleep(self.sync_seconds)
+
+    # ── Search ───────────────────────────────────────────────
+
+    def search(self, query: str, max_results: int = 5) -> list | None:
+        """
+        Newest-first matches as {id, from, subject, date, snippet}, or None when
+        the live API must answer (unsupported query, or mirror not usable).
+        """
+        if not self.enabled:
+            return None
+        spec = parse_query(query)
+        if spec is None:
+            self.stats["live_fallbacks"] += 1
+            return None
+        if time.time() - self._synced_at > self.sync_seconds:
+            try:
+                self.sync()
+            except Exception:
+                logger.warning("Gmail mirror sync failed; using live search", exc_info=True)
+                self.stats["live_fallbacks"] += 1
+                return None
+
+        sql = "SELECT m.id, m.sender, m.subject, m.date, m.snippet FROM messages m"
+        where, params = [], []
+        if spec["fts"]:
+            sql += " JOIN message_fts f ON f.rowid = m.rowid"
+            where.append("message_fts MATCH ?")
+            params.append(" AND ".join(spec["fts"]))
+        for label, present in spec["labels"]:
+            where.append(("" if present else "NOT ") + "(' ' || m.labels || ' ' LIKE ?)")
+            params.append(f"% {label} %")
+        if spec["after"] is not None:
+            where.append("m.internal_date >= ?")
+            params.append(spec["after"])
+        if spec["before"] is not None:
+            where.append("m.internal_date < ?")
+            params.append(spec["before"])
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY m.internal_date DESC LIMIT ?"
+        params.append(max_results)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        # Fewer hits than asked for: older matches may exist beyond the mirror.
+        window_start = int(self._get_state("window_start") or 0)
+        if len(rows) < max_results and (spec["after"] is None or spec["after"] < window_start):
+            self.stats["live_fallbacks"] += 1
+            return None
+        self.stats["local_hits"] += 1
+        return [
+            {"id": r[0], "from": r[1], "subject": r[2], "date": r[3], "snippet": r[4]}
+            for r in rows
+        ]
+
+
+GMAIL_MIRROR = GmailMirror(
+    db_path=os.getenv("GMAIL_MIRROR_DB", ""),
+    days=int(os.getenv("GMAIL_MIRROR_DAYS", "30")),
+    max_messages=int(os.getenv("GMAIL_MIRROR_MAX", "2000")),
+    sync_seconds=float(os.getenv("GMAIL_MIRROR_SYNC_SECONDS", "60")),
+)
@@ -12,11 +12,13 @@ Required env vars (optional — fall back to defaults below):
   GMAIL_CREDENTIALS_PATH  path to credentials.json  (default: credentials.json)
   GMAIL_TOKEN_PATH        path to token.json         (default: token.json)
 
+Credentials and the API client are cached in tools/gmail_client.py;
+common read queries are answered from the local mirror in tools/gmail_mirror.py.
+
 Gmail API OAuth Scopes used:
   https://www.googleapis.com/auth/gmail.modify
 """
 
-import os
 import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -24,44 +26,13 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
-SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
-
-# Use absolute paths so the backend works regardless of cwd
-_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-_CREDS_PATH = lambda: os.getenv("GMAIL_CREDENTIALS_PATH", os.path.join(_BACKEND_DIR, "credentials.json"))
-_TOKEN_PATH = lambda: os.getenv("GMAIL_TOKEN_PATH", os.path.join(_BACKEND_DIR, "token.json"))
+from tools.gmail_client import GMAIL
+from tools.gmail_mirror import GMAIL_MIRROR
 
 
 def _gmail_service():
-    """Build and return an authenticated Gmail API service."""
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-
-    creds = None
-    token_path = _TOKEN_PATH()
-    creds_path = _CREDS_PATH()
-
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists(creds_path):
-                raise FileNotFoundError(
-                    f"Gmail credentials not found at '{creds_path}'. "
-                    "Download credentials.json from Google Cloud Console and "
-                    "place it in Crew/backend/."
-                )
-            flow = InstalledAppFlow.from_client_secrets_file(creds_path, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(token_path, "w") as f:
-            f.write(creds.to_json())
-
-    return build("gmail", "v1", credentials=creds)
+    """This thread's authenticated Gmail service (credentials cached process-wide)."""
+    return GMAIL.service()
 
 
 # ── Send Email ────────────────────────────────────────────────
@@ -158,6 +129,20 @@ class GmailReadTool(BaseTool):
 
     def _run(self, query: str = "is:inbox", max_results: int = 5) -> str:
         try:
+            hits = GMAIL_MIRROR.search(query, max_results)
+            if hits is not None:
+                if not hits:
+                    return f"No emails found for query: '{query}'"
+                output = [f"Emails matching '{query}':"]
+                for h in hits:
+                    output.append(
+                        f"\n  From: {h['from'] or '?'}"
+                        f"\n  Subject: {h['subject'] or '?'}"
+                        f"\n  Date: {h['date'] or '?'}"
+                        f"\n  Preview: {h['snippet'][:150]}"
+                    )
+                return "\n".join(output)
+
             service = _gmail_service()
             results = service.users().messages().list(
                 userId="me", q=query, maxResults=max_results
@@ -167,11 +152,13 @@ class GmailReadTool(BaseTool):
                 return f"No emails found for query: '{query}'"
 
             output = [f"Emails matching '{query}':"]
-            for msg_ref in messages:
-                msg = service.users().messages().get(
-                    userId="me", id=msg_ref["id"], format="metadata",
-                    metadataHeaders=["From", "Subject", "Date"],
-                ).execute()
+            fetched = GMAIL.fetch_messages(
+                service, [m["id"] for m in messages], format="metadata",
+                metadataHeaders=["From", "Subject", "Date"],
+            )
+            for msg in fetched:
+                if msg is None:
+                    continue
                 headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
                 snippet = msg.get("snippet", "")[:150]
                 output.append(
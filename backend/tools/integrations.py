@@ -10,18 +10,183 @@ Enterprise passthrough:
   (Currently returned as metadata for agents.py to apply.)
 
 Tool assignment by agent:
-  orchestrator        → Slack (post, read, list), Notion (search, create)
+  orchestrator        → Slack (post, bulk post, read, list), Notion (search, create),
+                        WhatsApp (send, bulk send)
   sales               → Gmail (send, draft, read), Notion (create, search)
   customer_service    → Gmail (send, draft, read), Notion (create, search)
   technical           → Slack (post), Notion (create, search)
   market_intelligence → (search/web already on agent — no extra integration tools)
   meeting             → Slack (post), Gmail (read), Notion (create, read, search),
                         Trello (list boards, get cards, card details, comment, move),
-                        Call tools (voice call, schedule meeting, task alert)
+                        WhatsApp (send, template, bulk send),
+                        Call tools (voice call, schedule meeting, task alert, bulk task alert)
   hr_ops              → Gmail (send, draft), Notion (create, search)
+
+Read-through cache:
+  Read tools (list/search/read/status) are wrapped by TOOL_CACHE: a result is
+  reused for the tool's TTL when the same normalized arguments come again,
+  within or across conversations. Write tools drop the cached entries of the
+  read tools they affect (see _INVALIDATES). Error strings are never cached.
+
+Env vars:
+  TOOL_CACHE_TTLS         — per-tool TTL overrides, e.g. "slack_list=900,gmail_read=0"
+                            (0 disables caching for that tool)
+  TOOL_CACHE_MAX_ENTRIES  — cached results kept across all tools (default 512)
 """
 
 import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+
+# ── Read-through cache ────────────────────────────────────────
+
+# Seconds a read tool's result stays valid.
+_DEFAULT_TTLS: dict[str, float] = {
+    "slack_list":      600,
+    "slack_read":      30,
+    "gmail_read":      60,
+    "notion_search":   120,
+    "notion_read":     120,
+    "wa_status":       15,
+    "trello_boards":   300,
+    "trello_cards":    30,
+    "trello_card_det": 60,
+}
+
+# Write tool → read tools whose cached results it makes stale.
+_INVALIDATES: dict[str, tuple[str, ...]] = {
+    "slack_post":     ("slack_read",),
+    "slack_bulk":     ("slack_read",),
+    "gmail_send":     ("gmail_read",),
+    "gmail_draft":    ("gmail_read",),
+    "notion_create":  ("notion_search", "notion_read"),
+    "wa_send":        ("wa_status",),
+    "wa_template":    ("wa_status",),
+    "wa_bulk":        ("wa_status",),
+    "trello_comment": ("trello_cards", "trello_card_det"),
+    "trello_move":    ("trello_cards", "trello_card_det"),
+}
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ToolCache:
+    def __init__(self, ttls: dict[str, float], max_entries: int = 512, clock=time.monotonic):
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()   # (tool, args) -> (expires_at, result)
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def _count(self, tool: str, what: str) -> None:
+        c = self._counters.setdefault(tool, {"hits": 0, "misses": 0, "invalidations": 0})
+        c[what] += 1
+
+    @staticmethod
+    def key(tool: str, args: tuple, kwargs: dict) -> tuple:
+        return tool, json.dumps(
+            [_normalize(list(args)), _normalize(kwargs)], sort_keys=True, default=str
+        )
+
+    def wrap(self, tool: str, fn):
+        """Read-through wrapper for a read tool's _run."""
+        ttl = self.ttls.get(tool, 0)
+        if ttl <= 0:
+            return fn
+
+        def cached(*args, **kwargs):
+            key = self.key(tool, args, kwargs)
+            now = self._clock()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._count(tool, "hits")
+                    return entry[1]
+                self._count(tool, "misses")
+            result = fn(*args, **kwargs)
+            if isinstance(result, str) and not result.startswith("["):
+                with self._lock:
+                    self._entries[key] = (self._clock() + ttl, result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return result
+
+        return cached
+
+    def invalidating(self, tool: str, fn):
+        """Wrapper for a write tool's _run that drops the entries it affects."""
+        affected = _INVALIDATES.get(tool, ())
+        if not affected:
+            return fn
+
+        def write(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.invalidate(*affected)
+
+        return write
+
+    def invalidate(self, *tools: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in tools]:
+                del self._entries[key]
+            for tool in tools:
+                self._count(tool, "invalidations")
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes: dict[str, int] = {}
+            for tool, _ in self._entries:
+                sizes[tool] = sizes.get(tool, 0) + 1
+            return {
+                tool: {**counts, "entries": sizes.get(tool, 0), "ttl": self.ttls.get(tool, 0)}
+                for tool, counts in self._counters.items()
+            }
+
+
+def _ttls_from_env() -> dict[str, float]:
+    ttls = dict(_DEFAULT_TTLS)
+    for item in os.getenv("TOOL_CACHE_TTLS", "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            ttls[name.strip()] = float(value)
+    return ttls
+
+
+TOOL_CACHE = ToolCache(_ttls_from_env(), int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "512")))
+
+
+def cache_stats() -> dict:
+    """Per-tool hit/miss/invalidation counters of the integration tool cache."""
+    return TOOL_CACHE.stats()
+
+
+def _wire(name: str, tool) -> None:
+    """Route a tool's _run through the cache (read tools) or invalidation (write tools)."""
+    if name in TOOL_CACHE.ttls:
+        wrapped = TOOL_CACHE.wrap(name, tool._run)
+    else:
+        wrapped = TOOL_CACHE.invalidating(name, tool._run)
+    # BaseTool is a pydantic model; bypass its __setattr__ to shadow the method.
+    object.__setattr__(tool, "_run", wrapped)
+
+
+_wired: set[str] = set()
 
 
 # ── Cached singleton instances (created once per process) ─────
@@ -29,6 +194,7 @@ import os
 _slack_post  = None
 _slack_read  = None
 _slack_list  = None
+_slack_bulk  = None
 _gmail_send  = None
 _gmail_draft = None
 _gmail_read  = None
@@ -38,6 +204,7 @@ _notion_read      = None
 _wa_send          = None
 _wa_template      = None
 _wa_status        = None
+_wa_bulk          = None
 # Trello
 _trello_boards    = None
 _trello_cards     = None
@@ -48,16 +215,17 @@ _trello_move      = None
 _voice_call       = None
 _schedule_meeting = None
 _task_alert       = None
+_bulk_alert       = None
 
 
 def _get(name: str):
     """Lazy-initialise and cache tool instances."""
-    global _slack_post, _slack_read, _slack_list
+    global _slack_post, _slack_read, _slack_list, _slack_bulk
     global _gmail_send, _gmail_draft, _gmail_read
     global _notion_create, _notion_search, _notion_read
-    global _wa_send, _wa_template, _wa_status
+    global _wa_send, _wa_template, _wa_status, _wa_bulk
     global _trello_boards, _trello_cards, _trello_card_det, _trello_comment, _trello_move
-    global _voice_call, _schedule_meeting, _task_alert
+    global _voice_call, _schedule_meeting, _task_alert, _bulk_alert
 
     if name == "slack_post"    and _slack_post    is None:
         from tools.slack_tools import SlackPostMessageTool
@@ -68,6 +236,9 @@ def _get(name: str):
     if name == "slack_list"    and _slack_list    is None:
         from tools.slack_tools import SlackListChannelsTool
         _slack_list    = SlackListChannelsTool()
+    if name == "slack_bulk"    and _slack_bulk    is None:
+        from tools.slack_tools import SlackBulkPostTool
+        _slack_bulk    = SlackBulkPostTool()
     if name == "gmail_send"    and _gmail_send    is None:
         from tools.gmail_tools import GmailSendTool
         _gmail_send    = GmailSendTool()
@@ -95,6 +266,9 @@ def _get(name: str):
     if name == "wa_status"     and _wa_status     is None:
         from tools.whatsapp_tools import WhatsAppStatusTool
         _wa_status     = WhatsAppStatusTool()
+    if name == "wa_bulk"       and _wa_bulk       is None:
+        from tools.whatsapp_tools import WhatsAppBulkSendTool
+        _wa_bulk       = WhatsAppBulkSendTool()
     # Trello
     if name == "trello_boards"   and _trello_boards   is None:
         from tools.trello_tools import TrelloListBoardsTool
@@ -121,11 +295,15 @@ def _get(name: str):
     if name == "task_alert"       and _task_alert       is None:
         from tools.call_tools import TwilioTaskAlertCallTool
         _task_alert       = TwilioTaskAlertCallTool()
+    if name == "bulk_alert"       and _bulk_alert       is None:
+        from tools.call_tools import TwilioBulkTaskAlertCallTool
+        _bulk_alert       = TwilioBulkTaskAlertCallTool()
 
-    return {
+    tool = {
         "slack_post":    _slack_post,
         "slack_read":    _slack_read,
         "slack_list":    _slack_list,
+        "slack_bulk":    _slack_bulk,
         "gmail_send":    _gmail_send,
         "gmail_draft":   _gmail_draft,
         "gmail_read":    _gmail_read,
@@ -135,6 +313,7 @@ def _get(name: str):
         "wa_send":       _wa_send,
         "wa_template":   _wa_template,
         "wa_status":     _wa_status,
+        "wa_bulk":       _wa_bulk,
         # Trello
         "trello_boards":   _trello_boards,
         "trello_cards":    _trello_cards,
@@ -145,16 +324,21 @@ def _get(name: str):
         "voice_call":       _voice_call,
         "schedule_meeting": _schedule_meeting,
         "task_alert":       _task_alert,
+        "bulk_alert":       _bulk_alert,
     }[name]
+    if name not in _wired:
+        _wire(name, tool)
+        _wired.add(name)
+    return tool
 
 
 # ── Tool sets per agent ───────────────────────────────────────
 
 _AGENT_TOOLS: dict[str, list[str]] = {
     "orchestrator": [
-        "slack_post", "slack_read", "slack_list",
+        "slack_post", "slack_bulk", "slack_read", "slack_list",
         "notion_search", "notion_create",
-        "wa_send",
+        "wa_send", "wa_bulk",
     ],
     "sales": [
         "gmail_send", "gmail_draft", "gmail_read",
@@ -176,12 +360,12 @@ _AGENT_TOOLS: dict[str, list[str]] = {
         "slack_post",
         "gmail_read",
         "notion_create", "notion_search", "notion_read",
-        "wa_send", "wa_template",
+        "wa_send", "wa_template", "wa_bulk",
         # Trello integration
         "trello_boards", "trello_cards", "trello_card_det",
         "trello_comment", "trello_move",
         # Call / meeting scheduling
-        "voice_call", "schedule_meeting", "task_alert",
+        "voice_call", "schedule_meeting", "task_alert", "bulk_alert",
     ],
     "hr_ops": [
         "gmail_send", "gmail_draft",
@@ -192,6 +376,21 @@ _AGENT_TOOLS: dict[str, list[str]] = {
 }
 
 
+def warm_tools() -> dict:
+    """
+    Build (and cache-wire) every tool any agent uses — called from the startup
+    warm-up so the first request doesn't pay for it. Returns {tool: error}
+    for tools that failed to construct.
+    """
+    failed: dict = {}
+    for name in dict.fromkeys(n for names in _AGENT_TOOLS.values() for n in names):
+        try:
+            _get(name)
+        except Exception as exc:
+            failed[name] = f"{type(exc).__name__}: {exc}"
+    return failed
+
+
 def get_integration_tools(agent_type: str) -> list:
     """
     Return a list of integration tool instances for the given agent type.
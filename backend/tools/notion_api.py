@@ -0,0 +1,130 @@
+"""
+Shared Notion client and bulk block helpers.
+────────────────────────────────────────────
+  • notion()        — one process-wide notion_client.Client (pooled httpx
+                      connections; the SDK retries 429 / 5xx itself)
+  • create_page()   — create a page with any number of blocks: the first 100
+                      go with pages.create, the rest are appended in
+                      100-block chunks (Notion's per-request limit). Appends
+                      run on a background thread so building the next chunk
+                      overlaps the previous request.
+  • read_blocks()   — every block of a page in document order: children are
+                      paginated with start_cursor, and nested children are
+                      fetched level by level with at most NOTION_READ_FANOUT
+                      requests in flight.
+
+Env vars:
+  NOTION_TOKEN        — Integration secret (ntn_... or secret_...)
+  NOTION_READ_FANOUT  — concurrent child fetches when reading   (default 4)
+  NOTION_READ_DEPTH   — max nesting depth read                  (default 3)
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+CHUNK = 100   # Notion: max children per create/append request
+
+_lock = threading.Lock()
+_client = None
+_client_token = None
+
+
+def notion():
+    """The shared Notion client (rebuilt only if NOTION_TOKEN changes)."""
+    global _client, _client_token
+    token = os.getenv("NOTION_TOKEN")
+    if not token:
+        raise EnvironmentError(
+            "NOTION_TOKEN is not set. "
+            "Add it to Crew/backend/.env to enable Notion integration."
+        )
+    with _lock:
+        if _client is None or _client_token != token:
+            from notion_client import Client
+            _client = Client(auth=token)
+            _client_token = token
+        return _client
+
+
+def _chunks(blocks, size: int = CHUNK):
+    it = iter(blocks)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def create_page(client, parent: dict, properties: dict, blocks) -> dict:
+    """
+    Create a page and append all of `blocks` (any iterable) in order.
+    Returns the created page; page["appended_blocks"] is the total written.
+    """
+    chunks = _chunks(blocks)
+    first = next(chunks, [])
+    page = client.pages.create(parent=parent, properties=properties, children=first)
+    written = len(first)
+
+    # Appends to one parent must stay sequential to keep block order, so the
+    # pipeline is: one request in flight while the next chunk is being built.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-append") as pool:
+        pending = None
+        for chunk in chunks:
+            if pending is not None:
+                pending.result()
+            pending = pool.submit(client.blocks.children.append, block_id=page["id"], children=chunk)
+            written += len(chunk)
+        if pending is not None:
+            pending.result()
+    page["appended_blocks"] = written
+    return page
+
+
+def _list_children(client, block_id: str) -> list:
+    """All children of one block, following start_cursor pagination."""
+    blocks, cursor = [], None
+    while True:
+        kwargs = {"block_id": block_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        resp = client.blocks.children.list(**kwargs)
+        blocks.extend(resp.get("results", []))
+        if not resp.get("has_more"):
+            return blocks
+        cursor = resp.get("next_cursor")
+
+
+def read_blocks(client, block_id: str, max_depth: int = 3, fan_out: int = 4) -> list:
+    """
+    [(depth, block), ...] for a page in document order. Sub-pages and child
+    databases are listed but not descended into.
+    """
+    top = _list_children(client, block_id)
+    children: dict = {}
+    level = top
+    with ThreadPoolExecutor(max_workers=max(1, fan_out), thread_name_prefix="notion-read") as pool:
+        for _ in range(max_depth - 1):
+            parents = [
+                b for b in level
+                if b.get("has_children") and b.get("type") not in ("child_page", "child_database")
+            ]
+            if not parents:
+                break
+            results = pool.map(lambda b: _list_children(client, b["id"]), parents)
+            level = []
+            for parent, kids in zip(parents, results):
+                children[parent["id"]] = kids
+                level.extend(kids)
+
+    ordered: list = []
+
+    def walk(blocks, depth):
+        for b in blocks:
+            ordered.append((depth, b))
+            walk(children.get(b["id"], []), depth + 1)
+
+    walk(top, 0)
+    return ordered
+
+
+READ_FANOUT = int(os.getenv("NOTION_READ_FANOUT", "4"))
+READ_DEPTH = int(os.getenv("NOTION_READ_DEPTH", "3"))
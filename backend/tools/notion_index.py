@@ -0,0 +1,325 @@
+"""
+Local Notion workspace index for notion_search.
+───────────────────────────────────────────────
+Notion's search endpoint is slow and heavily rate-limited, and most agents
+call notion_search. NOTION_INDEX keeps page titles, property values and
+plain-text bodies in SQLite FTS5 and answers searches locally, ranked by
+bm25 (title > properties > body).
+
+  • refresh() walks Notion's search results newest-edit-first and stops at
+    the newest last_edited_time it has already indexed, so only pages edited
+    since the previous refresh are re-read. last_edited_time has minute
+    precision, so a page read within a minute of its edit time is re-read
+    next time in case it was edited again in that minute
+  • refreshes only ever run on a background thread — start() (from the app
+    lifespan) kicks off the first build, and a search on a stale index
+    schedules the next one — and each pass reads at most
+    NOTION_INDEX_PASS_PAGES page bodies or runs NOTION_INDEX_PASS_SECONDS;
+    a capped pass is resumed a few seconds later until the crawl completes
+  • until the first build completes, search() returns None and
+    notion_search uses the live API
+  • NotionCreatePageTool calls upsert() right after writing a page, so new
+    pages are searchable immediately
+
+Env vars:
+  NOTION_SEARCH_MODE            — local | live | auto (default auto: local
+                                  index, live API if the index can't answer)
+  NOTION_INDEX_DB               — SQLite file (default: in-memory, per process)
+  NOTION_INDEX_REFRESH_SECONDS  — index age before a background refresh  (default 300)
+  NOTION_INDEX_BODY_CHARS       — body text kept per page              (default 20000)
+  NOTION_INDEX_PASS_PAGES       — page bodies read per refresh pass    (default 200)
+  NOTION_INDEX_PASS_SECONDS     — time limit per refresh pass          (default 60)
+"""
+
+import os
+import re
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.notion_api import notion, read_blocks, READ_FANOUT
+
+logger = logging.getLogger(__name__)
+
+# last_edited_time is rounded to the minute.
+_EDIT_GRANULARITY = 60.0
+_RESUME_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY, object TEXT NOT NULL, url TEXT, title TEXT,
+    last_edited_time TEXT, read_at REAL NOT NULL DEFAULT 0
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, properties, body);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def page_title(item: dict) -> str:
+    if item.get("object") == "database":
+        rich = item.get("title") or []
+        return "".join(r.get("plain_text", "") for r in rich) or "Database"
+    for prop in (item.get("properties") or {}).values():
+        if prop.get("type") == "title" or "title" in prop:
+            rich = prop.get("title") or []
+            if rich:
+                return "".join(r.get("plain_text", "") for r in rich)
+    return "Untitled"
+
+
+def properties_text(item: dict) -> str:
+    """Plain text of a page's non-title property values."""
+    out = []
+    for name, prop in (item.get("properties") or {}).items():
+        kind = prop.get("type")
+        value = prop.get(kind) if kind else None
+        if kind == "title" or value is None:
+            continue
+        if kind == "rich_text":
+            text = "".join(r.get("plain_text", "") for r in value)
+        elif kind in ("select", "status"):
+            text = value.get("name", "")
+        elif kind == "multi_select":
+            text = " ".join(o.get("name", "") for o in value)
+        elif kind == "people":
+            text = " ".join(p.get("name", "") for p in value)
+        elif kind == "date":
+            text = value.get("start", "")
+        elif kind in ("number", "url", "email", "phone_number", "checkbox"):
+            text = str(value)
+        else:
+            continue
+        if text:
+            out.append(f"{name}: {text}")
+    return "\n".join(out)
+
+
+def blocks_text(blocks: list) -> str:
+    lines = []
+    for _, block in blocks:
+        data = block.get(block.get("type", ""), {})
+        text = "".join(r.get("plain_text", "") for r in data.get("rich_text", []))
+        if text.strip():
+            lines.append(text)
+    return "\n".join(lines)
+
+
+def _edited_ts(edited: str) -> float:
+    try:
+        return datetime.fromisoformat(edited.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _fts_query(query: str) -> str | None:
+    """Free text → FTS5 query: any word (prefix match); bm25 ranks pages matching more."""
+    words = re.findall(r"\w+", query.casefold())
+    if not words:
+        return None
+    return " OR ".join(f'"{w}"*' for w in words)
+
+
+class NotionIndex:
+    def __init__(
+        self,
+        db_path: str = "",
+        refresh_seconds: float = 300.0,
+        body_chars: int = 20000,
+        client_factory=notion,
+        pass_pages: int = 200,
+        pass_seconds: float = 60.0,
+        clock=time.time,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.body_chars = body_chars
+        self.pass_pages = pass_pages
+        self.pass_seconds = pass_seconds
+        self._client_factory = client_factory
+        self._clock = clock
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        try:
+            # Index files created before pages had a read time.
+            self._db.execute("ALTER TABLE pages ADD COLUMN read_at REAL NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refreshed_at = 0.0
+        self._worker: threading.Thread | None = None
+        # A completed crawl (persisted as the watermark) makes the index usable.
+        self.ready = self._watermark() is not None
+        self.stats = {"refreshes": 0, "capped_passes": 0, "pages_indexed": 0, "searches": 0}
+
+    # ── Writes ───────────────────────────────────────────────
+
+    def upsert(self, item: dict, body: str = "") -> None:
+        """Index (or re-index) one page/database object from the Notion API."""
+        title = page_title(item)
+        with self._lock:
+            row = self._db.execute("SELECT rowid FROM pages WHERE id = ?", (item["id"],)).fetchone()
+            if row:
+                self._db.execute("DELETE FROM pages_fts WHERE rowid = ?", (row[0],))
+                self._db.execute("DELETE FROM pages WHERE rowid = ?", (row[0],))
+            cur = self._db.execute(
+                "INSERT INTO pages (id, object, url, title, last_edited_time, read_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (item["id"], item.get("object", "page"), item.get("url", ""), title,
+                 item.get("last_edited_time", ""), self._clock()),
+            )
+            self._db.execute(
+                "INSERT INTO pages_fts (rowid, title, properties, body) VALUES (?, ?, ?, ?)",
+                (cur.lastrowid, title, properties_text(item), body[:self.body_chars]),
+            )
+            self._db.commit()
+            self.stats["pages_indexed"] += 1
+
+    def remove(self, page_id: str) -> None:
+        with self._lock:
+            row = self._db.execute("SELECT rowid FROM pages WHERE id = ?", (page_id,)).fetchone()
+            if row:
+                self._db.execute("DELETE FROM pages_fts WHERE rowid = ?", (row[0],))
+                self._db.execute("DELETE FROM pages WHERE rowid = ?", (row[0],))
+                self._db.commit()
+
+    # ── Refresh ──────────────────────────────────────────────
+
+    def _current(self, item: dict) -> bool:
+        """True if the indexed copy of `item` is known to include its latest edit."""
+        edited = item.get("last_edited_time", "")
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_edited_time, read_at FROM pages WHERE id = ?", (item["id"],)
+            ).fetchone()
+        # Read within the edit's minute → a later edit in that minute looks identical.
+        return bool(row) and row[0] == edited and row[1] >= _edited_ts(edited) + _EDIT_GRANULARITY
+
+    def _watermark(self) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM state WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def refresh(self) -> bool:
+        """
+        One refresh pass: re-index pages edited since the last completed crawl.
+        Returns False if the pass hit its page or time cap (the watermark then
+        stays put, and the next pass skips pages already re-read).
+        """
+        with self._refresh_lock:
+            client = self._client_factory()
+            watermark = self._watermark() or ""
+            deadline = self._clock() + self.pass_seconds
+
+            changed, newest, cursor, capped = [], watermark, None, False
+            while True:
+                kwargs = {"page_size": 100,
+                          "sort": {"direction": "descending", "timestamp": "last_edited_time"}}
+                if cursor:
+                    kwargs["start_cursor"] = cursor
+                resp = client.search(**kwargs)
+                done = False
+                for item in resp.get("results", []):
+                    edited = item.get("last_edited_time", "")
+                    if watermark and edited < watermark:
+                        done = True
+                        break
+                    if item.get("archived") or item.get("in_trash"):
+                        self.remove(item["id"])
+                        continue
+                    newest = max(newest, edited)
+                    if self._current(item):
+                        continue
+                    if len(changed) >= self.pass_pages:
+                        capped = done = True
+                        break
+                    changed.append(item)
+                if done or not resp.get("has_more"):
+                    break
+                if self._clock() >= deadline:
+                    capped = True
+                    break
+                cursor = resp.get("next_cursor")
+
+            def body(item):
+                if item.get("object") != "page":
+                    return ""
+                return blocks_text(read_blocks(client, item["id"], max_depth=2, fan_out=1))
+
+            with ThreadPoolExecutor(max_workers=max(1, READ_FANOUT), thread_name_prefix="notion-index") as pool:
+                for item, text in zip(changed, pool.map(body, changed)):
+                    self.upsert(item, text)
+
+            self.stats["refreshes"] += 1
+            if capped:
+                self.stats["capped_passes"] += 1
+                return False
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES ('watermark', ?)", (newest,)
+                )
+                self._db.commit()
+            self._refreshed_at = self._clock()
+            self.ready = True
+            return True
+
+    def start(self) -> bool:
+        """Build / refresh the index on a background thread. False if one is already running."""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return False
+            self._worker = threading.Thread(target=self._crawl, name="notion-index", daemon=True)
+            self._worker.start()
+            return True
+
+    def _crawl(self) -> None:
+        """Run capped passes until one completes."""
+        while True:
+            try:
+                if self.refresh():
+                    return
+            except Exception as exc:
+                if not isinstance(exc, EnvironmentError):     # EnvironmentError: not configured
+                    logger.warning("Notion index refresh failed", exc_info=True)
+                self._refreshed_at = self._clock()   # retry after refresh_seconds
+                return
+            time.sleep(_RESUME_SECONDS)
+
+    # ── Search ───────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 5) -> list | None:
+        """
+        Ranked [{id, object, title, url}], or None until the first build has
+        completed. Never waits for a refresh: a stale index schedules one in
+        the background and answers from what it has.
+        """
+        if self._clock() - self._refreshed_at > self.refresh_seconds:
+            self.start()
+        if not self.ready:
+            return None
+        match = _fts_query(query)
+        if match is None:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT p.id, p.object, p.title, p.url FROM pages_fts f"
+                " JOIN pages p ON p.rowid = f.rowid"
+                " WHERE pages_fts MATCH ?"
+                " ORDER BY bm25(pages_fts, 10.0, 3.0, 1.0) LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        self.stats["searches"] += 1
+        return [{"id": r[0], "object": r[1], "title": r[2], "url": r[3]} for r in rows]
+
+
+SEARCH_MODE = os.getenv("NOTION_SEARCH_MODE", "auto").strip().lower()
+
+NOTION_INDEX = NotionIndex(
+    db_path=os.getenv("NOTION_INDEX_DB", ""),
+    refresh_seconds=float(os.getenv("NOTION_INDEX_REFRESH_SECONDS", "300")),
+    body_chars=int(os.getenv("NOTION_INDEX_BODY_CHARS", "20000")),
+    pass_pages=int(os.getenv("NOTION_INDEX_PASS_PAGES", "200")),
+    pass_seconds=float(os.getenv("NOTION_INDEX_PASS_SECONDS", "60")),
+)
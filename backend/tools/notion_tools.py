@@ -19,16 +19,12 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from tools.notion_api import notion, create_page, read_blocks, READ_DEPTH, READ_FANOUT
+from tools.notion_index import NOTION_INDEX, SEARCH_MODE
+
 
 def _notion_client():
-    token = os.getenv("NOTION_TOKEN")
-    if not token:
-        raise EnvironmentError(
-            "NOTION_TOKEN is not set. "
-            "Add it to Crew/backend/.env to enable Notion integration."
-        )
-    from notion_client import Client
-    return Client(auth=token)
+    return notion()
 
 
 def _default_parent():
@@ -161,32 +157,28 @@ class NotionCreatePageTool(BaseTool):
             else:
                 parent = _default_parent()
 
-            # Build blocks from markdown content
-            blocks = []
-            for line in content.splitlines():
-                block = self._line_to_block(line)
-                if block:
-                    blocks.append(block)
-
-            # Notion API hard limit: 100 blocks per request
-            page = notion.pages.create(
+            # Blocks are built lazily, so conversion overlaps the append requests.
+            blocks = (b for b in map(self._line_to_block, content.splitlines()) if b)
+            page = create_page(
+                notion,
                 parent=parent,
                 properties={
                     "title": {
                         "title": [{"type": "text", "text": {"content": title}}]
                     }
                 },
-                children=blocks[:100],
+                blocks=blocks,
+            )
+            try:
+                # Searchable right away, without waiting for the next index refresh.
+                NOTION_INDEX.upsert(page, content)
+            except Exception:
+                pass
+
+            return (
+                f"✅ Notion page created: {page.get('url', page['id'])} "
+                f"({page['appended_blocks']} blocks)"
             )
-
-            # If content overflows 100 blocks, append the rest
-            if len(blocks) > 100:
-                notion.blocks.children.append(
-                    block_id=page["id"],
-                    children=blocks[100:200],
-                )
-
-            return f"✅ Notion page created: {page.get('url', page['id'])}"
         except EnvironmentError as e:
             return f"[Notion not configured] {e}"
         except Exception as e:
@@ -210,6 +202,27 @@ class NotionSearchTool(BaseTool):
 
     def _run(self, query: str, page_size: int = 5) -> str:
         try:
+            if SEARCH_MODE != "live":
+                hits = None
+                try:
+                    hits = NOTION_INDEX.search(query, page_size)
+                except EnvironmentError:
+                    raise
+                except Exception:
+                    if SEARCH_MODE == "local":
+                        raise
+                # None: the index is still being built — answer live meanwhile.
+                if hits is not None and (hits or SEARCH_MODE == "local"):
+                    if not hits:
+                        return f"No Notion pages found for: '{query}'"
+                    lines = [f"Notion search results for '{query}':"]
+                    for h in hits:
+                        if h["object"] == "database":
+                            lines.append(f"  🗃️  {h['title']} (database) — {h['url']}")
+                        else:
+                            lines.append(f"  📄 {h['title']} — {h['url']}")
+                    return "\n".join(lines)
+
             notion = _notion_client()
             results = notion.search(query=query, page_size=page_size).get("results", [])
 
@@ -279,24 +292,30 @@ class NotionReadPageTool(BaseTool):
                         title = rich[0].get("plain_text", "Untitled")
                         break
 
-            # Fetch content blocks
-            blocks = notion.blocks.children.list(block_id=pid).get("results", [])
+            # Fetch content blocks (all pages of children, nested levels concurrently)
+            blocks = read_blocks(notion, pid, max_depth=READ_DEPTH, fan_out=READ_FANOUT)
             lines = [f"# {title}\n"]
-            for block in blocks:
+            for depth, block in blocks:
                 btype = block.get("type", "")
                 data = block.get(btype, {})
                 rich_text = data.get("rich_text", [])
                 text = "".join(rt.get("plain_text", "") for rt in rich_text)
-                if text.strip():
+                indent = "  " * depth
+                if btype == "child_page":
+                    lines.append(f"{indent}📄 {data.get('title', 'Untitled')} (sub-page)")
+                elif text.strip():
                     if btype.startswith("heading"):
                         prefix = "#" * int(btype[-1])
                         lines.append(f"{prefix} {text}")
                     elif btype == "bulleted_list_item":
-                        lines.append(f"• {text}")
+                        lines.append(f"{indent}• {text}")
                     elif btype == "numbered_list_item":
-                        lines.append(f"1. {text}")
+                        lines.append(f"{indent}1. {text}")
+                    elif btype == "to_do":
+                        tick = "✓" if data.get("checked") else "○"
+                        lines.append(f"{indent}{tick} {text}")
                     else:
-                        lines.append(text)
+                        lines.append(f"{indent}{text}")
 
             return "\n".join(lines) if len(lines) > 1 else f"Page '{title}' appears to be empty."
         except EnvironmentError as e:
@@ -0,0 +1,205 @@
+"""
+Shared Slack client, channel directory and bulk helpers.
+────────────────────────────────────────────────────────
+  • slack()          — one process-wide slack_sdk WebClient (rebuilt only if
+                       SLACK_BOT_TOKEN changes) with the SDK's rate-limit and
+                       connection-error retry handlers installed, so a 429 is
+                       retried after Slack's Retry-After instead of failing
+                       the tool call
+  • CHANNELS         — channel name → ID map, filled with a cursor-paginated
+                       conversations.list (Tier 2) and kept for
+                       SLACK_CHANNEL_CACHE_SECONDS; an unknown name forces one
+                       early refresh in case the channel was just created
+  • read_history()   — conversations.history (Tier 3) following
+                       next_cursor until `total` messages have been read
+  • post_many()      — chat.postMessage to several channels with at most
+                       SLACK_POST_CONCURRENCY requests in flight. Slack allows
+                       about one message per second per channel, so each
+                       channel is posted to once and duplicates are dropped.
+
+Env vars:
+  SLACK_BOT_TOKEN              — Bot User OAuth Token (xoxb-...)
+  SLACK_MAX_RETRIES            — retries per call on 429 / connection errors (default 3)
+  SLACK_CHANNEL_CACHE_SECONDS  — channel directory lifetime             (default 600)
+  SLACK_POST_CONCURRENCY       — parallel posts in post_many()           (default 4)
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 200   # Slack recommends <= 200 items per paginated call
+CHANNEL_TYPES = "public_channel,private_channel"
+
+_lock = threading.Lock()
+_client = None
+_client_token = None
+
+
+def slack():
+    """The shared Slack WebClient (rebuilt only if SLACK_BOT_TOKEN changes)."""
+    global _client, _client_token
+    token = os.getenv("SLACK_BOT_TOKEN")
+    if not token:
+        raise EnvironmentError(
+            "SLACK_BOT_TOKEN is not set. "
+            "Add it to Crew/backend/.env to enable Slack integration."
+        )
+    with _lock:
+        if _client is None or _client_token != token:
+            from slack_sdk import WebClient
+            from slack_sdk.http_retry import (
+                ConnectionErrorRetryHandler,
+                RateLimitErrorRetryHandler,
+            )
+            retries = int(os.getenv("SLACK_MAX_RETRIES", "3"))
+            _client = WebClient(
+                token=token,
+                retry_handlers=[
+                    ConnectionErrorRetryHandler(max_retry_count=retries),
+                    RateLimitErrorRetryHandler(max_retry_count=retries),
+                ],
+            )
+            _client_token = token
+            CHANNELS.clear()
+        return _client
+
+
+# ── Channel directory ────────────────────────────────────────
+
+class ChannelDirectory:
+    """
+    Name → ID cache of conversations.list. Loads run outside the lock and
+    concurrent callers share one load; a name that isn't found triggers at
+    most one reload per TTL (negative cache), so a typo in a fan-out doesn't
+    re-list the workspace for every worker.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, clock=time.time):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._channels: list = []
+        self._by_name: dict = {}
+        self._missed: dict = {}          # name → when a reload last failed to find it
+        self._loaded_at = 0.0
+        self._loading: threading.Event | None = None
+        self.stats = {"loads": 0, "hits": 0, "misses": 0}
+
+    def _fresh(self) -> bool:
+        return bool(self._loaded_at) and self._clock() - self._loaded_at < self.ttl_seconds
+
+    def _fetch(self, client) -> list:
+        channels, cursor = [], None
+        while True:
+            kwargs = {"types": CHANNEL_TYPES, "limit": PAGE_SIZE, "exclude_archived": True}
+            if cursor:
+                kwargs["cursor"] = cursor
+            resp = client.conversations_list(**kwargs)
+            channels.extend(resp.get("channels", []))
+            cursor = (resp.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                return channels
+
+    def _load(self, client, force: bool = False) -> None:
+        """Reload unless fresh (or `force`); joins a load already in progress."""
+        with self._lock:
+            if self._loading is not None:
+                pending, leader = self._loading, False
+            elif self._fresh() and not force:
+                return
+            else:
+                pending = self._loading = threading.Event()
+                leader = True
+        if not leader:
+            pending.wait()
+            return
+        try:
+            channels = self._fetch(client)
+            with self._lock:
+                self._channels = channels
+                self._by_name = {c["name"]: c["id"] for c in channels}
+                self._loaded_at = self._clock()
+                self.stats["loads"] += 1
+        finally:
+            with self._lock:
+                self._loading = None
+            pending.set()
+
+    def channels(self, client) -> list:
+        """Every channel the bot can see, from cache when fresh."""
+        self._load(client)
+        with self._lock:
+            return list(self._channels)
+
+    def resolve(self, client, channel: str) -> str:
+        """'#name' / 'name' → channel ID. IDs and unknown names pass through."""
+        name = channel.lstrip("#")
+        if not channel.startswith("#") and name[:1] in ("C", "G", "D") and name.isupper():
+            return channel
+        self._load(client)
+        with self._lock:
+            if name in self._by_name:
+                self.stats["hits"] += 1
+                return self._by_name[name]
+            self.stats["misses"] += 1
+            missed = self._missed.get(name)
+            if missed is not None and self._clock() - missed < self.ttl_seconds:
+                return channel
+            self._missed[name] = self._clock()
+        # Possibly created since the last load — reload, at most once per name per TTL.
+        self._load(client, force=True)
+        with self._lock:
+            if name in self._by_name:
+                self._missed.pop(name, None)
+                self.stats["hits"] += 1
+                return self._by_name[name]
+        return channel
+
+    def clear(self) -> None:
+        with self._lock:
+            self._channels, self._by_name, self._loaded_at = [], {}, 0.0
+            self._missed.clear()
+
+
+# ── History / posting ────────────────────────────────────────
+
+def read_history(client, channel_id: str, total: int) -> list:
+    """Up to `total` most recent messages (newest first), following next_cursor."""
+    messages, cursor = [], None
+    while len(messages) < total:
+        kwargs = {"channel": channel_id, "limit": min(PAGE_SIZE, total - len(messages))}
+        if cursor:
+            kwargs["cursor"] = cursor
+        resp = client.conversations_history(**kwargs)
+        messages.extend(resp.get("messages", []))
+        cursor = (resp.get("response_metadata") or {}).get("next_cursor")
+        if not cursor or not resp.get("has_more", True):
+            break
+    return messages[:total]
+
+
+def post_many(client, channels: list, text: str, concurrency: int = 4) -> list:
+    """
+    Post `text` to every channel concurrently. Returns [(channel, ts, error)]
+    in input order with duplicates removed; exactly one of ts / error is set.
+    """
+    targets = list(dict.fromkeys(c.strip() for c in channels if c.strip()))
+
+    def post(channel):
+        try:
+            resp = client.chat_postMessage(channel=CHANNELS.resolve(client, channel), text=text)
+            return channel, resp.get("ts", "?"), None
+        except Exception as e:
+            return channel, None, str(e)
+
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(targets))),
+                            thread_name_prefix="slack-post") as pool:
+        return list(pool.map(post, targets))
+
+
+CHANNELS = ChannelDirectory(ttl_seconds=float(os.getenv("SLACK_CHANNEL_CACHE_SECONDS", "600")))
+POST_CONCURRENCY = int(os.getenv("SLACK_POST_CONCURRENCY", "4"))
@@ -7,6 +7,8 @@ Required env vars:
 
 Scopes needed on your Slack App:
   chat:write, channels:read, channels:history, groups:history
+
+The WebClient, channel directory and pagination live in tools/slack_api.py.
 """
 
 import os
@@ -14,17 +16,12 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from tools.slack_api import slack, read_history, post_many, CHANNELS, POST_CONCURRENCY
+
 
 def _slack_client():
-    """Return an authenticated Slack WebClient or raise a clear error."""
-    token = os.getenv("SLACK_BOT_TOKEN")
-    if not token:
-        raise EnvironmentError(
-            "SLACK_BOT_TOKEN is not set. "
-            "Add it to Crew/backend/.env to enable Slack integration."
-        )
-    from slack_sdk import WebClient
-    return WebClient(token=token)
+    """Return the shared Slack WebClient or raise a clear error."""
+    return slack()
 
 
 # ── Post Message ──────────────────────────────────────────────
@@ -68,7 +65,7 @@ class _ReadInput(BaseModel):
         default="",
         description="Channel name or ID. Blank = SLACK_DEFAULT_CHANNEL.",
     )
-    limit: int = Field(default=10, le=50, description="Number of messages to fetch (max 50).")
+    limit: int = Field(default=10, ge=1, le=500, description="Number of messages to fetch (max 500).")
 
 
 class SlackReadMessagesTool(BaseTool):
@@ -83,17 +80,8 @@ class SlackReadMessagesTool(BaseTool):
         target = channel or os.getenv("SLACK_DEFAULT_CHANNEL", "#general")
         try:
             client = _slack_client()
-            # Resolve channel name → ID if needed
-            channel_id = target
-            if target.startswith("#"):
-                resp = client.conversations_list(types="public_channel,private_channel")
-                for ch in resp.get("channels", []):
-                    if ch["name"] == target.lstrip("#"):
-                        channel_id = ch["id"]
-                        break
-
-            history = client.conversations_history(channel=channel_id, limit=limit)
-            msgs = history.get("messages", [])
+            channel_id = CHANNELS.resolve(client, target)
+            msgs = read_history(client, channel_id, limit)
             if not msgs:
                 return f"No messages found in {target}."
 
@@ -126,11 +114,7 @@ class SlackListChannelsTool(BaseTool):
     def _run(self) -> str:
         try:
             client = _slack_client()
-            resp = client.conversations_list(
-                types="public_channel,private_channel",
-                limit=100,
-            )
-            channels = resp.get("channels", [])
+            channels = CHANNELS.channels(client)
             if not channels:
                 return "No channels found."
             names = [f"#{c['name']} (id={c['id']})" for c in channels]
@@ -139,3 +123,38 @@ class SlackListChannelsTool(BaseTool):
             return f"[Slack not configured] {e}"
         except Exception as e:
             return f"[Slack error] {e}"
+
+
+# ── Bulk Post ─────────────────────────────────────────────────
+
+class _BulkPostInput(BaseModel):
+    channels: str = Field(
+        ...,
+        description="Comma-separated channel names or IDs, e.g. '#eng, #sales, #general'.",
+    )
+    message: str = Field(..., description="The message text to post to every channel.")
+
+
+class SlackBulkPostTool(BaseTool):
+    name: str = "slack_bulk_post"
+    description: str = (
+        "Post the same message to several Slack channels at once. "
+        "Use this for status broadcasts instead of calling slack_post_message repeatedly."
+    )
+    args_schema: Type[BaseModel] = _BulkPostInput
+
+    def _run(self, channels: str, message: str) -> str:
+        try:
+            client = _slack_client()
+            results = post_many(client, channels.split(","), message, POST_CONCURRENCY)
+            if not results:
+                return "No channels given."
+            ok = sum(1 for _, ts, _ in results if ts)
+            lines = [f"Posted to {ok}/{len(results)} channels:"]
+            for target, ts, error in results:
+                lines.append(f"  {target}: " + (f"✅ ts={ts}" if ts else f"❌ {error}"))
+            return "\n".join(lines)
+        except EnvironmentError as e:
+            return f"[Slack not configured] {e}"
+        except Exception as e:
+            return f"[Slack error] {e}"
@@ -0,0 +1,182 @@
+"""
+Shared Trello REST client.
+──────────────────────────
+One pooled httpx.AsyncClient for the whole process, used by both the
+/trello endpoints (async, on the server's event loop) and the CrewAI Trello
+tools (sync, in crew worker threads).
+
+The client lives on its own small event-loop thread, so either side can use
+it without blocking the other:
+
+    boards = TRELLO.get("members/me/boards")                    # tools (sync)
+    boards = await TRELLO.aget("members/me/boards")             # endpoints
+    cards, lists = await TRELLO.aget_many(("boards/x/cards", {}),
+                                          ("boards/x/lists", {}))  # concurrent
+
+429 responses are retried after the delay Trello asks for (Retry-After, or
+the x-rate-limit-* interval headers); while backing off, every other request
+in the process waits too instead of piling more 429s onto the same token.
+
+Env vars:
+  TRELLO_API_KEY          — from https://trello.com/app-key
+  TRELLO_TOKEN            — generate at https://trello.com/app-key
+  TRELLO_API_BASE         — API root (default https://api.trello.com/1)
+  TRELLO_MAX_CONNECTIONS  — pooled connections                    (default 10)
+  TRELLO_MAX_RETRIES      — retries on 429 before giving up        (default 3)
+"""
+
+import os
+import asyncio
+import threading
+
+import httpx
+
+
+class TrelloError(Exception):
+    """Non-2xx response from Trello."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Trello API {status_code}: {text[:300]}")
+        self.status_code = status_code
+        self.text = text
+
+
+def _creds():
+    key = os.getenv("TRELLO_API_KEY", "")
+    token = os.getenv("TRELLO_TOKEN", "")
+    if not key or not token:
+        raise EnvironmentError(
+            "TRELLO_API_KEY and TRELLO_TOKEN must be set in .env. "
+            "Get them at https://trello.com/app-key"
+        )
+    return key, token
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a 429, from Trello's headers if present."""
+    retry_after = resp.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    for header in ("x-rate-limit-api-token-interval-ms", "x-rate-limit-api-key-interval-ms"):
+        interval = resp.headers.get(header)
+        if interval and interval.isdigit():
+            # The window resets within one interval; don't wait all of it at first.
+            return min(int(interval) / 1000, 0.5 * 2 ** attempt)
+    return 0.5 * 2 ** attempt
+
+
+class TrelloClient:
+    def __init__(
+        self,
+        base_url: str = "https://api.trello.com/1",
+        max_connections: int = 10,
+        max_retries: int = 3,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._transport = transport   # tests pass an httpx.MockTransport
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._paused_until = 0.0   # loop time; set while backing off a 429
+
+    # ── Background loop ──────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._client = httpx.AsyncClient(
+                        base_url=self.base_url,
+                        timeout=self.timeout,
+                        transport=self._transport,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="trello-client", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
+
+    # ── Requests (run on the client loop) ────────────────────
+
+    async def _request(self, method: str, path: str, params: dict | None = None, json: dict | None = None):
+        key, token = _creds()
+        query = {"key": key, "token": token, **(params or {})}
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            pause = self._paused_until - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            resp = await self._client.request(method, f"/{path.lstrip('/')}", params=query, json=json)
+            if resp.status_code == 429 and attempt < self.max_retries:
+                delay = _retry_delay(resp, attempt)
+                self._paused_until = max(self._paused_until, loop.time() + delay)
+                continue
+            if resp.status_code >= 400:
+                raise TrelloError(resp.status_code, resp.text)
+            return resp.json() if resp.content else {}
+
+    async def _many(self, calls):
+        return await asyncio.gather(*(self._request("GET", path, params) for path, params in calls))
+
+    # ── Sync facade (crew worker threads) ────────────────────
+
+    def get(self, path: str, params: dict | None = None) -> list | dict:
+        return self._submit(self._request("GET", path, params)).result()
+
+    def get_many(self, *calls: tuple) -> list:
+        """Fetch several (path, params) pairs concurrently; results in call order."""
+        return self._submit(self._many(calls)).result()
+
+    def post(self, path: str, data: dict | None = None) -> dict:
+        return self._submit(self._request("POST", path, json=data or {})).result()
+
+    def put(self, path: str, data: dict | None = None) -> dict:
+        return self._submit(self._request("PUT", path, json=data or {})).result()
+
+    # ── Async facade (FastAPI endpoints) ─────────────────────
+
+    async def aget(self, path: str, params: dict | None = None) -> list | dict:
+        return await asyncio.wrap_future(self._submit(self._request("GET", path, params)))
+
+    async def aget_many(self, *calls: tuple) -> list:
+        return await asyncio.wrap_future(self._submit(self._many(calls)))
+
+
+TRELLO = TrelloClient(
+    base_url=os.getenv("TRELLO_API_BASE", "https://api.trello.com/1"),
+    max_connections=int(os.getenv("TRELLO_MAX_CONNECTIONS", "10")),
+    max_retries=int(os.getenv("TRELLO_MAX_RETRIES", "3")),
+)
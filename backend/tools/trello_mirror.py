@@ -0,0 +1,295 @@
+"""
+Local Trello board mirror.
+──────────────────────────
+The Trello page and the meeting agent's board/card tools used to pull the
+full board JSON on every view or tool call. Instead, each board is copied
+into SQLite once and then kept current incrementally:
+
+  • first read of a board   → one concurrent fetch of its cards + lists
+  • later reads             → served locally; at most every
+                              TRELLO_MIRROR_POLL_SECONDS the board's action
+                              feed is polled with `since=<last action id>`
+  • Trello webhooks         → POST /trello/webhook applies the action at once
+
+An action only names what changed, so the mirror re-fetches just the cards
+(and, when lists changed, the list set) that the actions touch. Card details
+(checklists, comments) are cached per card for TRELLO_CARD_DETAILS_TTL
+seconds and dropped earlier whenever an action touches that card — the TTL
+bounds staleness for cards on boards that aren't mirrored or polled.
+
+The mirror is synchronous (crew tools call it directly; endpoints go through
+asyncio.to_thread) and talks to Trello through the shared client in
+tools/trello_client.py.
+
+Env vars:
+  TRELLO_MIRROR_DB            — SQLite file (default: in-memory, per process)
+  TRELLO_MIRROR_POLL_SECONDS  — min seconds between action-feed polls (default 30)
+  TRELLO_CARD_DETAILS_TTL     — seconds card details are served from cache (default 60)
+  TRELLO_WEBHOOK_SECRET       — app secret used to verify webhook signatures
+  TRELLO_WEBHOOK_CALLBACK_URL — the callback URL registered with Trello
+"""
+
+import os
+import hmac
+import json
+import time
+import base64
+import sqlite3
+import hashlib
+import threading
+
+from tools.trello_client import TRELLO, TrelloClient, TrelloError
+
+CARD_FIELDS = {
+    "fields": "name,desc,due,idList,idBoard,idMembers,shortUrl,labels,closed,pos",
+    "members": "true",
+    "member_fields": "fullName,username,avatarUrl",
+}
+LIST_FIELDS = {"fields": "name,id,pos,closed"}
+CARD_DETAIL_FIELDS = {
+    "fields": "name,desc,due,shortUrl,idBoard",
+    "members": "true",
+    "member_fields": "fullName,username",
+    "checklists": "all",
+    "actions": "commentCard",
+    "actions_limit": "5",
+}
+
+# The action feed is paged; a board that changed more than this since the
+# last poll is simply re-filled.
+_ACTION_PAGE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY, last_action TEXT, polled_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lists (
+    id TEXT PRIMARY KEY, board_id TEXT NOT NULL, pos REAL, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY, board_id TEXT NOT NULL, pos REAL, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS card_details (
+    id TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS lists_by_board ON lists (board_id);
+CREATE INDEX IF NOT EXISTS cards_by_board ON cards (board_id);
+"""
+
+
+def verify_webhook(body: bytes, signature: str, secret: str, callback_url: str) -> bool:
+    """Check Trello's X-Trello-Webhook header: base64(HMAC-SHA1(body + callback URL))."""
+    digest = hmac.new(secret.encode(), body + callback_url.encode(), hashlib.sha1).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), signature or "")
+
+
+class TrelloMirror:
+    def __init__(
+        self,
+        client: TrelloClient = TRELLO,
+        db_path: str = "",
+        poll_seconds: float = 30.0,
+        details_ttl: float = 60.0,
+        clock=time.time,
+    ):
+        self.client = client
+        self.poll_seconds = poll_seconds
+        self.details_ttl = details_ttl
+        self._clock = clock
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        try:
+            # Mirror files created before card details had a fetch time.
+            self._db.execute("ALTER TABLE card_details ADD COLUMN fetched_at REAL NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        self._lock = threading.RLock()
+        self.stats = {"fills": 0, "polls": 0, "cards_refetched": 0, "webhooks": 0}
+
+    # ── Reads ────────────────────────────────────────────────
+
+    def board(self, board_id: str) -> tuple[list, list]:
+        """(cards, lists) for a board — filled on first use, then kept current."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_action, polled_at FROM boards WHERE id = ?", (board_id,)
+            ).fetchone()
+        if row is None:
+            self.fill(board_id)
+        elif self._clock() - row[1] >= self.poll_seconds:
+            self.poll(board_id, row[0])
+        with self._lock:
+            cards = [json.loads(r[0]) for r in self._db.execute(
+                "SELECT data FROM cards WHERE board_id = ? ORDER BY pos", (board_id,)
+            )]
+            lists = [json.loads(r[0]) for r in self._db.execute(
+                "SELECT data FROM lists WHERE board_id = ? ORDER BY pos", (board_id,)
+            )]
+        return cards, lists
+
+    def card_details(self, card_id: str) -> dict:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, fetched_at FROM card_details WHERE id = ?", (card_id,)
+            ).fetchone()
+        if row and self._clock() - row[1] < self.details_ttl:
+            return json.loads(row[0])
+        card = self.client.get(f"cards/{card_id}", CARD_DETAIL_FIELDS)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO card_details (id, data, fetched_at) VALUES (?, ?, ?)",
+                (card_id, json.dumps(card), self._clock()),
+            )
+            self._db.commit()
+        return card
+
+    # ── Sync ─────────────────────────────────────────────────
+
+    def fill(self, board_id: str) -> None:
+        """(Re)load a whole board and reset its action cursor."""
+        cards, lists, latest = self.client.get_many(
+            (f"boards/{board_id}/cards", CARD_FIELDS),
+            (f"boards/{board_id}/lists", LIST_FIELDS),
+            (f"boards/{board_id}/actions", {"limit": "1", "fields": "id"}),
+        )
+        with self._lock:
+            self._db.execute("DELETE FROM cards WHERE board_id = ?", (board_id,))
+            self._db.execute("DELETE FROM lists WHERE board_id = ?", (board_id,))
+            self._put_cards(board_id, cards)
+            self._put_lists(board_id, lists)
+            self._db.execute(
+                "INSERT OR REPLACE INTO boards (id, last_action, polled_at) VALUES (?, ?, ?)",
+                (board_id, latest[0]["id"] if latest else None, self._clock()),
+            )
+            self._db.commit()
+            self.stats["fills"] += 1
+
+    def poll(self, board_id: str, since: str | None = None) -> int:
+        """Apply actions newer than the cursor. Returns how many were applied."""
+        params = {"limit": str(_ACTION_PAGE)}
+        if since:
+            params["since"] = since
+        actions = self.client.get(f"boards/{board_id}/actions", params)
+        self.stats["polls"] += 1
+        if len(actions) >= _ACTION_PAGE or (actions and not since):
+            self.fill(board_id)
+            return len(actions)
+        # The feed is newest-first; apply oldest-first.
+        self.apply_actions(board_id, list(reversed(actions)))
+        with self._lock:
+            self._db.execute(
+                "UPDATE boards SET polled_at = ?, last_action = COALESCE(?, last_action) WHERE id = ?",
+                (self._clock(), actions[0]["id"] if actions else None, board_id),
+            )
+            self._db.commit()
+        return len(actions)
+
+    def apply_webhook(self, payload: dict) -> bool:
+        """Apply one webhook delivery. Returns False for boards we don't mirror."""
+        action = payload.get("action") or {}
+        board_id = ((action.get("data") or {}).get("board") or {}).get("id") \
+            or (payload.get("model") or {}).get("id")
+        if not board_id or not self.is_mirrored(board_id):
+            return False
+        self.stats["webhooks"] += 1
+        self.apply_actions(board_id, [action])
+        return True
+
+    def apply_actions(self, board_id: str, actions: list) -> None:
+        """Re-fetch whatever the actions touched (cards, lists) for one board."""
+        card_ids: list = []
+        deleted: set = set()
+        lists_changed = False
+        for action in actions:
+            data = action.get("data") or {}
+            kind = action.get("type", "")
+            card_id = (data.get("card") or {}).get("id")
+            if card_id:
+                if kind == "deleteCard":
+                    deleted.add(card_id)
+                elif card_id not in card_ids:
+                    card_ids.append(card_id)
+            if "List" in kind or (data.get("list") and not card_id):
+                lists_changed = True
+
+        with self._lock:
+            for card_id in [*card_ids, *deleted]:
+                self._db.execute("DELETE FROM card_details WHERE id = ?", (card_id,))
+            for card_id in deleted:
+                self._db.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+            self._db.commit()
+
+        calls = [(f"cards/{c}", CARD_FIELDS) for c in card_ids if c not in deleted]
+        if lists_changed:
+            calls.append((f"boards/{board_id}/lists", LIST_FIELDS))
+        if not calls:
+            return
+        results = self._get_each(calls)
+        with self._lock:
+            if lists_changed:
+                lists = results.pop()
+                if lists is not None:
+                    self._db.execute("DELETE FROM lists WHERE board_id = ?", (board_id,))
+                    self._put_lists(board_id, lists)
+            for (path, _), card in zip(calls, results):
+                card_id = path.split("/", 1)[1]
+                if card is None or card.get("closed") or card.get("idBoard") != board_id:
+                    # Deleted, archived or moved to another board.
+                    self._db.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+                else:
+                    self._put_cards(board_id, [card])
+            self._db.commit()
+            self.stats["cards_refetched"] += len(calls) - lists_changed
+
+    def refresh_card(self, card_id: str) -> None:
+        """Pick up our own writes (comment, move) without waiting for a poll."""
+        with self._lock:
+            row = self._db.execute("SELECT board_id FROM cards WHERE id = ?", (card_id,)).fetchone()
+            self._db.execute("DELETE FROM card_details WHERE id = ?", (card_id,))
+            self._db.commit()
+        if row:
+            self.apply_actions(row[0], [{"type": "updateCard", "data": {"card": {"id": card_id}}}])
+
+    def is_mirrored(self, board_id: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM boards WHERE id = ?", (board_id,)
+            ).fetchone() is not None
+
+    # ── Helpers ──────────────────────────────────────────────
+
+    def _get_each(self, calls: list) -> list:
+        """Concurrent GETs where a 404 yields None instead of failing the batch."""
+        try:
+            return self.client.get_many(*calls)
+        except TrelloError as e:
+            if e.status_code != 404:
+                raise
+        results = []
+        for path, params in calls:
+            try:
+                results.append(self.client.get(path, params))
+            except TrelloError as e:
+                if e.status_code != 404:
+                    raise
+                results.append(None)
+        return results
+
+    def _put_cards(self, board_id: str, cards: list) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO cards (id, board_id, pos, data) VALUES (?, ?, ?, ?)",
+            [(c["id"], board_id, c.get("pos"), json.dumps(c)) for c in cards],
+        )
+
+    def _put_lists(self, board_id: str, lists: list) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO lists (id, board_id, pos, data) VALUES (?, ?, ?, ?)",
+            [(l["id"], board_id, l.get("pos"), json.dumps(l)) for l in lists if not l.get("closed")],
+        )
+
+
+TRELLO_MIRROR = TrelloMirror(
+    db_path=os.getenv("TRELLO_MIRROR_DB", ""),
+    poll_seconds=float(os.getenv("TRELLO_MIRROR_POLL_SECONDS", "30")),
+    details_ttl=float(os.getenv("TRELLO_CARD_DETAILS_TTL", "60")),
+)
@@ -8,49 +8,25 @@ Required env vars:
 All tools degrade gracefully when credentials are missing.
 """
 
-import os
 from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
-
-# ── Shared helpers ────────────────────────────────────────────
+from tools.trello_client import TRELLO
+from tools.trello_mirror import TRELLO_MIRROR
 
 
-def _creds():
-    key = os.getenv("TRELLO_API_KEY", "")
-    token = os.getenv("TRELLO_TOKEN", "")
-    if not key or not token:
-        raise EnvironmentError(
-            "TRELLO_API_KEY and TRELLO_TOKEN must be set in .env. "
-            "Get them at https://trello.com/app-key"
-        )
-    return key, token
+# ── Shared helpers ────────────────────────────────────────────
+# All requests go through the process-wide pooled client (tools/trello_client.py);
+# board and card reads are served from the local mirror (tools/trello_mirror.py).
 
 
 def _get(path: str, params: dict = {}) -> list | dict:
-    import requests
-    key, token = _creds()
-    resp = requests.get(
-        f"https://api.trello.com/1/{path}",
-        params={"key": key, "token": token, **params},
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    return TRELLO.get(path, params)
 
 
 def _post(path: str, data: dict = {}) -> dict:
-    import requests
-    key, token = _creds()
-    resp = requests.post(
-        f"https://api.trello.com/1/{path}",
-        params={"key": key, "token": token},
-        json=data,
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    return TRELLO.post(path, data)
 
 
 # ── 1. List Boards ────────────────────────────────────────────
@@ -99,15 +75,7 @@ class TrelloGetBoardCardsTool(BaseTool):
 
     def _run(self, board_id: str) -> str:
         try:
-            cards = _get(
-                f"boards/{board_id}/cards",
-                {
-                    "fields": "name,desc,due,idList,idMembers,shortUrl,labels",
-                    "members": "true",
-                    "member_fields": "fullName,username",
-                },
-            )
-            lists_raw = _get(f"boards/{board_id}/lists", {"fields": "name"})
+            cards, lists_raw = TRELLO_MIRROR.board(board_id)
             list_names = {lst["id"]: lst["name"] for lst in lists_raw}
 
             if not cards:
@@ -149,17 +117,7 @@ class TrelloGetCardDetailsTool(BaseTool):
 
     def _run(self, card_id: str) -> str:
         try:
-            card = _get(
-                f"cards/{card_id}",
-                {
-                    "fields": "name,desc,due,shortUrl,idBoard",
-                    "members": "true",
-                    "member_fields": "fullName,username",
-                    "checklists": "all",
-                    "actions": "commentCard",
-                    "actions_limit": "5",
-                },
-            )
+            card = TRELLO_MIRROR.card_details(card_id)
             lines = [
                 f"Card:  {card['name']}",
                 f"URL:   {card.get('shortUrl', '')}",
@@ -212,6 +170,7 @@ class TrelloCommentCardTool(BaseTool):
     def _run(self, card_id: str, comment: str) -> str:
         try:
             _post(f"cards/{card_id}/actions/comments", {"text": comment})
+            TRELLO_MIRROR.refresh_card(card_id)
             return f"✅ Comment added to card {card_id}"
         except EnvironmentError as e:
             return f"[Trello not configured] {e}"
@@ -237,15 +196,8 @@ class TrelloMoveCardTool(BaseTool):
 
     def _run(self, card_id: str, list_id: str) -> str:
         try:
-            import requests
-            key, token = _creds()
-            resp = requests.put(
-                f"https://api.trello.com/1/cards/{card_id}",
-                params={"key": key, "token": token},
-                json={"idList": list_id},
-                timeout=10,
-            )
-            resp.raise_for_status()
+            TRELLO.put(f"cards/{card_id}", {"idList": list_id})
+            TRELLO_MIRROR.refresh_card(card_id)
             return f"✅ Card {card_id} moved to list {list_id}"
         except EnvironmentError as e:
             return f"[Trello not configured] {e}"
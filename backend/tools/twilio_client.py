@@ -0,0 +1,155 @@
+"""
+Shared Twilio client and rate-limited bulk dispatch.
+────────────────────────────────────────────────────
+The WhatsApp and call tools used to build a new twilio.rest.Client (and a
+new HTTPS connection) on every call, and alerting a team took one LLM tool
+call per person. Both now go through this module:
+
+  • twilio()     — one process-wide Client on a pooled TwilioHttpClient
+                   (rebuilt only if the account SID / token change)
+  • dispatch()   — run one Twilio request per recipient with at most
+                   `concurrency` in flight, each start paced by a token
+                   bucket, and 429 / error 20429 responses retried with
+                   exponential backoff. Returns one result per recipient.
+
+Twilio's own limits are per sender: a long-code number sends about one
+message per second, and an account places calls at its CPS setting
+(default 1). The bucket rates below default to those values.
+
+Env vars:
+  TWILIO_ACCOUNT_SID          — from twilio.com/console
+  TWILIO_AUTH_TOKEN           — from twilio.com/console
+  TWILIO_TIMEOUT              — HTTP timeout in seconds                   (default 30)
+  TWILIO_BULK_CONCURRENCY     — requests in flight per bulk tool call     (default 4)
+  TWILIO_MESSAGES_PER_SECOND  — WhatsApp send rate                        (default 1)
+  TWILIO_CALLS_PER_SECOND     — outbound call rate (your account's CPS)   (default 1)
+  TWILIO_MAX_RETRIES          — retries per recipient on 429              (default 3)
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+_lock = threading.Lock()
+_client = None
+_client_key = None
+
+
+def twilio():
+    """The shared Twilio REST client."""
+    global _client, _client_key
+    sid = os.getenv("TWILIO_ACCOUNT_SID", "")
+    token = os.getenv("TWILIO_AUTH_TOKEN", "")
+    if not sid or not token:
+        raise EnvironmentError(
+            "TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set in .env"
+        )
+    with _lock:
+        if _client is None or _client_key != (sid, token):
+            from twilio.http.http_client import TwilioHttpClient
+            from twilio.rest import Client
+            http = TwilioHttpClient(
+                pool_connections=True,
+                timeout=float(os.getenv("TWILIO_TIMEOUT", "30")),
+            )
+            _client = Client(sid, token, http_client=http)
+            _client_key = (sid, token)
+        return _client
+
+
+# ── Rate limiting ────────────────────────────────────────────
+
+class TokenBucket:
+    """Blocking token bucket: `rate` acquisitions per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    return getattr(exc, "status", None) == 429 or getattr(exc, "code", None) == 20429
+
+
+# ── Bulk dispatch ────────────────────────────────────────────
+
+class Dispatch(NamedTuple):
+    recipient: str
+    sid: str | None
+    status: str
+    error: str | None
+
+
+def dispatch(
+    send: Callable[[str], object],
+    recipients: list,
+    bucket: TokenBucket,
+    concurrency: int = 4,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    sleep=time.sleep,
+) -> list:
+    """
+    Call send(recipient) for every recipient (duplicates dropped) and return
+    [Dispatch] in input order. `send` returns a Twilio resource with .sid and
+    .status; any exception becomes that recipient's error.
+    """
+    targets = list(dict.fromkeys(r.strip() for r in recipients if r and r.strip()))
+
+    def one(recipient):
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            try:
+                resource = send(recipient)
+                return Dispatch(recipient, resource.sid, str(getattr(resource, "status", "queued")), None)
+            except Exception as e:
+                if _is_rate_limited(e) and attempt < max_retries:
+                    sleep(backoff * 2 ** attempt)
+                    continue
+                return Dispatch(recipient, None, "failed", getattr(e, "msg", None) or str(e))
+
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(targets))),
+                            thread_name_prefix="twilio-bulk") as pool:
+        return list(pool.map(one, targets))
+
+
+def status_table(results: list) -> str:
+    """Per-recipient results as a fixed-width table for the agent."""
+    ok = sum(1 for r in results if r.sid)
+    width = max([len("Recipient"), *(len(r.recipient) for r in results)])
+    lines = [
+        f"{'✅' if ok == len(results) else '⚠️'} {ok}/{len(results)} dispatched",
+        f"{'Recipient':<{width}}  {'Status':<10}  SID / error",
+    ]
+    for r in results:
+        lines.append(f"{r.recipient:<{width}}  {r.status:<10}  {r.sid or r.error}")
+    return "\n".join(lines)
+
+
+BULK_CONCURRENCY = int(os.getenv("TWILIO_BULK_CONCURRENCY", "4"))
+MAX_RETRIES = int(os.getenv("TWILIO_MAX_RETRIES", "3"))
+MESSAGE_BUCKET = TokenBucket(float(os.getenv("TWILIO_MESSAGES_PER_SECOND", "1")))
+CALL_BUCKET = TokenBucket(float(os.getenv("TWILIO_CALLS_PER_SECOND", "1")))
@@ -0,0 +1,216 @@
+"""
+Shared disk cache for web search tool results.
+──────────────────────────────────────────────
+Every agent carries SerperDevTool, and Agora sessions and deep_research
+runs keep issuing the same searches — across agents and within one
+session. WEB_CACHE stores their results in SQLite, shared by every agent
+in the process (and across restarts):
+
+  • key      — sha256 of the tool name + normalized arguments: queries are
+               case-folded with whitespace collapsed; URLs lose their
+               fragment, tracking parameters (utm_*, fbclid, gclid) and
+               trailing slash, and get a lower-cased host and sorted query
+  • TTL      — per tool
+  • size     — total stored bytes capped at WEB_CACHE_MAX_MB; the least
+               recently used entries are evicted first
+  • stats    — per-tool hits / misses / evictions (GET /api/web-cache)
+
+    self._search_tool = cache_tool("serper", SerperDevTool())
+
+Only JSON-serializable results are cached, and error results are not.
+WebsiteSearchTool is deliberately not wrapped: its pages live in
+tools/embedding_index.py, which revalidates them with conditional requests,
+and a cached answer on top would hide those refreshes.
+
+Env vars:
+  WEB_CACHE_DB           — SQLite file (default: backend/web_cache.db)
+  WEB_CACHE_MAX_MB       — total cached bytes before LRU eviction (default 256)
+  WEB_CACHE_TTL_SERPER   — search result TTL, seconds    (default 21600 = 6 h)
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ref_src")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_last_used ON entries (last_used);
+"""
+
+
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(str(text).casefold().split())
+
+
+def normalize_args(args: tuple, kwargs: dict) -> str:
+    """Canonical JSON of a tool call's arguments (URL-ish keys get URL normalization)."""
+    norm = {}
+    for name, value in kwargs.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = normalize_url(value) if "url" in name.lower() else normalize_text(value)
+        norm[name] = value
+    return json.dumps([[normalize_text(a) if isinstance(a, str) else a for a in args], norm],
+                      sort_keys=True, default=str)
+
+
+def _is_error(result) -> bool:
+    return isinstance(result, str) and (
+        result.startswith("[") or result.lower().startswith(("error", "an error"))
+    )
+
+
+class WebCache:
+    def __init__(self, db_path: str, max_bytes: int, ttls: dict, clock=time.time):
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls)
+        self._clock = clock
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._counters: dict = {}
+
+    def _count(self, tool: str, what: str, n: int = 1) -> None:
+        c = self._counters.setdefault(tool, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+        c[what] += n
+
+    @staticmethod
+    def key(tool: str, args: tuple, kwargs: dict) -> str:
+        return hashlib.sha256(f"{tool}\0{normalize_args(args, kwargs)}".encode()).hexdigest()
+
+    # ── Get / put ────────────────────────────────────────────
+
+    def get(self, tool: str, key: str):
+        """(True, value) on a fresh hit, (False, None) otherwise."""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._bytes -= row[2]
+                    self._db.commit()
+                self._count(tool, "misses")
+                return False, None
+            self._db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._count(tool, "hits")
+        return True, json.loads(row[0])["v"]
+
+    def put(self, tool: str, key: str, value) -> bool:
+        try:
+            data = json.dumps({"v": value})
+        except (TypeError, ValueError):
+            return False
+        size = len(data.encode())
+        if size > self.max_bytes:
+            return False
+        now = self._clock()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, tool, value, size, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tool, data, size, now + self.ttls.get(tool, 3600), now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self._count(tool, "stores")
+            self._evict()
+            self._db.commit()
+        return True
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under the size cap (lock held)."""
+        while self._bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, tool, size FROM entries ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for key, tool, size in rows:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bytes -= size
+                self._count(tool, "evictions")
+                if self._bytes <= self.max_bytes:
+                    return
+
+    # ── Wrapping ─────────────────────────────────────────────
+
+    def wrap(self, tool: str, fn):
+        def cached(*args, **kwargs):
+            key = self.key(tool, args, kwargs)
+            hit, value = self.get(tool, key)
+            if hit:
+                return value
+            result = fn(*args, **kwargs)
+            if not _is_error(result):
+                self.put(tool, key, result)
+            return result
+
+        return cached
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            tools = {}
+            for tool, c in self._counters.items():
+                lookups = c["hits"] + c["misses"]
+                tools[tool] = {**c, "hit_rate": round(c["hits"] / lookups, 3) if lookups else None,
+                               "ttl": self.ttls.get(tool)}
+            return {"entries": entries, "bytes": self._bytes, "max_bytes": self.max_bytes, "tools": tools}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._bytes = 0
+
+
+WEB_CACHE = WebCache(
+    db_path=os.getenv("WEB_CACHE_DB", os.path.join(_BACKEND_DIR, "web_cache.db")),
+    max_bytes=int(float(os.getenv("WEB_CACHE_MAX_MB", "256")) * 1024 * 1024),
+    ttls={
+        "serper": float(os.getenv("WEB_CACHE_TTL_SERPER", "21600")),
+    },
+)
+
+
+def cache_tool(name: str, tool):
+    """Route a CrewAI tool's _run through WEB_CACHE and return the tool."""
+    # BaseTool is a pydantic model; bypass its __setattr__ to shadow the method.
+    object.__setattr__(tool, "_run", WEB_CACHE.wrap(name, tool._run))
+    return tool
@@ -0,0 +1,38 @@
+"""
+Website search tool backed by the persistent embedding index.
+──────────────────────────────────────────────────────────────
+Drop-in for crewai_tools.WebsiteSearchTool (same name and arguments), but
+page chunks and embeddings live in tools/embedding_index.py instead of a
+per-instance vector store, so a fresh EngramAgents doesn't re-embed a site
+the last request already read. Fetching, indexing and env vars: see
+tools/embedding_index.py.
+"""
+
+from typing import Type
+
+import httpx
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+from tools.embedding_index import search_website
+
+
+class _WebsiteSearchInput(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search a specific website")
+    website_url: str = Field(..., description="Mandatory valid website URL you want to search on")
+
+
+class WebsiteSearchTool(BaseTool):
+    name: str = "Search in a specific website"
+    description: str = (
+        "A tool that can be used to semantic search a query from a specific URL content."
+    )
+    args_schema: Type[BaseModel] = _WebsiteSearchInput
+
+    def _run(self, search_query: str, website_url: str) -> str:
+        try:
+            return search_website(website_url, search_query)
+        except httpx.HTTPError as e:
+            return f"[Website fetch error] {website_url}: {e}"
+        except Exception as e:
+            return f"[Website search error] {e}"
@@ -13,6 +13,8 @@ Sandbox setup (already done):
 
 For templates (business-initiated messages), pass content_sid + content_variables.
 For free-form replies (within 24h window after user messages you), just pass body text.
+
+The Twilio client, send-rate limiting and bulk dispatch live in tools/twilio_client.py.
 """
 
 import os
@@ -20,17 +22,13 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from tools.twilio_client import (
+    twilio, dispatch, status_table, MESSAGE_BUCKET, BULK_CONCURRENCY, MAX_RETRIES,
+)
+
 
 def _twilio_client():
-    sid   = os.getenv("TWILIO_ACCOUNT_SID")
-    token = os.getenv("TWILIO_AUTH_TOKEN")
-    if not sid or not token:
-        raise EnvironmentError(
-            "TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set in .env "
-            "to enable WhatsApp integration."
-        )
-    from twilio.rest import Client
-    return Client(sid, token)
+    return twilio()
 
 
 def _from_number() -> str:
@@ -86,6 +84,45 @@ class WhatsAppSendTool(BaseTool):
             return f"[WhatsApp error] {e}"
 
 
+# ── Bulk Send ─────────────────────────────────────────────────
+
+class _BulkSendInput(BaseModel):
+    message: str = Field(..., description="The WhatsApp message text to send to every recipient.")
+    recipients: str = Field(
+        ...,
+        description="Comma-separated phone numbers with country code, e.g. '+9779820742195, +14155551234'.",
+    )
+
+
+class WhatsAppBulkSendTool(BaseTool):
+    name: str = "whatsapp_bulk_send"
+    description: str = (
+        "Send the same WhatsApp message to several phone numbers in one call. "
+        "Use this to alert a whole team instead of calling whatsapp_send_message per person. "
+        "Returns a per-recipient status table."
+    )
+    args_schema: Type[BaseModel] = _BulkSendInput
+
+    def _run(self, message: str, recipients: str) -> str:
+        try:
+            client = _twilio_client()
+            from_ = _from_number()
+            results = dispatch(
+                lambda to: client.messages.create(from_=from_, to=_to_number(to), body=message),
+                recipients.split(","),
+                MESSAGE_BUCKET,
+                concurrency=BULK_CONCURRENCY,
+                max_retries=MAX_RETRIES,
+            )
+            if not results:
+                return "No recipients given."
+            return status_table(results)
+        except EnvironmentError as e:
+            return f"[WhatsApp not configured] {e}"
+        except Exception as e:
+            return f"[WhatsApp error] {e}"
+
+
 # ── Send Template Message (business-initiated) ────────────────
 
 class _TemplateInput(BaseModel):